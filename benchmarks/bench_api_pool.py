@@ -0,0 +1,121 @@
+"""
+    Description:
+        Benchmark for the pooled REST API session
+        Serves a fake /channels/{id}/messages endpoint over local HTTP/1.1 and
+        sends the same calls through module level requests.post (a new
+        connection per call, as the API client used to) and through API with
+        its pooled session, sequentially and from several threads at once
+
+        Local HTTP skips the TLS handshake, so real savings against Discord
+        are larger than shown here
+
+        Usage: python benchmarks/bench_api_pool.py [requests] [threads]
+
+    Contributors:
+        - Patrick Hennessy
+"""
+import os
+import sys
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+
+import requests
+import ujson as json
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.payloads import message_payload  # noqa: E402
+from bolt.discord.api import API  # noqa: E402
+
+RESPONSE = json.dumps(message_payload(0)).encode()
+
+
+class StandInServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+class DiscordStandIn(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(RESPONSE)))
+        self.end_headers()
+        self.wfile.write(RESPONSE)
+
+    def log_message(self, *args):
+        pass
+
+
+def unpooled_call(api, channel_id):
+    # What every API method did before it owned a session
+    return requests.post(
+        f"{api.base_url}/channels/{channel_id}/messages",
+        headers=api.auth_headers,
+        data=json.dumps({"content": "Supa Hot"})
+    ).json()
+
+
+def pooled_call(api, channel_id):
+    return api.create_message(channel_id, {"content": "Supa Hot"})
+
+
+def run(call, api, total, threads):
+    latencies = []
+
+    def timed(index):
+        start = time.perf_counter()
+        call(api, index)
+        latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    if threads == 1:
+        for index in range(total):
+            timed(index)
+    else:
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            list(executor.map(timed, range(total)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "throughput": total / elapsed,
+        "p50": latencies[len(latencies) // 2],
+        "p99": latencies[int(len(latencies) * 0.99)]
+    }
+
+
+def report(label, result):
+    print(
+        f"  {label:10}: {result['throughput']:8.0f} req/s   "
+        f"p50 {result['p50'] * 1000:6.2f} ms   p99 {result['p99'] * 1000:6.2f} ms"
+    )
+
+
+def main():
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    threads = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+
+    server = StandInServer(("127.0.0.1", 0), DiscordStandIn)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}/api"
+
+    for concurrency in (1, threads):
+        api = API("token", pool_size=concurrency, base_url=base_url)
+
+        print(f"{total} requests, {concurrency} thread(s)")
+        report("unpooled", run(unpooled_call, api, total, concurrency))
+        report("pooled", run(pooled_call, api, total, concurrency))
+        api.close()
+
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+"""
+    Description:
+        Benchmark for IndexedList against the scanning SearchableList
+        Measures find(id=...), upsert and append at 10k, 100k and 1M items
+
+        Usage: python benchmarks/bench_collections.py [sizes...]
+
+    Contributors:
+        - Patrick Hennessy
+"""
+import os
+import sys
+import time
+import random
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bolt.discord.models.base import SearchableList, IndexedList  # noqa: E402
+
+
+class Item(object):
+    __slots__ = ('id', 'user_id')
+
+    def __init__(self, index):
+        self.id = str(80351110224678912 + index)
+        self.user_id = self.id
+
+    def __eq__(self, other):
+        return self.user_id == other.user_id
+
+    __hash__ = object.__hash__
+
+
+def per_op(callback, operations):
+    start = time.perf_counter()
+    for operation in operations:
+        callback(operation)
+    return (time.perf_counter() - start) / len(operations)
+
+
+def run(size, lookups):
+    items = [Item(index) for index in range(size)]
+    targets = [random.choice(items) for _ in range(lookups)]
+
+    searchable = SearchableList(items)
+
+    start = time.perf_counter()
+    indexed = IndexedList(items, indexes=["id", "user_id"])
+    build = time.perf_counter() - start
+
+    scan_find = per_op(lambda item: searchable.find(id=item.id), targets)
+    index_find = per_op(lambda item: indexed.find(id=item.id), targets)
+    scan_upsert = per_op(lambda item: searchable.upsert(item), targets)
+    index_upsert = per_op(lambda item: indexed.upsert(item), targets)
+
+    appends = [Item(size + index) for index in range(lookups)]
+    scan_append = per_op(searchable.append, appends)
+    index_append = per_op(indexed.append, appends)
+
+    print(f"{size} items (index build {build * 1000:.1f} ms)")
+    print(f"  {'':8} {'scan':>12} {'indexed':>12} {'speedup':>10}")
+    for label, scan, index in [
+        ("find", scan_find, index_find),
+        ("upsert", scan_upsert, index_upsert),
+        ("append", scan_append, index_append)
+    ]:
+        print(f"  {label:8} {scan * 1000000:10.1f}us {index * 1000000:10.1f}us {scan / index:9.1f}x")
+
+
+def main():
+    sizes = [int(size) for size in sys.argv[1:]] or [10000, 100000, 1000000]
+
+    for size in sizes:
+        # Keep the number of full scans bounded at the large sizes
+        run(size, lookups=max(10, 1000000 // size))
+
+
+if __name__ == '__main__':
+    main()
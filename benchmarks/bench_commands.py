@@ -0,0 +1,105 @@
+"""
+    Description:
+        Benchmark for command routing
+        1000 commands (plain, regex and parse, split over two triggers) are
+        matched against a chat stream where most messages are not commands.
+        Compares trying every command, as handle_gateway_message used to, with
+        the CommandRouter
+
+        Usage: python benchmarks/bench_commands.py [commands] [messages]
+
+    Contributors:
+        - Patrick Hennessy
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bolt.core.command import Command, RegexCommand, ParseCommand, CommandRouter  # noqa: E402
+
+
+class FakePlugin():
+    def __init__(self, commands):
+        self.commands = commands
+        self.pre_command_hooks = []
+        self.enabled = True
+
+
+def callback(event):
+    pass
+
+
+def make_plugins(count):
+    commands = []
+    for index in range(count):
+        trigger = "!" if index % 4 else "?"
+        kind = index % 3
+        if kind == 0:
+            commands.append(Command(f"cmd{index}", callback, trigger=trigger))
+        elif kind == 1:
+            commands.append(RegexCommand(rf"^cmd{index} (\d+)$", callback, trigger=trigger))
+        else:
+            commands.append(ParseCommand(f"cmd{index} {{name}}", callback, trigger=trigger))
+
+    # 20 commands per plugin, 50 plugins for the default 1000
+    return [FakePlugin(commands[start:start + 20]) for start in range(0, len(commands), 20)]
+
+
+def make_messages(count, commands):
+    messages = []
+    for index in range(count):
+        if index % 20 == 0:
+            command = (index * 7) % commands
+            trigger = "!" if command % 4 else "?"
+            messages.append(f"{trigger}cmd{command} 42")
+        else:
+            messages.append(f"just chatting about thing number {index}, nothing to see here")
+    return messages
+
+
+def every_command(plugins, messages):
+    matched = 0
+    for content in messages:
+        for plugin in plugins:
+            if not plugin.enabled:
+                continue
+            for command in plugin.commands:
+                if command.matches(content):
+                    matched += 1
+    return matched
+
+
+def router(plugins, messages):
+    command_router = CommandRouter()
+    command_router.rebuild(plugins)
+
+    matched = 0
+    for content in messages:
+        matched += len(command_router.route(content))
+    return matched
+
+
+def run(label, route, plugins, messages):
+    start = time.perf_counter()
+    matched = route(plugins, messages)
+    elapsed = time.perf_counter() - start
+
+    print(f"  {label:13}: {elapsed * 1000:9.1f} ms   {len(messages) / elapsed:10.0f} msg/s   {matched} matched")
+
+
+def main():
+    commands = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    message_count = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+
+    plugins = make_plugins(commands)
+    messages = make_messages(message_count, commands)
+
+    print(f"{commands} commands in {len(plugins)} plugins, {message_count} messages (1 in 20 a command)")
+    run("every command", every_command, plugins, messages)
+    run("router", router, plugins, messages)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+"""
+    Description:
+        Benchmark for zlib-stream gateway compression
+        Feeds GUILD_CREATE and MESSAGE_CREATE payloads through Websocket.decode
+        as plain text frames and as one zlib-stream, reporting bytes on the
+        wire and the time spent decoding
+
+        Usage: python benchmarks/bench_compression.py [members]
+
+    Contributors:
+        - Patrick Hennessy
+"""
+import os
+import sys
+import time
+import zlib
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.payloads import guild_payload, message_payload  # noqa: E402
+from bolt.core.config import Config  # noqa: E402
+from bolt.discord.websocket import Websocket  # noqa: E402
+import ujson as json  # noqa: E402
+
+
+class FakeBot():
+    def __init__(self, compress):
+        self.config = Config({"api_key": "token", "gateway_compress": compress})
+        self.api = None
+        self.plugins = []
+
+
+def frames(payloads, compress):
+    compressor = zlib.compressobj()
+
+    for payload in payloads:
+        text = json.dumps({"op": 0, "t": payload[0], "s": 1, "d": payload[1]})
+        if compress:
+            yield compressor.compress(text.encode()) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        else:
+            yield text
+
+
+def run(label, payloads, compress):
+    websocket = Websocket(FakeBot(compress), "token")
+    websocket.handle_websocket_open(None)
+    encoded = list(frames(payloads, compress))
+
+    start = time.perf_counter()
+    for frame in encoded:
+        json.loads(websocket.decode(frame))
+    elapsed = time.perf_counter() - start
+
+    print(
+        f"  {label:6}: {websocket.bytes_received / 1024:10.1f} KiB on the wire   "
+        f"{elapsed * 1000:8.2f} ms decoding (zlib {websocket.decompress_time * 1000:7.2f} ms)   "
+        f"ratio {websocket.compression_ratio:5.2f}x"
+    )
+
+
+def main():
+    members = int(sys.argv[1]) if len(sys.argv) > 1 else 25000
+
+    payloads = [("GUILD_CREATE", guild_payload(members=members))]
+    payloads += [("MESSAGE_CREATE", message_payload(index)) for index in range(1000)]
+
+    print(f"GUILD_CREATE with {members} members followed by 1000 MESSAGE_CREATEs")
+    run("plain", payloads, compress=False)
+    run("zlib", payloads, compress=True)
+
+
+if __name__ == '__main__':
+    main()
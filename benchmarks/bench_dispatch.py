@@ -0,0 +1,110 @@
+"""
+    Description:
+        Benchmark for gateway event dispatch
+        50 plugins hold 500 subscriptions spread over the gateway events.
+        Routes a stream of events the old way (event class found with
+        snakecase_to_camelcase + getattr, then every subscription of every
+        plugin compared against the event name) and through the dispatch tables.
+        Events carry only the gateway envelope so routing dominates the timing
+
+        Usage: python benchmarks/bench_dispatch.py [plugins] [subscriptions per plugin] [events]
+
+    Contributors:
+        - Patrick Hennessy
+"""
+import os
+import sys
+import time
+
+import gevent
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bolt.discord import events  # noqa: E402
+from bolt.discord.events import Events, EventHandler, Subscription  # noqa: E402
+from bolt.utils import snakecase_to_camelcase  # noqa: E402
+
+
+class FakeQueue():
+    def __init__(self):
+        self.items = 0
+
+    def put(self, item):
+        self.items += 1
+
+
+class FakePlugin():
+    def __init__(self, subscriptions):
+        self.subscriptions = subscriptions
+        self.enabled = True
+
+
+class FakeBot():
+    def __init__(self, plugins):
+        self.plugins = plugins
+        self.queue = FakeQueue()
+
+
+def callback(event):
+    pass
+
+
+def make_bot(plugin_count, per_plugin):
+    names = [event for event in Events if event not in (Events.READY, Events.RESUMED)]
+    plugins = []
+    for plugin in range(plugin_count):
+        subscriptions = [
+            Subscription(names[(plugin * per_plugin + index) % len(names)], callback)
+            for index in range(per_plugin)
+        ]
+        plugins.append(FakePlugin(subscriptions))
+
+    return FakeBot(plugins)
+
+
+def legacy(bot, stream):
+    for payload in stream:
+        event = getattr(events, snakecase_to_camelcase(payload['t'])).marshal(payload)
+        for plugin in bot.plugins:
+            if plugin.enabled is True:
+                for subscription in plugin.subscriptions:
+                    if subscription.event_name == snakecase_to_camelcase(event.name):
+                        bot.queue.put((subscription.callback, [event], {}))
+                        gevent.sleep(0)
+
+
+def tables(bot, stream):
+    handler = EventHandler(bot)
+    handler.rebuild()
+
+    for payload in stream:
+        event = events.get_event_class(payload['t']).marshal(payload)
+        handler.dispatch(event)
+
+
+def run(label, route, bot, stream):
+    bot.queue = FakeQueue()
+
+    start = time.perf_counter()
+    route(bot, stream)
+    elapsed = time.perf_counter() - start
+
+    print(f"  {label:8}: {elapsed * 1000:8.1f} ms   {len(stream) / elapsed:10.0f} events/s   {bot.queue.items} queued")
+
+
+def main():
+    plugin_count = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    per_plugin = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    event_count = int(sys.argv[3]) if len(sys.argv) > 3 else 20000
+
+    bot = make_bot(plugin_count, per_plugin)
+    mix = ["MESSAGE_CREATE"] * 6 + ["PRESENCE_UPDATE"] * 2 + ["TYPING_START", "GUILD_MEMBER_UPDATE"]
+    stream = [{"op": 0, "s": index, "t": mix[index % len(mix)]} for index in range(event_count)]
+
+    print(f"{plugin_count} plugins, {plugin_count * per_plugin} subscriptions, {event_count} events")
+    run("legacy", legacy, bot, stream)
+    run("tables", tables, bot, stream)
+
+
+if __name__ == '__main__':
+    main()
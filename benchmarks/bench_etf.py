@@ -0,0 +1,67 @@
+"""
+    Description:
+        Benchmark for the ETF gateway encoding
+        Records a gateway stream (one GUILD_CREATE followed by MESSAGE_CREATEs)
+        in both encodings and decodes it with ujson and the ETF decoder.
+        As on the real gateway, the ETF stream carries snowflakes as integers
+
+        Usage: python benchmarks/bench_etf.py [members] [messages]
+
+    Contributors:
+        - Patrick Hennessy
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.payloads import guild_payload, message_payload  # noqa: E402
+from bolt.discord import etf  # noqa: E402
+import ujson as json  # noqa: E402
+
+
+def snowflakes_to_int(value, key=""):
+    if isinstance(value, dict):
+        return {name: snowflakes_to_int(item, name) for name, item in value.items()}
+    elif isinstance(value, list):
+        return [snowflakes_to_int(item, key) for item in value]
+    elif isinstance(value, str) and (key == "id" or key.endswith("_id")) and value.isdigit():
+        return int(value)
+    return value
+
+
+def record(members, messages):
+    stream = [{"op": 0, "s": 1, "t": "GUILD_CREATE", "d": guild_payload(members=members)}]
+    stream += [
+        {"op": 0, "s": index + 2, "t": "MESSAGE_CREATE", "d": message_payload(index)}
+        for index in range(messages)
+    ]
+    return stream
+
+
+def decode(label, loads, frames):
+    start = time.perf_counter()
+    for frame in frames:
+        loads(frame)
+    elapsed = time.perf_counter() - start
+
+    size = sum(len(frame) for frame in frames)
+    print(f"  {label:14}: {size / 1024:9.1f} KiB   {elapsed * 1000:9.2f} ms")
+
+
+def main():
+    members = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    messages = int(sys.argv[2]) if len(sys.argv) > 2 else 5000
+
+    stream = record(members, messages)
+    json_frames = [json.dumps(payload).encode() for payload in stream]
+    etf_frames = [etf.pack(snowflakes_to_int(payload)) for payload in stream]
+
+    print(f"GUILD_CREATE with {members} members followed by {messages} MESSAGE_CREATEs")
+    decode("json (ujson)", json.loads, json_frames)
+    decode("etf", etf.unpack, etf_frames)
+
+
+if __name__ == '__main__':
+    main()
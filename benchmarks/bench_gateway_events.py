@@ -0,0 +1,78 @@
+"""
+    Description:
+        Benchmark for turning gateway payloads into events
+        Compares marshal(payload) + remarshal(payload['d']), the way every
+        dispatch used to be built, against GatewayEvent.from_payload, and both
+        against an event only the cache's raw handlers want, which is never
+        marshalled at all
+
+        Usage: python benchmarks/bench_gateway_events.py [events]
+
+    Contributors:
+        - Patrick Hennessy
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.payloads import message_payload, user_payload, GUILD_ID  # noqa: E402
+from bolt.discord.events import EventHandler, get_event_class  # noqa: E402
+from bolt.discord.cache import Cache  # noqa: E402
+
+
+def two_pass(handler, stream):
+    for payload in stream:
+        event = get_event_class(payload['t']).marshal(payload)
+        event.remarshal(payload['d'])
+
+
+def one_pass(handler, stream):
+    for payload in stream:
+        get_event_class(payload['t']).from_payload(payload)
+
+
+def raw_only(handler, stream):
+    for payload in stream:
+        event_class = get_event_class(payload['t'])
+        handler.dispatch_raw(event_class.__name__, payload['d'])
+        if handler.subscribed(event_class.__name__):
+            event_class.from_payload(payload)
+
+
+def run(label, build, handler, stream):
+    start = time.perf_counter()
+    build(handler, stream)
+    elapsed = time.perf_counter() - start
+
+    print(f"  {label:9}: {elapsed * 1000:8.1f} ms   {len(stream) / elapsed:10.0f} events/s")
+
+
+def main():
+    event_count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    handler = EventHandler(None)
+    handler.subscribe_raw(Cache(None).raw_subscriptions)
+
+    streams = {
+        "MESSAGE_CREATE": [
+            {"op": 0, "s": index, "t": "MESSAGE_CREATE", "d": message_payload(index)}
+            for index in range(event_count)
+        ],
+        "GUILD_MEMBER_UPDATE": [
+            {"op": 0, "s": index, "t": "GUILD_MEMBER_UPDATE", "d": {
+                "guild_id": str(GUILD_ID), "user": user_payload(index), "roles": [], "nick": None
+            }}
+            for index in range(event_count)
+        ]
+    }
+
+    for name, stream in streams.items():
+        print(f"{event_count} {name} events")
+        run("two pass", two_pass, handler, stream)
+        run("one pass", one_pass, handler, stream)
+        run("raw only", raw_only, handler, stream)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+"""
+    Description:
+        Benchmark for lazy nested fields
+        Marshals MESSAGE_CREATE and GUILD_CREATE payloads with the shipped
+        (lazy) models and with eager clones of the same models, without
+        touching the nested lists afterwards
+
+        Usage: python benchmarks/bench_lazy.py [iterations]
+
+    Contributors:
+        - Patrick Hennessy
+"""
+import os
+import sys
+import copy
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.payloads import guild_payload, message_payload  # noqa: E402
+from bolt.discord.models.base import Model, ModelMeta  # noqa: E402
+from bolt.discord.models.guild import Guild  # noqa: E402
+from bolt.discord.models.message import Message  # noqa: E402
+
+
+def eager(model):
+    """
+        Clone of a model with every lazy field marshalled up front
+    """
+    namespace = {}
+    for name, field in model.__fields__.items():
+        field = copy.copy(field)
+        field.lazy = False
+        namespace[name] = field
+
+    return ModelMeta(f"Eager{model.__name__}", (Model,), namespace)
+
+
+def compare(label, model, payload, iterations):
+    eager_model = eager(model)
+
+    eager_time = min(timeit.repeat(lambda: eager_model.marshal(payload), number=iterations, repeat=3)) / iterations
+    lazy_time = min(timeit.repeat(lambda: model.marshal(payload), number=iterations, repeat=3)) / iterations
+
+    print(label)
+    print(f"  eager : {eager_time * 1000000:10.1f} us")
+    print(f"  lazy  : {lazy_time * 1000000:10.1f} us")
+    print(f"  ratio : {eager_time / lazy_time:10.1f}x")
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+
+    message = message_payload(0, mentions=5, embeds=2)
+    compare("Message.marshal, nested lists never read", Message, message, iterations)
+
+    guild = guild_payload(members=1000)
+    compare("Guild.marshal, 1000 members/presences never read", Guild, guild, max(1, iterations // 10))
+
+
+if __name__ == '__main__':
+    main()
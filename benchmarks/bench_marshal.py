@@ -0,0 +1,100 @@
+"""
+    Description:
+        Microbenchmark for Model.marshal on a realistic GUILD_CREATE payload
+        Compares the compiled per-class marshal plan against the previous
+        implementation that rebuilt the field map on every call
+
+        Usage: python benchmarks/bench_marshal.py [members] [iterations]
+
+    Contributors:
+        - Patrick Hennessy
+"""
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.payloads import guild_payload, materialise  # noqa: E402
+from benchmarks.bench_memory import dict_backed_models  # noqa: E402
+from bolt.discord.models.base import Model, Field, ListField, SearchableList  # noqa: E402
+from bolt.discord.models.base import ModelMissingRequiredKeyError  # noqa: E402
+from bolt.discord.models.guild import Guild  # noqa: E402
+
+
+def legacy_marshal(cls, data):
+    """
+        The pre-compiled-plan algorithm, kept here as the comparison baseline
+        Runs against dict-backed clones since it expects Fields in the class body
+    """
+    new_obj = cls()
+    object.__setattr__(new_obj, '__fields__', {})
+    object.__setattr__(new_obj, '__immutable_fields__', [])
+
+    fields = {}
+    for base in cls.__bases__:
+        fields.update(base.__dict__.items())
+    fields.update(cls.__dict__.items())
+
+    for field_name, field in fields.items():
+        if not isinstance(field, Field):
+            continue
+
+        new_obj.__fields__[field_name] = field
+
+        json_key = field.json_key if field.json_key else field_name
+        json_data = data.get(json_key, None)
+
+        if json_data is None and field.required:
+            raise ModelMissingRequiredKeyError(f"{cls.__name__} model is missing required key {json_key}")
+        elif json_data is None:
+            object.__setattr__(new_obj, field_name, field.default)
+        else:
+            object.__setattr__(new_obj, field_name, legacy_field_marshal(field, json_data))
+
+        if field.immutable:
+            new_obj.__immutable_fields__.append(field_name)
+
+    return new_obj
+
+
+def legacy_field_marshal(field, data):
+    if isinstance(field, ListField):
+        ret_list = SearchableList()
+        for item in data:
+            if issubclass(field.type, Model):
+                ret_list.append(legacy_marshal(field.type, item))
+            else:
+                ret_list.append(field.type(item))
+        return ret_list
+
+    if issubclass(field.type, Model):
+        return legacy_marshal(field.type, data)
+
+    return field.marshal(data)
+
+
+def compare(label, payload, iterations):
+    legacy_guild = dict_backed_models(legacy=False)[Guild]
+
+    legacy = min(timeit.repeat(lambda: legacy_marshal(legacy_guild, payload), number=iterations, repeat=3))
+    compiled = min(timeit.repeat(lambda: materialise(Guild.marshal(payload)), number=iterations, repeat=3))
+    legacy, compiled = legacy / iterations, compiled / iterations
+
+    print(label)
+    print(f"  legacy field walk : {legacy * 1000:8.2f} ms/guild")
+    print(f"  compiled plan     : {compiled * 1000:8.2f} ms/guild")
+    print(f"  speedup           : {legacy / compiled:8.2f}x")
+
+
+def main():
+    members = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    iterations = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+
+    payload = guild_payload(members=members)
+
+    compare(f"Guild.marshal, {members} members ({iterations} iterations, best of 3)", payload, iterations)
+
+
+if __name__ == '__main__':
+    main()
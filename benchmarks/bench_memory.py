@@ -0,0 +1,106 @@
+"""
+    Description:
+        Memory benchmark for slotted Models
+        Marshals a guild with 100k members using the shipped (slotted)
+        User/GuildMember/Role/VoiceState/Channel models, dict-backed clones
+        of the same models, and clones that also carry the per-instance
+        __fields__/__immutable_fields__ Model.marshal used to attach, then
+        compares the allocations retained by each resulting object graph
+        The clones keep the models' properties and methods, so indexed lists
+        build the same indexes in every run
+
+        Usage: python benchmarks/bench_memory.py [members]
+
+    Contributors:
+        - Patrick Hennessy
+"""
+import os
+import sys
+import gc
+import tracemalloc
+from types import MemberDescriptorType
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.payloads import guild_payload, materialise  # noqa: E402
+from bolt.discord.models.base import Model, ModelMeta, Field, ListField  # noqa: E402
+from bolt.discord.models.guild import Guild  # noqa: E402
+
+
+def clone_field(field, types, legacy):
+    typ = dict_backed(field.type, types, legacy) if issubclass(field.type, Model) else field.type
+
+    clone = ListField(typ) if isinstance(field, ListField) else Field(typ)
+    clone.__dict__.update({key: value for key, value in field.__dict__.items() if key != 'type'})
+    return clone
+
+
+def dict_backed(model, types, legacy=False):
+    """
+        Build a dict-backed clone of a model, recursively cloning nested models
+        legacy=True also reproduces the per-instance __fields__ dict and
+        __immutable_fields__ list that Model.marshal used to attach
+    """
+    if model in types:
+        return types[model]
+
+    # Keep properties and methods (GuildMember.id) so IndexedList indexes the clones the same way
+    namespace = {
+        name: value for name, value in vars(model).items()
+        if not name.startswith('__') and not isinstance(value, MemberDescriptorType)
+    }
+    namespace.update({name: clone_field(field, types, legacy) for name, field in model.__fields__.items()})
+    namespace['__repr_keys__'] = model.__repr_keys__
+    namespace['__slotted__'] = False
+
+    if legacy:
+        def marshal(cls, data):
+            new_obj = Model.marshal.__func__(cls, data)
+            object.__setattr__(new_obj, '__fields__', dict(cls.__fields__))
+            object.__setattr__(new_obj, '__immutable_fields__', list(cls.__immutable_fields__))
+            return new_obj
+        namespace['marshal'] = classmethod(marshal)
+
+    types[model] = ModelMeta(f"Dict{model.__name__}", (Model,), namespace)
+    return types[model]
+
+
+def dict_backed_models(legacy):
+    types = {}
+    dict_backed(Guild, types, legacy=legacy)
+    return types
+
+
+def measure(guild_model, payload):
+    gc.collect()
+    tracemalloc.start()
+    guild = materialise(guild_model.marshal(payload))
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return guild, current
+
+
+def main():
+    members = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+
+    payload = guild_payload(members=members)
+
+    _, legacy_bytes = measure(dict_backed_models(legacy=True)[Guild], payload)
+    _, dict_bytes = measure(dict_backed_models(legacy=False)[Guild], payload)
+    _, slotted_bytes = measure(Guild, payload)
+
+    print(f"Guild with {members} members")
+    for label, used in [
+        ("per-instance metadata", legacy_bytes),
+        ("dict-backed models", dict_bytes),
+        ("slotted models", slotted_bytes)
+    ]:
+        print(f"  {label:22}: {used / 1024 / 1024:8.1f} MiB ({used / members:6.0f} B/member)")
+
+    print(f"  reduction vs legacy   : {100 * (1 - slotted_bytes / legacy_bytes):8.1f}%")
+    print(f"  reduction vs dict     : {100 * (1 - slotted_bytes / dict_bytes):8.1f}%")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+"""
+    Description:
+        Benchmark for the outbound message pipeline
+        A command handler announces to many channels through the fake Discord
+        server from the tests. Compares waiting on every send (the old
+        Channel.say) with queueing them, reporting how long the handler holds
+        its worker and how long until every message has been sent
+
+        Usage: python benchmarks/bench_outbound.py [channels] [messages per channel]
+
+    Contributors:
+        - Patrick Hennessy
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.payloads import message_payload  # noqa: E402
+from bolt.discord.api import API  # noqa: E402
+from bolt.discord.models.channel import Channel  # noqa: E402
+from tests.discord.fake_discord import FakeDiscord  # noqa: E402
+
+
+def announce(channels, messages, wait):
+    for index in range(messages):
+        for channel in channels:
+            channel.say(f"Announcement {index}", wait=wait)
+
+
+def run(label, channel_count, messages, wait):
+    discord = FakeDiscord(
+        default_limit=5,
+        default_window=0.5,
+        latency=0.02,
+        responses={r"/messages$": message_payload(0, mentions=0, embeds=0)}
+    ).start()
+    api = API("token", pool_size=16, base_url=discord.base_url)
+
+    channels = [Channel.marshal({"id": str(index + 1), "type": 0}) for index in range(channel_count)]
+    for channel in channels:
+        channel.api = api
+
+    start = time.monotonic()
+    announce(channels, messages, wait)
+    held = time.monotonic() - start
+    api.outbound.join()
+    drained = time.monotonic() - start
+
+    total = channel_count * messages
+    print(f"  {label:8}: handler held {held:6.2f} s   all sent after {drained:6.2f} s   {total / drained:6.1f} msg/s")
+
+    api.close()
+    discord.stop()
+
+
+def main():
+    channel_count = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    messages = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    print(f"{messages} messages to each of {channel_count} channels, 20 ms latency, 5 per 0.5s per channel")
+    run("wait", channel_count, messages, wait=True)
+    run("queued", channel_count, messages, wait=False)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+"""
+    Description:
+        Benchmark for the bucket aware rate limiter
+        Many greenlets send messages to several channels through the fake
+        Discord server from the tests, which enforces a per-channel bucket.
+        Compares the RateLimiter with the previous approach of one reset
+        timestamp per API method, reporting throughput and 429s received
+
+        Usage: python benchmarks/bench_ratelimit.py [messages] [channels]
+
+    Contributors:
+        - Patrick Hennessy
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bolt.discord.api import API  # noqa: E402
+from tests.discord.fake_discord import FakeDiscord  # noqa: E402
+import gevent  # noqa: E402
+import ujson as json  # noqa: E402
+
+LIMIT = 5
+WINDOW = 0.5
+
+
+def legacy_create_message(state, api, channel_id):
+    """
+        The old rate_limit() decorator: one reset timestamp shared by every call to the method
+    """
+    if time.time() < state['reset']:
+        gevent.sleep(state['reset'] - time.time())
+
+    for _ in range(10):
+        response = api.session.post(
+            f"{api.base_url}/channels/{channel_id}/messages",
+            headers=api.auth_headers,
+            data=json.dumps({"content": "Supa Hot"})
+        )
+
+        if int(response.headers.get('X-RateLimit-Remaining', 1)) == 0:
+            state['reset'] = time.time() + float(response.headers['X-RateLimit-Reset-After'])
+
+        if response.status_code == 429:
+            gevent.sleep(state['reset'] - time.time() + 1)
+            continue
+
+        return response.json()
+
+
+def create_message(api, channel_id):
+    return api.create_message(channel_id, {"content": "Supa Hot"})
+
+
+def run(label, send, messages, channels):
+    discord = FakeDiscord(default_limit=LIMIT, default_window=WINDOW, latency=0.005).start()
+    api = API("token", pool_size=messages, base_url=discord.base_url)
+
+    start = time.monotonic()
+    gevent.joinall([gevent.spawn(send, api, index % channels) for index in range(messages)], raise_error=True)
+    elapsed = time.monotonic() - start
+
+    print(f"  {label:14}: {elapsed:6.2f} s  {messages / elapsed:7.1f} msg/s  {discord.rate_limited:4} x 429")
+
+    api.close()
+    discord.stop()
+
+
+def main():
+    messages = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    channels = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+
+    ideal = (messages / channels) / LIMIT * WINDOW
+    print(f"{messages} messages over {channels} channels, {LIMIT} per {WINDOW}s per channel (ideal ~{ideal:.1f} s)")
+
+    state = {'reset': time.time()}
+    run("per-method", lambda api, channel_id: legacy_create_message(state, api, channel_id), messages, channels)
+    run("per-bucket", create_message, messages, channels)
+
+
+if __name__ == '__main__':
+    main()
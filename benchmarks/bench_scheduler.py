@@ -0,0 +1,125 @@
+"""
+    Description:
+        Benchmark for the scheduler
+        10k interval jobs spread over 100 plugins, first with 1 to 300 second
+        periods (~190 runs/s) and then with 1 to 60 minute periods.
+        Runs the old once-a-second scan of every job and the heap scheduler
+        for the same wall time, reporting CPU used and how late jobs ran.
+        The scan costs the same whatever the periods; the heap costs one wakeup
+        per batch of due jobs (at most 1 / Scheduler.resolution a second) plus
+        a heap update per run. Building the heap happens before timing starts
+
+        Usage: python benchmarks/bench_scheduler.py [jobs] [seconds]
+
+    Contributors:
+        - Patrick Hennessy
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import gevent  # noqa: E402
+from bolt.core.scheduler import Scheduler, Interval  # noqa: E402
+
+
+class FakeQueue():
+    def __init__(self):
+        self.items = 0
+
+    def put(self, item, lane=None):
+        self.items += 1
+
+
+class FakePlugin():
+    def __init__(self):
+        self.intervals = []
+        self.crons = []
+        self.enabled = True
+
+    def tick(self):
+        pass
+
+
+class FakeBot():
+    def __init__(self, jobs, periods):
+        random.seed(1)
+        self.plugins = [FakePlugin() for _ in range(100)]
+        for index in range(jobs):
+            plugin = self.plugins[index % 100]
+            interval = Interval(random.uniform(*periods), plugin.tick)
+            # Stagger the first runs like a bot that has been up for a while
+            interval.last = time.time() - random.uniform(0, interval.timeout)
+            plugin.intervals.append(interval)
+
+        self.queue = FakeQueue()
+
+
+def scan(bot, running):
+    """
+        The previous Scheduler.start loop
+    """
+    late = []
+    while running():
+        now = time.time()
+        for plugin in bot.plugins:
+            for interval in plugin.intervals:
+                if interval.ready():
+                    late.append(now - (interval.last + interval.timeout))
+                    interval.last = time.time()
+                    bot.queue.put((interval.callback, [], {}))
+
+        gevent.sleep(1)
+
+    return late
+
+
+def run(label, bot, seconds, start, prepare=None):
+    state = prepare(bot) if prepare else None
+
+    deadline = time.time() + seconds
+    cpu = time.process_time()
+
+    late = start(bot, lambda: time.time() < deadline, deadline, state)
+
+    cpu = time.process_time() - cpu
+    mean = sum(late) / len(late) if late else 0
+    print(
+        f"  {label:6}: {cpu * 1000:8.1f} ms CPU ({cpu / seconds * 100:5.2f}% of a core)   "
+        f"{bot.queue.items:5} runs   mean lateness {mean * 1000:7.1f} ms   max {max(late, default=0) * 1000:7.1f} ms"
+    )
+
+
+def start_scan(bot, running, deadline, state):
+    return scan(bot, running)
+
+
+def prepare_heap(bot):
+    scheduler = Scheduler(bot)
+    scheduler.rebuild(bot.plugins)
+    return scheduler
+
+
+def start_heap(bot, running, deadline, scheduler):
+    greenlet = gevent.spawn(scheduler.start)
+    gevent.sleep(deadline - time.time())
+    scheduler.stop()
+    greenlet.join()
+
+    return [scheduler.mean_lateness] * scheduler.runs + [scheduler.max_lateness]
+
+
+def main():
+    jobs = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    seconds = float(sys.argv[2]) if len(sys.argv) > 2 else 10
+
+    for periods in [(1, 300), (60, 3600)]:
+        print(f"{jobs} interval jobs, {periods[0]}-{periods[1]} s periods, for {seconds:.0f} s")
+        run("scan", FakeBot(jobs, periods), seconds, start_scan)
+        run("heap", FakeBot(jobs, periods), seconds, start_heap, prepare_heap)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,53 @@
+"""
+    Description:
+        Benchmark for Timestamp parsing
+        Parses 100k Discord ISO-8601 timestamps through the strict fast path
+        and a smaller sample through dateparser, the previous implementation
+
+        Usage: python benchmarks/bench_timestamp.py [count] [dateparser_sample]
+
+    Contributors:
+        - Patrick Hennessy
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import dateparser  # noqa: E402
+from bolt.discord.models.base import Timestamp  # noqa: E402
+
+
+def iso_dates(count):
+    return [
+        f"2017-07-{1 + index % 28:02d}T17:{index % 60:02d}:07.{index % 1000000:06d}+00:00"
+        for index in range(count)
+    ]
+
+
+def timed(callback):
+    start = time.perf_counter()
+    callback()
+    return time.perf_counter() - start
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    sample = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+
+    dates = iso_dates(count)
+
+    construct = timed(lambda: [Timestamp(date) for date in dates])
+    parse = timed(lambda: [Timestamp(date).datetime for date in dates])
+    legacy = timed(lambda: [dateparser.parse(date) for date in dates[:sample]]) / sample * count
+
+    print(f"{count} timestamps")
+    print(f"  construct only (lazy)      : {construct * 1000:10.1f} ms")
+    print(f"  construct + .datetime      : {parse * 1000:10.1f} ms")
+    print(f"  dateparser (from {sample:>6} run) : {legacy * 1000:10.1f} ms")
+    print(f"  speedup when accessed      : {legacy / parse:10.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,165 @@
+"""
+    Description:
+        Builders for realistic Discord gateway payloads used by the benchmarks
+        Shapes follow the GUILD_CREATE / MESSAGE_CREATE examples in the Discord API docs
+
+    Contributors:
+        - Patrick Hennessy
+"""
+import random
+
+GUILD_ID = 41771983423143937
+BASE_SNOWFLAKE = 80351110224678912
+
+
+def materialise(model):
+    """
+        Force every lazy field on a marshalled model so benchmarks compare equal work
+    """
+    for field_name in model.__lazy_fields__:
+        getattr(model, field_name)
+    return model
+
+
+def snowflake(offset):
+    return str(BASE_SNOWFLAKE + offset)
+
+
+def user_payload(index):
+    return {
+        "id": snowflake(index),
+        "username": f"user{index}",
+        "discriminator": f"{index % 10000:04d}",
+        "avatar": "8342729096ea3675442027381ff50dfe",
+        "bot": False
+    }
+
+
+def member_payload(index, roles=None):
+    return {
+        "user": user_payload(index),
+        "nick": None if index % 3 else f"nick{index}",
+        "roles": roles or [],
+        "joined_at": "2015-04-26T06:26:56.936000+00:00",
+        "premium_since": None,
+        "deaf": False,
+        "mute": False
+    }
+
+
+def role_payload(index):
+    return {
+        "id": snowflake(1000000 + index),
+        "name": f"role{index}",
+        "color": 3447003,
+        "hoist": True,
+        "position": index,
+        "permissions": 66321471,
+        "managed": False,
+        "mentionable": False
+    }
+
+
+def channel_payload(index):
+    return {
+        "id": snowflake(2000000 + index),
+        "guild_id": str(GUILD_ID),
+        "name": f"channel-{index}",
+        "type": 0,
+        "position": index,
+        "permission_overwrites": [],
+        "rate_limit_per_user": 0,
+        "nsfw": False,
+        "topic": "24/7 chat about how to gank Mike #2",
+        "last_message_id": snowflake(3000000 + index),
+        "parent_id": None
+    }
+
+
+def presence_payload(index):
+    return {
+        "user": {"id": snowflake(index)},
+        "guild_id": str(GUILD_ID),
+        "status": random.choice(["online", "idle", "dnd"]),
+        "game": {"name": "Bolt", "type": 0}
+    }
+
+
+def voice_state_payload(index):
+    return {
+        "guild_id": str(GUILD_ID),
+        "channel_id": snowflake(2000000),
+        "user_id": snowflake(index),
+        "session_id": f"session{index}",
+        "deaf": False,
+        "mute": False,
+        "self_deaf": False,
+        "self_mute": True,
+        "suppress": False
+    }
+
+
+def guild_payload(members=1000, channels=50, roles=20, voice_states=20):
+    role_payloads = [role_payload(index) for index in range(roles)]
+    role_ids = [int(role['id']) for role in role_payloads[:3]]
+
+    return {
+        "id": str(GUILD_ID),
+        "name": "Discord Developers",
+        "icon": "86e39f7ae3307e811784e2ffd11a7310",
+        "splash": None,
+        "owner_id": snowflake(0),
+        "region": "us-east",
+        "afk_channel_id": snowflake(2000000),
+        "afk_timeout": 300,
+        "verification_level": 1,
+        "default_message_notifications": 0,
+        "explicit_content_filter": 0,
+        "mfa_level": 0,
+        "widget_enabled": False,
+        "widget_channel_id": snowflake(2000000),
+        "roles": role_payloads,
+        "emojis": [],
+        "features": ["INVITE_SPLASH", "VANITY_URL"],
+        "joined_at": "2015-04-26T06:26:56.936000+00:00",
+        "large": members > 50,
+        "unavailable": False,
+        "member_count": members,
+        "voice_states": [voice_state_payload(index) for index in range(voice_states)],
+        "members": [member_payload(index, role_ids) for index in range(members)],
+        "channels": [channel_payload(index) for index in range(channels)],
+        "presences": [presence_payload(index) for index in range(min(members, 500))],
+        "premium_tier": 1,
+        "premium_subscription_count": 4,
+        "preferred_locale": "en-US"
+    }
+
+
+def message_payload(index, mentions=3, embeds=1):
+    return {
+        "id": snowflake(4000000 + index),
+        "channel_id": snowflake(2000000),
+        "guild_id": str(GUILD_ID),
+        "author": user_payload(index),
+        "content": f"Supa Hot {index}",
+        "timestamp": "2017-07-11T17:27:07.299000+00:00",
+        "edited_timestamp": None,
+        "tts": False,
+        "mention_everyone": False,
+        "mentions": [user_payload(index + offset) for offset in range(mentions)],
+        "mention_roles": [],
+        "attachments": [],
+        "embeds": [
+            {
+                "title": "Title",
+                "description": "Description",
+                "url": "https://discordapp.com",
+                "color": 2710212,
+                "fields": [{"name": "Field 1", "value": "Lorum Ipsum"}]
+            }
+            for _ in range(embeds)
+        ],
+        "reactions": [],
+        "pinned": False,
+        "type": 0
+    }
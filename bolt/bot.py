@@ -8,14 +8,18 @@
         - Patrick Hennessy
 """
 import gevent
-from gevent import monkey, queue
+from gevent import monkey
 monkey.patch_all()
 from gevent.backdoor import BackdoorServer
 
 from bolt.discord.api import API
-from bolt.discord.websocket import Websocket
+from bolt.discord.shards import ShardManager
 from bolt.core.webhook import WebhookServer
 from bolt.core.scheduler import Scheduler
+from bolt.core.cluster import ClusterNode
+from bolt.core.command import CommandRouter
+from bolt.core.queue import WorkQueue
+from bolt.core.workers import WorkerPool
 from bolt.core.config import Config
 from bolt.core.loader import Loader
 from bolt.utils import setup_logger
@@ -40,12 +44,32 @@ class Bot():
         self.plugins = []
         self.webhooks = WebhookServer(self)
         self.scheduler = Scheduler(self)
-        self.queue = queue.Queue()
+        self.queue = WorkQueue(
+            max_size=self.config.queue_max_size,
+            policy=self.config.queue_policy,
+            weights=self.config.queue_plugin_weights
+        )
+        self.workers = WorkerPool(
+            self.queue,
+            min_workers=self.config.worker_threads,
+            max_workers=self.config.worker_max,
+            task_timeout=self.config.worker_task_timeout,
+            idle_timeout=self.config.worker_idle_timeout
+        )
+        self.router = CommandRouter()
         self.loader = Loader(self)
 
         # Backend
-        self.api = API(self.config.api_key)
-        self.websocket = Websocket(self, self.config.api_key)
+        self.api = API(
+            self.config.api_key,
+            pool_size=max(self.config.api_pool_size, self.config.worker_max + self.config.outbound_senders),
+            timeout=self.config.api_timeout,
+            keep_alive=self.config.api_keep_alive,
+            outbound_senders=self.config.outbound_senders,
+            outbound_queue_size=self.config.outbound_queue_size
+        )
+        self.shards = ShardManager(self, self.config.api_key)
+        self.cluster = ClusterNode(self)
 
         # Database
         self.database_client = MongoClient(ssl=self.config.mongo_database_use_tls)
@@ -56,21 +80,22 @@ class Bot():
         self.logger.debug('Starting main event loop')
         greenlets = []
 
-        # Websocket Thread
-        self.greenlet_websocket = gevent.spawn(self.websocket.start)
+        # Websocket Thread(s), one greenlet per shard
+        self.greenlet_websocket = gevent.spawn(self.shards.start)
         greenlets.append(self.greenlet_websocket)
 
+        # Cluster IPC Thread - Only when running as a cluster worker
+        if self.cluster.enabled is True:
+            self.greenlet_cluster = gevent.spawn(self.cluster.start)
+            greenlets.append(self.greenlet_cluster)
+
         # Scheduler Thread
         self.greenlet_scheduler = gevent.spawn(self.scheduler.start)
         greenlets.append(self.greenlet_scheduler)
 
-        # Thread Spawner
-        self.greenlet_threadspawner = gevent.spawn(self.thread_spawner)
-        greenlets.append(self.greenlet_threadspawner)
-
-        # Worker Thread(s) - Configurable
-        self.greenlet_workers = [gevent.spawn(self.worker) for _ in range(self.config.worker_threads)]
-        greenlets.extend(self.greenlet_workers)
+        # Worker Thread(s) - Scales between worker_threads and worker_max
+        self.greenlet_workers = gevent.spawn(self.workers.start)
+        greenlets.append(self.greenlet_workers)
 
         # Backdoor Server thread - Configurable
         if self.config.backdoor_enable is True:
@@ -84,21 +109,22 @@ class Bot():
 
         gevent.joinall(greenlets)
 
-    def thread_spawner(self):
-        while True:
-            for plugin in self.plugins:
-                if plugin.enabled is False:
-                    continue
+    @property
+    def websocket(self):
+        # Lowest numbered shard this process runs; the only one without sharding
+        return self.shards.primary
 
-                while True:
-                    try:
-                        callback = plugin.greenlet_queue.get_nowait()
-                        self.logger.debug(f"Spawning greenlet for {callback}")
-                        plugin.greenlets.append(gevent.spawn(callback))
-                    except queue.Empty:
-                        break
+    @property
+    def cache(self):
+        return self.shards.cache
 
-            gevent.sleep(1)
+    def plugins_changed(self):
+        """
+            Called by the Loader whenever a plugin is loaded or unloaded
+        """
+        self.shards.event_handler.rebuild()
+        self.router.rebuild(self.plugins)
+        self.scheduler.rebuild(self.plugins)
 
     def backdoor(self):
         self.logger.debug('Spawning Backdoor Greenlet')
@@ -109,21 +135,3 @@ class Bot():
 
         server = BackdoorServer((self.config.backdoor_host, self.config.backdoor_port), locals={'bot': self})
         server.serve_forever()
-
-    def worker(self):
-        while True:
-            callback, args, kwargs = self.queue.get()
-
-            try:
-                callback(*args, **kwargs)
-            except gevent.GreenletExit:
-                self.logger.debug("Recieved kill signal from main thread. Exiting")
-                break
-            except Exception as e:
-                module_name = f"{callback.__self__.__module__}"
-                class_name = f"{callback.__self__.__class__.__name__}"
-                method_name = f"{callback.__name__}"
-
-                self.logger.warning(f"Exception \"{type(e).__name__}\" raised in task: {module_name}.{class_name}.{method_name}: {e}", exc_info=True)
-            finally:
-                gevent.sleep(0)
@@ -0,0 +1,407 @@
+"""
+    Description:
+        Multi-process sharding
+        The supervisor splits the bot's shards into contiguous groups and runs
+        one worker process per group. Each worker is a full Bot with its own
+        Cache and Scheduler. A worker that exits is started again.
+
+        Processes talk over unix sockets in cluster_ipc_dir using one JSON
+        object per line:
+            - supervisor.sock: workers ask before each IDENTIFY, so shards in
+              different processes still respect max_concurrency
+            - worker-<n>.sock: answers queries registered on the worker's
+              ClusterNode, which plugins use for cross-shard aggregates
+
+        Workers are started as fresh interpreters rather than forked from the
+        supervisor, so they do not inherit its gevent hub or greenlets
+
+    Contributors:
+        - Patrick Hennessy
+"""
+from gevent.server import StreamServer
+from gevent.event import Event
+from gevent import subprocess
+import ujson as json
+import argparse
+import logging
+import socket
+import gevent
+import time
+import sys
+import os
+
+from bolt.discord.shards import IdentifyLimiter
+from bolt.discord.api import API
+
+
+def shard_groups(shard_ids, processes):
+    """
+        Split shard_ids into at most processes contiguous groups of near equal size
+    """
+    shard_ids = list(shard_ids)
+    processes = max(1, min(processes, len(shard_ids)))
+    size, extra = divmod(len(shard_ids), processes)
+
+    groups = []
+    start = 0
+    for index in range(processes):
+        end = start + size + (1 if index < extra else 0)
+        groups.append(shard_ids[start:end])
+        start = end
+
+    return groups
+
+
+def ipc_request(path, request, timeout=5):
+    """
+        Send one request to the unix socket at path and return its reply
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(path)
+        sock.sendall(json.dumps(request).encode() + b"\n")
+
+        data = b""
+        while not data.endswith(b"\n"):
+            chunk = sock.recv(4096)
+            if not chunk:
+                raise ConnectionError(f"{path} closed before replying")
+            data += chunk
+
+    return json.loads(data)
+
+
+class IPCServer():
+    """
+        Serves handler(request) -> reply on a unix socket
+    """
+    def __init__(self, path, handler):
+        self.path = path
+        self.handler = handler
+        self.logger = logging.getLogger(__name__)
+
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+        listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        listener.bind(self.path)
+        listener.listen(128)
+        self.server = StreamServer(listener, self.handle)
+
+    def start(self):
+        self.server.start()
+
+    def stop(self):
+        self.server.stop()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def handle(self, sock, address):
+        reader = sock.makefile('rb')
+
+        for line in reader:
+            try:
+                reply = {"result": self.handler(json.loads(line))}
+            except Exception as e:
+                self.logger.warning(f"IPC request failed: {e}")
+                reply = {"error": str(e)}
+
+            sock.sendall(json.dumps(reply).encode() + b"\n")
+
+
+class ClusterIdentifyLimiter():
+    """
+        IdentifyLimiter for a worker; the supervisor holds the real one
+        Each request waits at most timeout seconds for a slot and is then asked
+        again, so a supervisor that died or stopped answering is noticed
+    """
+    retry_delay = 1
+
+    def __init__(self, path, timeout=30, attempts=3):
+        self.path = path
+        self.timeout = timeout
+        self.attempts = attempts
+        self.logger = logging.getLogger(__name__)
+
+    def wait(self, shard_id):
+        failures = 0
+
+        while True:
+            try:
+                reply = ipc_request(
+                    self.path,
+                    {"op": "identify", "shard_id": shard_id, "timeout": self.timeout},
+                    timeout=self.timeout + 5
+                )
+            except OSError as e:
+                failures += 1
+                if failures >= self.attempts:
+                    raise ConnectionError(f"Supervisor did not grant shard {shard_id} an identify slot: {e}")
+
+                self.logger.warning(f"Identify request for shard {shard_id} failed: {e}, retrying")
+                gevent.sleep(self.retry_delay)
+                continue
+
+            if "error" in reply:
+                raise ConnectionError(f"Supervisor refused identify for shard {shard_id}: {reply['error']}")
+
+            if reply['result'] is True:
+                return
+
+            failures = 0
+
+
+class ClusterNode():
+    """
+        This process's view of the cluster, available to plugins as bot.cluster
+        Without cluster mode it is a cluster of one and queries only run locally
+    """
+    def __init__(self, bot, index=0, workers=1, ipc_dir=None):
+        self.bot = bot
+        self.index = index
+        self.workers = workers
+        self.ipc_dir = ipc_dir
+        self.server = None
+        self.logger = logging.getLogger(__name__)
+
+        self.queries = {
+            "guild_count": lambda: len(self.bot.cache.guilds),
+            "channel_count": lambda: len(self.bot.cache.channels),
+            "user_count": lambda: len(self.bot.cache.users),
+            "shards": lambda: self.bot.shards.status(),
+            "event_counts": lambda: self.bot.shards.event_counts()
+        }
+
+    @property
+    def enabled(self):
+        return self.ipc_dir is not None
+
+    def worker_path(self, index):
+        return os.path.join(self.ipc_dir, f"worker-{index}.sock")
+
+    def register(self, name, callback):
+        self.queries[name] = callback
+
+    def start(self):
+        self.server = IPCServer(self.worker_path(self.index), self.handle)
+        self.server.start()
+
+    def stop(self):
+        if self.server is not None:
+            self.server.stop()
+
+    def handle(self, request):
+        return self.queries[request['query']]()
+
+    def query(self, name, timeout=5):
+        """
+            Run a registered query on every worker and return the results by worker
+            Workers that cannot be reached, such as one being restarted, are left out
+        """
+        results = {self.index: self.queries[name]()}
+
+        for index in range(self.workers):
+            if index == self.index:
+                continue
+
+            try:
+                reply = ipc_request(self.worker_path(index), {"query": name}, timeout=timeout)
+            except OSError as e:
+                self.logger.warning(f"Worker {index} did not answer \"{name}\": {e}")
+                continue
+
+            if "error" in reply:
+                self.logger.warning(f"Worker {index} failed \"{name}\": {reply['error']}")
+                continue
+
+            results[index] = reply['result']
+
+        return results
+
+    def total(self, name, timeout=5):
+        return sum(self.query(name, timeout=timeout).values())
+
+
+class Worker():
+    def __init__(self, index, shard_ids):
+        self.index = index
+        self.shard_ids = shard_ids
+        self.process = None
+        self.started_at = 0
+        self.restarts = 0
+        self.failures = 0
+
+    @property
+    def alive(self):
+        return self.process is not None and self.process.poll() is None
+
+
+class ClusterSupervisor():
+    # A worker that lives this long is considered healthy again
+    stable_after = 60
+    backoff_base = 1
+    backoff_cap = 60
+
+    def __init__(self, config, config_path, processes=None):
+        self.config = config
+        self.config_path = os.path.abspath(config_path)
+        self.processes = processes or self.config.cluster_processes
+        self.ipc_dir = os.path.abspath(self.config.cluster_ipc_dir)
+        self.logger = logging.getLogger(__name__)
+
+        self.running = False
+        self.stopped = Event()
+        self.shard_total = self.config.shard_total
+        self.identify_limiter = None
+        self.workers = []
+        self.server = None
+
+    @property
+    def supervisor_path(self):
+        return os.path.join(self.ipc_dir, "supervisor.sock")
+
+    def create_workers(self):
+        max_concurrency = 1
+
+        if self.config.shard_auto is True:
+            gateway = API(self.config.api_key).get_gateway_bot()
+            self.shard_total = gateway['shards']
+            max_concurrency = gateway.get('session_start_limit', {}).get('max_concurrency', 1)
+
+        shard_ids = self.config.shard_ids or range(self.shard_total)
+        self.identify_limiter = IdentifyLimiter(max_concurrency)
+        self.workers = [Worker(index, group) for index, group in enumerate(shard_groups(shard_ids, self.processes))]
+
+        for worker in self.workers:
+            self.logger.info(f"Worker {worker.index} runs shards {worker.shard_ids} of {self.shard_total}")
+
+    def command(self, worker):
+        return [
+            # Not "-m bolt.core.cluster": importing bolt already imports this module
+            sys.executable, "-c", "from bolt.core.cluster import main; main()",
+            "--config", self.config_path,
+            "--index", str(worker.index),
+            "--workers", str(len(self.workers)),
+            "--shard-total", str(self.shard_total),
+            "--shard-ids", ",".join(str(shard_id) for shard_id in worker.shard_ids),
+            "--ipc-dir", self.ipc_dir
+        ]
+
+    def spawn(self, worker):
+        # Make the bolt package importable from the worker whatever its working directory
+        package_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        env = dict(os.environ)
+        env['PYTHONPATH'] = os.pathsep.join(filter(None, [package_root, env.get('PYTHONPATH')]))
+
+        worker.process = subprocess.Popen(self.command(worker), env=env)
+        worker.started_at = time.monotonic()
+
+    def restart_delay(self, worker):
+        return min(self.backoff_cap, self.backoff_base * 2 ** worker.failures)
+
+    def supervise(self, worker):
+        while self.running:
+            self.spawn(worker)
+            code = worker.process.wait()
+
+            if not self.running:
+                break
+
+            if time.monotonic() - worker.started_at >= self.stable_after:
+                worker.failures = 0
+
+            delay = self.restart_delay(worker)
+            worker.failures += 1
+            worker.restarts += 1
+
+            self.logger.warning(f"Worker {worker.index} exited with code {code}, restarting in {delay}s")
+            self.stopped.wait(delay)
+
+    def handle(self, request):
+        if request['op'] == "identify":
+            return self.identify_limiter.wait(request['shard_id'], timeout=request.get('timeout'))
+
+        elif request['op'] == "status":
+            return [
+                {
+                    "index": worker.index,
+                    "shard_ids": worker.shard_ids,
+                    "alive": worker.alive,
+                    "pid": worker.process.pid if worker.process else None,
+                    "restarts": worker.restarts
+                }
+                for worker in self.workers
+            ]
+
+        raise ValueError(f"Unknown op {request['op']}")
+
+    def start(self):
+        os.makedirs(self.ipc_dir, exist_ok=True)
+
+        if not self.workers:
+            self.create_workers()
+
+        self.running = True
+        self.stopped.clear()
+        self.server = IPCServer(self.supervisor_path, self.handle)
+        self.server.start()
+
+        greenlets = [gevent.spawn(self.supervise, worker) for worker in self.workers]
+        try:
+            gevent.joinall(greenlets)
+        finally:
+            self.server.stop()
+
+    def stop(self, timeout=10):
+        self.running = False
+        self.stopped.set()
+
+        for worker in self.workers:
+            if worker.alive:
+                worker.process.terminate()
+
+        for worker in self.workers:
+            if worker.process is None:
+                continue
+            try:
+                worker.process.wait(timeout=timeout)
+            except subprocess.TimeoutExpired:
+                worker.process.kill()
+
+
+def run_worker(config_path, index, workers, shard_total, shard_ids, ipc_dir):
+    from bolt.bot import Bot
+
+    bot = Bot(config_path)
+    bot.config.shard_auto = False
+    bot.config.shard_total = shard_total
+    bot.config.shard_ids = shard_ids
+
+    # Only the first worker binds the fixed webhook and backdoor ports
+    if index != 0:
+        bot.config.webhook_enable = False
+        bot.config.backdoor_enable = False
+
+    bot.cluster = ClusterNode(bot, index=index, workers=workers, ipc_dir=ipc_dir)
+    bot.shards.identify_limiter = ClusterIdentifyLimiter(os.path.join(ipc_dir, "supervisor.sock"))
+
+    bot.loader.load_plugins()
+    bot.run()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--config", required=True)
+    parser.add_argument("--index", type=int, required=True)
+    parser.add_argument("--workers", type=int, required=True)
+    parser.add_argument("--shard-total", type=int, required=True)
+    parser.add_argument("--shard-ids", required=True)
+    parser.add_argument("--ipc-dir", required=True)
+    args = parser.parse_args()
+
+    shard_ids = [int(shard_id) for shard_id in args.shard_ids.split(",")]
+
+    try:
+        run_worker(args.config, args.index, args.workers, args.shard_total, shard_ids, args.ipc_dir)
+    except KeyboardInterrupt:
+        sys.exit(0)
@@ -10,6 +10,24 @@ import parse
 import logging
 logger = logging.getLogger(__name__)
 
+REGEX_SPECIAL = set(".^$*+?{}[]\\|()")
+REGEX_QUANTIFIERS = set("*?{")
+
+
+class CommandMatch():
+    """
+        Result of matching a message against a command, computed once and
+        reused by pre-command hooks and invoke()
+    """
+    def __init__(self, command, content, args=None, kwargs=None):
+        self.command = command
+        self.content = content
+        self.args = args or []
+        self.kwargs = kwargs or {}
+
+    def __repr__(self):
+        return f"CommandMatch({self.command!r}, args={self.args}, kwargs={self.kwargs})"
+
 
 class Command():
     def __init__(self, pattern, callback, trigger=""):
@@ -24,16 +42,32 @@ class Command():
         classname = f"{type(self).__name__}"
         return f"{classname}({self.callback.__class__.__name__}.{self.callback.__name__})"
 
-    def invoke(self, event):
-        event.message.content = event.message.content.replace(self.trigger, "", 1)
+    def invoke(self, event, match=None):
+        if match is None:
+            event.message.content = event.message.content.replace(self.trigger, "", 1)
+        else:
+            event.args, event.kwargs = match.args, match.kwargs
+            event.message.content = match.content
+
         return self.callback(event)
 
+    def match(self, text):
+        """
+            CommandMatch if text runs this command, otherwise None
+        """
+        if not text.startswith(self.trigger):
+            return None
+
+        content = text[len(self.trigger):]
+        return self.match_content(content)
+
+    def match_content(self, content):
+        if self.pattern == content:
+            return CommandMatch(self, content)
+        return None
+
     def matches(self, text):
-        if text.startswith(self.trigger):
-            text = text.replace(self.trigger, "", 1)
-            return self.pattern == text
-        else:
-            return False
+        return self.match(text) is not None
 
     def parse(self, text):
         return [], {}
@@ -44,14 +78,12 @@ class RegexCommand(Command):
         self.compiled_pattern = re.compile(pattern)
         super(RegexCommand, self).__init__(pattern, *args, **kwargs)
 
-    def matches(self, text):
-        if text.startswith(self.trigger):
-            text = text.replace(self.trigger, "", 1)
-            match = self.compiled_pattern.search(text)
+    def match_content(self, content):
+        result = self.compiled_pattern.search(content)
+        if result is None:
+            return None
 
-            return match is not None
-        else:
-            return False
+        return CommandMatch(self, content, list(result.groups()))
 
     def parse(self, text):
         text = text.replace(self.trigger, "", 1)
@@ -68,13 +100,12 @@ class ParseCommand(Command):
         self.compiled_pattern = parse.compile(pattern)
         super(ParseCommand, self).__init__(pattern, *args, **kwargs)
 
-    def matches(self, text):
-        if text.startswith(self.trigger):
-            text = text.replace(self.trigger, "", 1)
-            match = self.compiled_pattern.parse(text)
-            return match is not None
-        else:
-            return False
+    def match_content(self, content):
+        result = self.compiled_pattern.parse(content)
+        if result is None:
+            return None
+
+        return CommandMatch(self, content, list(result.fixed), dict(result.named))
 
     def parse(self, text):
         text = text.replace(self.trigger, "", 1)
@@ -84,3 +115,224 @@ class ParseCommand(Command):
         kwargs = dict(result.named) or {}
 
         return args, kwargs
+
+
+def is_ascii(text):
+    """
+        str.isascii() for Python 3.6, which does not have it
+    """
+    try:
+        text.encode("ascii")
+    except UnicodeEncodeError:
+        return False
+
+    return True
+
+
+def regex_prefix(compiled_pattern):
+    """
+        Literal text every match of an anchored regex starts with, "" if unknown
+    """
+    pattern = compiled_pattern.pattern
+    if not isinstance(pattern, str) or compiled_pattern.flags & (re.IGNORECASE | re.MULTILINE | re.VERBOSE):
+        return ""
+
+    if pattern.startswith("^"):
+        pattern = pattern[1:]
+    elif pattern.startswith("\\A"):
+        pattern = pattern[2:]
+    else:
+        # search() may match anywhere in an unanchored pattern
+        return ""
+
+    # An alternation anywhere could make the prefix optional
+    if "|" in pattern:
+        return ""
+
+    prefix = []
+    index = 0
+    while index < len(pattern):
+        char = pattern[index]
+        if char == "\\":
+            if index + 1 >= len(pattern) or pattern[index + 1].isalnum():
+                break
+            literal, step = pattern[index + 1], 2
+        elif char in REGEX_SPECIAL:
+            break
+        else:
+            literal, step = char, 1
+
+        # A quantifier makes this character optional or repeated
+        if pattern[index + step:index + step + 1] in REGEX_QUANTIFIERS:
+            break
+
+        prefix.append(literal)
+        index += step
+
+    return "".join(prefix)
+
+
+def parse_prefix(pattern):
+    """
+        Literal text before the first field of a parse pattern
+    """
+    prefix = []
+    index = 0
+    while index < len(pattern):
+        char = pattern[index]
+        if char in "{}":
+            if pattern[index + 1:index + 2] != char:
+                break
+            index += 1
+
+        prefix.append(char)
+        index += 1
+
+    return "".join(prefix)
+
+
+class PrefixTrie():
+    """
+        Maps literal prefixes to values; find() returns the values of every
+        prefix the text starts with
+    """
+    def __init__(self):
+        self.root = {}
+        self.depth = 0
+
+    def insert(self, prefix, value):
+        node = self.root
+        for char in prefix:
+            node = node.setdefault(char, {})
+
+        node.setdefault(None, []).append(value)
+        self.depth = max(self.depth, len(prefix))
+
+    def find(self, text):
+        found = []
+        node = self.root
+
+        for char in text:
+            node = node.get(char)
+            if node is None:
+                break
+
+            found.extend(node.get(None, ()))
+
+        return found
+
+    def values(self):
+        found = []
+        nodes = [self.root]
+        while nodes:
+            node = nodes.pop()
+            for key, value in node.items():
+                if key is None:
+                    found.extend(value)
+                else:
+                    nodes.append(value)
+
+        return found
+
+
+class TriggerGroup():
+    """
+        The commands sharing one trigger, indexed by what their text must be
+        or start with. Values are (ordinal, command) pairs
+    """
+    def __init__(self, trigger):
+        self.trigger = trigger
+        self.exact = {}
+        self.prefixes = PrefixTrie()
+        self.casefold_prefixes = PrefixTrie()
+        self.unindexed = []
+
+    def add(self, ordinal, command):
+        entry = (ordinal, command)
+
+        if type(command) is Command:
+            self.exact.setdefault(command.pattern, []).append(entry)
+            return
+
+        if isinstance(command, RegexCommand):
+            prefix = regex_prefix(command.compiled_pattern)
+            trie = self.prefixes
+        elif isinstance(command, ParseCommand):
+            # parse matches case-insensitively
+            prefix = parse_prefix(command.pattern).lower()
+            trie = self.casefold_prefixes
+        else:
+            prefix = ""
+            trie = None
+
+        if prefix and is_ascii(prefix):
+            trie.insert(prefix, entry)
+        else:
+            self.unindexed.append(entry)
+
+    def candidates(self, text):
+        candidates = list(self.exact.get(text, ()))
+        candidates.extend(self.prefixes.find(text))
+
+        if self.casefold_prefixes.depth > 0:
+            head = text[:self.casefold_prefixes.depth]
+            if is_ascii(head):
+                candidates.extend(self.casefold_prefixes.find(head.lower()))
+            else:
+                # Unicode case folding could let non-ASCII text match an ASCII prefix
+                candidates.extend(self.casefold_prefixes.values())
+
+        candidates.extend(self.unindexed)
+        return candidates
+
+
+class CommandRouter():
+    """
+        Finds the commands a message triggers without trying every command
+        Commands are grouped by trigger; a message that starts with no trigger
+        costs one startswith() per trigger. Inside a group, plain Commands are
+        a dict lookup and anchored Regex/Parse commands are found through the
+        literal text they start with, so only those candidates run their pattern
+    """
+    def __init__(self):
+        self.groups = []
+        self.pre_command_hooks = ()
+
+    def rebuild(self, plugins):
+        groups = {}
+        hooks = []
+        ordinal = 0
+
+        for plugin in plugins:
+            if plugin.enabled is False:
+                continue
+
+            hooks.extend(plugin.pre_command_hooks)
+            for command in plugin.commands:
+                if command.trigger not in groups:
+                    groups[command.trigger] = TriggerGroup(command.trigger)
+
+                groups[command.trigger].add(ordinal, command)
+                ordinal += 1
+
+        self.groups = list(groups.values())
+        self.pre_command_hooks = tuple(hooks)
+
+    def route(self, text):
+        """
+            CommandMatches for text, in the order plugins registered the commands
+        """
+        matched = []
+
+        for group in self.groups:
+            if not text.startswith(group.trigger):
+                continue
+
+            content = text[len(group.trigger):]
+            for ordinal, command in group.candidates(content):
+                match = command.match_content(content)
+                if match is not None:
+                    matched.append((ordinal, match))
+
+        matched.sort(key=lambda entry: entry[0])
+        return [match for _, match in matched]
@@ -8,3 +8,7 @@ class InvalidBotToken(Exception):
 
 class InvalidBotPlugin(Exception):
     pass
+
+
+class RateLimitExceeded(Exception):
+    pass
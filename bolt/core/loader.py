@@ -57,15 +57,17 @@ class Loader():
                 plugin.load()
 
                 self.bot.plugins.append(plugin)
+                self.bot.plugins_changed()
                 break
         else:
             self.logger.warning(f"Failed to load \"{module.__file__}\". Invalid Bolt plugin, missing a Plugin subclass")
 
     def unload_plugin(self, name):
-        for index, plugin in enumerate(self.plugins):
+        for index, plugin in enumerate(self.bot.plugins):
             if plugin.name == name:
                 plugin = self.bot.plugins.pop(index)
                 plugin.unload()
+                self.bot.plugins_changed()
                 break
         else:
             self.logger.warning(f"No plugin loaded named: \"{name}\", cannot unload.")
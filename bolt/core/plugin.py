@@ -12,11 +12,31 @@ from bolt.core.scheduler import Interval, Cron
 from bolt.core.webhook import Webhook
 from bolt.discord.events import Subscription
 
+from gevent.pool import Pool, Group
 import gevent
 import logging
 import inspect
 
 
+class GreenletList(list):
+    """
+        Snapshot of a plugin's live greenlets, as Plugin.greenlets returns it
+        Greenlets appended here are adopted by the plugin, so they are
+        dropped once finished and killed when the plugin unloads
+    """
+    def __init__(self, greenlets, adopted):
+        super(GreenletList, self).__init__(greenlets)
+        self.adopted = adopted
+
+    def append(self, greenlet):
+        self.adopted.add(greenlet)
+        super(GreenletList, self).append(greenlet)
+
+    def extend(self, greenlets):
+        for greenlet in greenlets:
+            self.append(greenlet)
+
+
 class Plugin(object):
     def __init__(self, bot):
         name = self.__class__.__name__
@@ -34,8 +54,10 @@ class Plugin(object):
         self.intervals = []
         self.crons = []
         self.subscriptions = []
-        self.greenlets = []
         self.greenlet_queue = gevent.queue.Queue()
+        self.pool = Pool(self.bot.config.plugin_greenlets)
+        self.adopted = Group()
+        self.spawner = None
 
         self.enabled = False
 
@@ -54,6 +76,21 @@ class Plugin(object):
         greenlet.__name__ = callback.__name__
         self.greenlet_queue.put(greenlet)
 
+    @property
+    def greenlets(self):
+        # The pool and group drop greenlets as they finish, so this is only the live ones
+        return GreenletList(list(self.pool.greenlets) + list(self.adopted.greenlets), self.adopted)
+
+    def spawn_greenlets(self):
+        """
+            Starts queued greenlets as soon as they are queued
+            Blocks while this plugin's pool is full, leaving the rest queued
+        """
+        while True:
+            callback = self.greenlet_queue.get()
+            self.logger.debug(f"Spawning greenlet for {callback}")
+            self.pool.spawn(callback)
+
     def load_config(self, file_path):
         raise NotImplementedError
 
@@ -129,18 +166,23 @@ class Plugin(object):
                     )
                     self.subscriptions.append(subscription)
 
+        self.spawner = gevent.spawn(self.spawn_greenlets)
         self.enabled = True
 
     def unload(self):
         self.logger.info(f"Unloading plugin {self.name}...")
         self.deactivate()
 
-        gevent.killall(self.greenlets)
+        if self.spawner is not None:
+            self.spawner.kill()
+            self.spawner = None
+        self.pool.kill()
+        self.adopted.kill()
         self.pre_command_hooks = []
         self.commands = []
         self.webhooks = []
         self.intervals = []
-        self.subscribers = []
+        self.subscriptions = []
 
         self.enabled = False
 
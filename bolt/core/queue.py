@@ -0,0 +1,211 @@
+"""
+    Description:
+        Work queue in front of Bot.worker
+        Work is split into priority lanes, commands first, then event
+        subscribers, then scheduled jobs; a worker always takes from the
+        highest lane with work waiting. Inside a lane each plugin has its own
+        FIFO and plugins take turns (weighted round robin), so one plugin
+        flooding PresenceUpdate cannot push the others to the back
+
+        When more than max_size items are waiting the policy decides:
+            - drop_oldest: drop the oldest item of the plugin with the most
+              work in the lowest lane that has any
+            - drop_newest: refuse the item being added
+            - block: make the caller wait for room
+
+        Every drop is logged at debug; a warning with the running drop count
+        of each lane goes out at most once per warn_interval seconds
+
+    Contributors:
+        - Patrick Hennessy
+"""
+from gevent.lock import Semaphore
+from gevent.queue import Empty, Full
+from collections import deque
+from enum import IntEnum
+import logging
+import time
+
+
+class Lane(IntEnum):
+    COMMAND = 0
+    EVENT = 1
+    SCHEDULED = 2
+
+
+POLICIES = ("drop_oldest", "drop_newest", "block")
+
+
+def owner_name(callback):
+    owner = getattr(callback, "__self__", None)
+
+    # Command.invoke is bound to the Command; its callback is bound to the plugin
+    if hasattr(owner, "callback"):
+        owner = getattr(owner.callback, "__self__", owner)
+
+    if owner is None:
+        return ""
+
+    return getattr(owner, "name", type(owner).__name__)
+
+
+class FairLane():
+    def __init__(self, lane, weights):
+        self.lane = lane
+        self.weights = weights
+        self.queues = {}
+        self.turns = deque()
+        self.served = 0
+        self.size = 0
+
+        self.queued = 0
+        self.dequeued = 0
+        self.dropped = 0
+        self.total_wait = 0
+        self.max_wait = 0
+
+    def push(self, key, entry):
+        queue = self.queues.get(key)
+        if queue is None:
+            queue = self.queues[key] = deque()
+            self.turns.append(key)
+
+        queue.append(entry)
+        self.size += 1
+        self.queued += 1
+
+    def pop(self):
+        key = self.turns[0]
+        queue = self.queues[key]
+        entry = queue.popleft()
+        self.size -= 1
+        self.served += 1
+
+        if not queue:
+            del self.queues[key]
+            self.turns.popleft()
+            self.served = 0
+        elif self.served >= self.weights.get(key, 1):
+            self.turns.rotate(-1)
+            self.served = 0
+
+        wait = time.monotonic() - entry[0]
+        self.dequeued += 1
+        self.total_wait += wait
+        self.max_wait = max(self.max_wait, wait)
+
+        return entry[1]
+
+    def drop(self):
+        key = max(self.queues, key=lambda key: len(self.queues[key]))
+        queue = self.queues[key]
+        queue.popleft()
+        self.size -= 1
+        self.dropped += 1
+
+        if not queue:
+            if self.turns[0] == key:
+                self.served = 0
+            del self.queues[key]
+            self.turns.remove(key)
+
+        return key
+
+    def stats(self):
+        return {
+            "size": self.size,
+            "queued": self.queued,
+            "dequeued": self.dequeued,
+            "dropped": self.dropped,
+            "mean_wait": self.total_wait / self.dequeued if self.dequeued else 0,
+            "max_wait": self.max_wait,
+            "backlog": {key: len(queue) for key, queue in self.queues.items()}
+        }
+
+
+class WorkQueue():
+    # Minimum seconds between "dropped work" warnings
+    warn_interval = 10
+
+    def __init__(self, max_size=10000, policy="drop_oldest", weights=None):
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown queue policy \"{policy}\", expected one of {', '.join(POLICIES)}")
+
+        self.max_size = max_size
+        self.policy = policy
+        self.weights = weights or {}
+        self.logger = logging.getLogger(__name__)
+
+        self.lanes = [FairLane(lane, self.weights) for lane in Lane]
+        self.items = Semaphore(0)
+        self.room = Semaphore(max_size)
+        self.last_warning = None
+
+    def qsize(self):
+        return sum(lane.size for lane in self.lanes)
+
+    def empty(self):
+        return self.qsize() == 0
+
+    def put(self, item, lane=Lane.EVENT, key=None, block=True, timeout=None):
+        """
+            Queue item, a (callback, args, kwargs) tuple, on a lane
+            key groups work for fairness; by default the plugin owning the callback
+        """
+        if key is None:
+            key = owner_name(item[0])
+
+        if self.policy == "block":
+            if not self.room.acquire(blocking=block, timeout=timeout):
+                raise Full
+
+        elif self.qsize() >= self.max_size:
+            if self.policy == "drop_newest":
+                self.lanes[lane].dropped += 1
+                self.dropped("new", Lane(lane), key)
+                return False
+
+            victim = next(victim for victim in reversed(self.lanes) if victim.size > 0 or victim.lane == lane)
+            if victim.size == 0:
+                # Nothing queued in this lane or below; the new item is the lowest priority work
+                victim.dropped += 1
+                self.dropped("new", victim.lane, key)
+                return False
+
+            self.dropped("oldest", victim.lane, victim.drop())
+            self.lanes[lane].push(key, (time.monotonic(), item))
+            return True
+
+        self.lanes[lane].push(key, (time.monotonic(), item))
+        self.items.release()
+        return True
+
+    def dropped(self, which, lane, key):
+        self.logger.debug(f"Work queue full, dropped {which} {lane.name.lower()} work from \"{key}\"")
+
+        now = time.monotonic()
+        if self.last_warning is not None and now - self.last_warning < self.warn_interval:
+            return
+
+        self.last_warning = now
+        counts = ", ".join(f"{each.lane.name.lower()} {each.dropped}" for each in self.lanes)
+        self.logger.warning(
+            f"Work queue full ({self.max_size} items, policy {self.policy}), dropping work; dropped so far: {counts}"
+        )
+
+    def get(self, block=True, timeout=None):
+        if not self.items.acquire(blocking=block, timeout=timeout):
+            raise Empty
+
+        if self.policy == "block":
+            self.room.release()
+
+        for lane in self.lanes:
+            if lane.size > 0:
+                return lane.pop()
+
+    def get_nowait(self):
+        return self.get(block=False)
+
+    def stats(self):
+        return {lane.lane.name.lower(): lane.stats() for lane in self.lanes}
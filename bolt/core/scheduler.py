@@ -1,63 +1,189 @@
-import gevent
-import time
-import logging
-from croniter import croniter
-
-
-class Scheduler():
-    def __init__(self, bot):
-        self.running = False
-        self.bot = bot
-        self.logger = logging.getLogger(__name__)
-
-    def start(self):
-        self.logger.debug('Spawning Scheduler Greenlet')
-        self.running = True
-
-        while self.running:
-            for plugin in self.bot.plugins:
-                if not plugin.enabled:
-                    continue
-
-                for interval in plugin.intervals:
-                    if interval.ready():
-                        self.logger.debug(
-                            f"Scheduling interval callback for: "
-                            f"{interval.callback.__self__.__class__.__name__}."
-                            f"{interval.callback.__name__}"
-                        )
-                        interval.last = time.time()
-                        self.bot.queue.put((interval.callback, [], {}))
-
-                for cron in plugin.crons:
-                    if cron.ready():
-                        self.logger.debug(
-                            f"Scheduling interval callback for: "
-                            f"{interval.callback.__self__.__class__.__name__}."
-                            f"{interval.callback.__name__}"
-                        )
-                        self.bot.queue.put((cron.callback, [], {}))
-                        cron.cron.get_next()
-
-            gevent.sleep(1)
-
-
-class Cron():
-    def __init__(self, expression, callback):
-        self.expression = expression
-        self.callback = callback
-        self.cron = croniter(self.expression, time.time())
-        self.cron.get_next()
-
-    def ready(self):
-        return time.time() >= self.cron.get_current()
-
-
-class Interval():
-    def __init__(self, timeout, callback):
-        self.timeout = timeout
-        self.callback = callback
-        self.last = 0
-
-    def ready(self):
-        return int(time.time() - self.last) >= self.timeout
+"""
+    Description:
+        Runs plugin intervals and crons
+        Jobs sit in a heap ordered by their next run time. The scheduler sleeps
+        until the earliest one is due (or a sooner job is added), so intervals
+        can be shorter than a second and idle plugins cost nothing
+
+        Each wakeup runs every job that is due and reschedules it in place.
+        Wakeups are at least `resolution` seconds apart, so thousands of jobs
+        with short periods are run in batches instead of one wakeup per run
+
+        Removing a job only marks its heap entry as cancelled; the entry is
+        discarded when it reaches the top of the heap
+
+    Contributors:
+        - Patrick Hennessy
+"""
+from bolt.core.queue import Lane
+
+from gevent.event import Event
+from croniter import croniter
+import itertools
+import logging
+import heapq
+import math
+import time
+
+
+class Scheduler():
+    # Minimum seconds between wakeups; jobs falling due in between run together
+    resolution = 0.1
+
+    def __init__(self, bot):
+        self.running = False
+        self.bot = bot
+        self.logger = logging.getLogger(__name__)
+
+        # Heap entries are [due, sequence, job]; job is None once cancelled
+        self.heap = []
+        self.entries = {}
+        self.sequence = itertools.count()
+        self.wakeup = Event()
+
+        self.runs = 0
+        self.wakeups = 0
+        self.total_lateness = 0
+        self.max_lateness = 0
+
+    def schedule(self, job, due):
+        entry = [due, next(self.sequence), job]
+        self.entries[job] = entry
+        job.next_run = due
+        heapq.heappush(self.heap, entry)
+
+        # Wake the loop if this job is now the earliest
+        if self.heap[0] is entry:
+            self.wakeup.set()
+
+    def cancel(self, job):
+        entry = self.entries.pop(job, None)
+        if entry is not None:
+            entry[2] = None
+            job.next_run = None
+
+    def rebuild(self, plugins):
+        """
+            Bring the heap in line with the enabled plugins' jobs
+            Walks every job, so O(n) per call; only jobs that were added or
+            removed touch the heap
+        """
+        jobs = set()
+        for plugin in plugins:
+            if plugin.enabled is True:
+                jobs.update(plugin.intervals)
+                jobs.update(plugin.crons)
+
+        for job in list(self.entries):
+            if job not in jobs:
+                self.cancel(job)
+
+        now = time.time()
+        for job in jobs:
+            if job not in self.entries:
+                self.schedule(job, job.first_run(now))
+
+    def next_runs(self):
+        entries = sorted(entry for entry in self.heap if entry[2] is not None)
+        return [(due, job) for due, _, job in entries]
+
+    @property
+    def mean_lateness(self):
+        return self.total_lateness / self.runs if self.runs else 0
+
+    def start(self):
+        self.logger.debug('Spawning Scheduler Greenlet')
+        self.running = True
+
+        while self.running:
+            self.wakeup.clear()
+            self.wakeups += 1
+            now = time.time()
+
+            # Run everything due before going back to sleep, moving each entry
+            # to its next run without leaving the heap
+            while self.heap and self.heap[0][0] <= now:
+                entry = self.heap[0]
+                due, _, job = entry
+                if job is None:
+                    heapq.heappop(self.heap)
+                    continue
+
+                self.run(job, due, now)
+                entry[0] = job.next_run = job.following(due, now)
+                entry[1] = next(self.sequence)
+                heapq.heapreplace(self.heap, entry)
+
+            while self.heap and self.heap[0][2] is None:
+                heapq.heappop(self.heap)
+
+            if not self.heap:
+                self.wakeup.wait()
+            else:
+                timeout = max(self.heap[0][0], now + self.resolution) - time.time()
+                self.wakeup.wait(timeout=max(0, timeout))
+
+    def stop(self):
+        self.running = False
+        self.wakeup.set()
+
+    def run(self, job, due, now):
+        lateness = now - due
+        self.runs += 1
+        self.total_lateness += lateness
+        self.max_lateness = max(self.max_lateness, lateness)
+
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(
+                f"Scheduling {type(job).__name__.lower()} callback for: "
+                f"{job.callback.__self__.__class__.__name__}."
+                f"{job.callback.__name__} ({lateness * 1000:.1f}ms late)"
+            )
+        self.bot.queue.put((job.callback, [], {}), lane=Lane.SCHEDULED)
+
+
+class Cron():
+    def __init__(self, expression, callback):
+        self.expression = expression
+        self.callback = callback
+        self.cron = croniter(self.expression, time.time())
+        self.cron.get_next()
+        self.next_run = None
+
+    def ready(self):
+        return time.time() >= self.cron.get_current()
+
+    def first_run(self, now):
+        return self.cron.get_current()
+
+    def following(self, due, now):
+        # Runs missed while the bot was busy are skipped, not replayed
+        due = self.cron.get_next()
+        while due <= now:
+            due = self.cron.get_next()
+
+        return due
+
+
+class Interval():
+    def __init__(self, timeout, callback):
+        if not timeout > 0:
+            raise ValueError(f"Interval period must be positive, got {timeout}")
+
+        self.timeout = timeout
+        self.callback = callback
+        self.last = 0
+        self.next_run = None
+
+    def ready(self):
+        return time.time() - self.last >= self.timeout
+
+    def first_run(self, now):
+        return max(now, self.last + self.timeout)
+
+    def following(self, due, now):
+        # Step from when the run was due, not when it ran, so lateness does not
+        # accumulate; whole periods missed while busy are skipped
+        self.last = due
+        periods = max(1, math.ceil((now - due) / self.timeout))
+        return due + periods * self.timeout
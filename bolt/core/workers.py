@@ -0,0 +1,182 @@
+"""
+    Description:
+        Elastic pool of worker greenlets draining the bot's work queue
+        Keeps at least min_workers running. When work is waiting and no worker
+        is idle, more are started, up to max_workers; a worker that finds no
+        work for idle_timeout seconds exits again while above the minimum
+
+        Every task runs under a gevent.Timeout so one stuck command cannot
+        hold a worker forever. Busy time is tracked so utilisation can be
+        used to size the pool
+
+    Contributors:
+        - Patrick Hennessy
+"""
+from gevent.queue import Empty
+import logging
+import gevent
+import time
+
+
+class WorkerPool():
+    # How often the pool checks for waiting work when every worker is busy
+    scale_interval = 0.1
+
+    def __init__(self, queue, min_workers=1, max_workers=50, task_timeout=60, idle_timeout=30):
+        self.queue = queue
+        self.min_workers = max(1, min_workers)
+        self.max_workers = max(self.min_workers, max_workers)
+        self.task_timeout = task_timeout
+        self.idle_timeout = idle_timeout
+        self.logger = logging.getLogger(__name__)
+
+        self.running = False
+        self.workers = set()
+        self.busy = 0
+        self.peak = 0
+
+        self.tasks = 0
+        self.timeouts = 0
+        self.errors = 0
+        self.task_time = 0
+        self.busy_time = 0
+        self.worker_time = 0
+        self.measured_at = time.monotonic()
+
+    @property
+    def size(self):
+        return len(self.workers)
+
+    @property
+    def idle(self):
+        return self.size - self.busy
+
+    def start(self):
+        self.running = True
+        self.measured_at = time.monotonic()
+
+        for _ in range(self.min_workers):
+            self.spawn()
+
+        while self.running:
+            self.scale()
+            gevent.sleep(self.scale_interval)
+
+    def stop(self):
+        self.running = False
+        gevent.killall(list(self.workers))
+
+    def spawn(self):
+        self.measure()
+        greenlet = gevent.spawn(self.worker)
+        self.workers.add(greenlet)
+        self.peak = max(self.peak, self.size)
+        return greenlet
+
+    def scale(self):
+        """
+            Start a worker for each waiting task nobody is free to take
+        """
+        waiting = self.queue.qsize() - self.idle
+        for _ in range(min(waiting, self.max_workers - self.size)):
+            self.spawn()
+
+    def worker(self):
+        current = gevent.getcurrent()
+
+        try:
+            while self.running:
+                try:
+                    timeout = self.idle_timeout if self.size > self.min_workers else None
+                    callback, args, kwargs = self.queue.get(timeout=timeout)
+                except Empty:
+                    if self.size > self.min_workers:
+                        break
+                    continue
+
+                self.busy += 1
+                try:
+                    # Do not leave the rest of the queue waiting for the next scale() tick
+                    if self.idle == 0:
+                        self.scale()
+
+                    self.run(callback, args, kwargs)
+                finally:
+                    self.busy -= 1
+
+        except gevent.GreenletExit:
+            self.logger.debug("Recieved kill signal from main thread. Exiting")
+
+        finally:
+            self.measure()
+            self.workers.discard(current)
+
+    def run(self, callback, args, kwargs):
+        start = time.monotonic()
+        timeout = gevent.Timeout(self.task_timeout) if self.task_timeout else None
+
+        try:
+            if timeout is not None:
+                timeout.start()
+            callback(*args, **kwargs)
+
+        except gevent.Timeout as e:
+            if e is not timeout:
+                raise
+
+            self.timeouts += 1
+            self.logger.warning(f"Task {self.describe(callback)} timed out after {self.task_timeout}s")
+
+        except gevent.GreenletExit:
+            raise
+
+        except Exception as e:
+            self.errors += 1
+            self.logger.warning(
+                f"Exception \"{type(e).__name__}\" raised in task: {self.describe(callback)}: {e}",
+                exc_info=True
+            )
+
+        finally:
+            if timeout is not None:
+                timeout.close()
+
+            elapsed = time.monotonic() - start
+            self.tasks += 1
+            self.task_time += elapsed
+            self.busy_time += elapsed
+            gevent.sleep(0)
+
+    def describe(self, callback):
+        owner = getattr(callback, "__self__", None)
+        if owner is None:
+            return getattr(callback, "__qualname__", repr(callback))
+
+        return f"{type(owner).__module__}.{type(owner).__name__}.{callback.__name__}"
+
+    def measure(self):
+        # Worker-seconds accumulate between size changes, for utilisation
+        now = time.monotonic()
+        self.worker_time += self.size * (now - self.measured_at)
+        self.measured_at = now
+
+    def stats(self):
+        """
+            Utilisation is busy time over worker time since the last call;
+            near 1 means the pool is too small, near 0 that min_workers is too high
+        """
+        self.measure()
+        utilisation = min(1, self.busy_time / self.worker_time) if self.worker_time else 0
+        self.busy_time = 0
+        self.worker_time = 0
+
+        return {
+            "workers": self.size,
+            "busy": self.busy,
+            "peak": self.peak,
+            "tasks": self.tasks,
+            "timeouts": self.timeouts,
+            "errors": self.errors,
+            "mean_task_time": self.task_time / self.tasks if self.tasks else 0,
+            "utilisation": utilisation
+        }
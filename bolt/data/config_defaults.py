@@ -2,8 +2,32 @@ config_defaults = {
     "name": "Bolt",
     "trigger": ".",
     "worker_threads": 1,
+    "worker_max": 50,
+    "worker_task_timeout": 60,
+    "worker_idle_timeout": 30,
+    "plugin_greenlets": 100,
+    "queue_max_size": 10000,
+    "queue_policy": "drop_oldest",
+    "queue_plugin_weights": {},
     "shard_total": 1,
     "shard_id": 0,
+    "shard_auto": False,
+    "shard_ids": [],
+    "cluster_processes": 1,
+    "cluster_ipc_dir": "/tmp/bolt",
+    "gateway_compress": False,
+    "gateway_encoding": "json",
+    "gateway_intents": None,
+    "gateway_privileged_intents": False,
+    "gateway_large_threshold": 50,
+    "member_chunking": "off",
+    "message_cache_per_channel": 100,
+    "message_cache_max": 10000,
+    "api_pool_size": 10,
+    "api_timeout": 10,
+    "api_keep_alive": True,
+    "outbound_senders": 8,
+    "outbound_queue_size": 1000,
     "mongo_database_uri": "mongodb://localhost:27017",
     "mongo_database_username": "",
     "mongo_database_password": "",
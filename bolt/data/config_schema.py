@@ -15,12 +15,120 @@ config_schema = {
         "worker_threads": {
             "type": "integer"
         },
+        "worker_max": {
+            "type": "integer",
+            "minimum": 1
+        },
+        "worker_task_timeout": {
+            "type": "number",
+            "minimum": 0
+        },
+        "worker_idle_timeout": {
+            "type": "number",
+            "minimum": 0
+        },
+        "plugin_greenlets": {
+            "type": "integer",
+            "minimum": 1
+        },
+        "queue_max_size": {
+            "type": "integer",
+            "minimum": 1
+        },
+        "queue_policy": {
+            "type": "string",
+            "enum": ["drop_oldest", "drop_newest", "block"]
+        },
+        "queue_plugin_weights": {
+            "type": "object",
+            "additionalProperties": {
+                "type": "integer",
+                "minimum": 1
+            }
+        },
         "shard_total": {
             "type": "integer"
         },
         "shard_id": {
             "type": "integer"
         },
+        "shard_auto": {
+            "type": "boolean"
+        },
+        "shard_ids": {
+            "type": "array",
+            "items": {
+                "type": "integer",
+                "minimum": 0
+            }
+        },
+        "cluster_processes": {
+            "type": "integer",
+            "minimum": 1
+        },
+        "cluster_ipc_dir": {
+            "type": "string"
+        },
+        "gateway_compress": {
+            "type": "boolean"
+        },
+        "gateway_encoding": {
+            "type": "string",
+            "enum": [
+                "json",
+                "etf"
+            ]
+        },
+        "gateway_intents": {
+            "type": [
+                "integer",
+                "null"
+            ],
+            "minimum": 0
+        },
+        "gateway_privileged_intents": {
+            "type": "boolean"
+        },
+        "gateway_large_threshold": {
+            "type": "integer",
+            "minimum": 50,
+            "maximum": 250
+        },
+        "member_chunking": {
+            "type": "string",
+            "enum": [
+                "off",
+                "on_demand",
+                "background"
+            ]
+        },
+        "message_cache_per_channel": {
+            "type": "integer",
+            "minimum": 0
+        },
+        "message_cache_max": {
+            "type": "integer",
+            "minimum": 0
+        },
+        "api_pool_size": {
+            "type": "integer",
+            "minimum": 1
+        },
+        "api_timeout": {
+            "type": "number",
+            "exclusiveMinimum": 0
+        },
+        "api_keep_alive": {
+            "type": "boolean"
+        },
+        "outbound_senders": {
+            "type": "integer",
+            "minimum": 1
+        },
+        "outbound_queue_size": {
+            "type": "integer",
+            "minimum": 1
+        },
         "mongo_database_uri": {
             "type": "string",
             "format": "uri"
@@ -6,78 +6,112 @@
         - Patrick Hennessy
 """
 import ujson as json
-import gevent
+from bolt.discord.ratelimit import RateLimiter, MAJOR_PARAMETERS
+from bolt.discord.outbound import Outbound
+
 import requests
-import time
+from requests.adapters import HTTPAdapter
+import functools
+import inspect
 import logging
 
 
+class TimeoutHTTPAdapter(HTTPAdapter):
+    """
+        HTTPAdapter that applies a default timeout to every request sent through it
+        requests has no session-wide timeout, so it is set when the request is sent
+    """
+    def __init__(self, *args, timeout=None, **kwargs):
+        self.timeout = timeout
+        super(TimeoutHTTPAdapter, self).__init__(*args, **kwargs)
+
+    def send(self, request, **kwargs):
+        if kwargs.get('timeout') is None:
+            kwargs['timeout'] = self.timeout
+
+        return super(TimeoutHTTPAdapter, self).send(request, **kwargs)
+
+
 def rate_limit():
+    """
+        Route the decorated API call through the API's RateLimiter
+        The method name is the route, and its channel_id/guild_id/webhook_id
+        argument (if any) is the major parameter Discord buckets on
+    """
     def decorate(callback):
-        callback.reset = time.time()
+        route = callback.__name__
+        signature = inspect.signature(callback)
+        major_parameter = next((name for name in MAJOR_PARAMETERS if name in signature.parameters), None)
 
+        @functools.wraps(callback)
         def wrapper(self, *args, **kwargs):
-            retries_remaining = 3
-            # Check if there is an existing timeout from previous calls
-            if time.time() < callback.reset:
-                delay = callback.reset - time.time()
-                self.logger.warning(f"Rate limited on \"{callback.__name__}\", sleeping for {delay} seconds. Retries left: {retries_remaining}")  # noqa: E501
-                gevent.sleep(delay)
-
-            while retries_remaining > 0:
-                if retries_remaining == 0:
-                    raise Exception("Exceeded max retries for request.")
-
-                # Call real method
-                response = callback(self, *args, **kwargs)
-
-                # Look for rate limit headers
-                remaining = int(response.headers.get('X-RateLimit-Remaining', 1))
-                reset = float(response.headers.get('X-RateLimit-Reset', time.time()))
-
-                # We will have to wait on next request until reset
-                if remaining == 0:
-                    callback.reset = reset
-
-                # Check if this request is the timeout. Can happen when reconnecting the bot a lot
-                if response.status_code == 429:
-                    delay = callback.reset - time.time()
-                    self.logger.warning(f"Rate limited on \"{callback.__name__}\", sleeping for {delay} seconds. Retries left: {retries_remaining}")  # noqa: E501
-                    gevent.sleep(delay + 1)
-                    retries_remaining -= 1
-                    continue
-                else:
-                    response.raise_for_status()
-
-                if response.text:
-                    return response.json()
-                else:
-                    return {}
+            major = None
+            if major_parameter is not None:
+                major = signature.bind(self, *args, **kwargs).arguments.get(major_parameter)
+
+            response = self.rate_limiter.request(route, major, lambda: callback(self, *args, **kwargs))
+            response.raise_for_status()
+
+            if response.text:
+                return response.json()
+            else:
+                return {}
 
         return wrapper
     return decorate
 
 
 class API():
-    def __init__(self, token):
+    def __init__(self, token, pool_size=10, timeout=10, keep_alive=True, base_url="https://discord.com/api",
+                 outbound_senders=8, outbound_queue_size=1000):
         self.auth_headers = {
             "authorization": "Bot " + token,
             "Content-Type": 'application/json'
         }
-        self.base_url = "https://discord.com/api"
+        self.base_url = base_url
         self.logger = logging.getLogger(__name__)
+        self.session = self.create_session(pool_size, timeout, keep_alive)
+        self.rate_limiter = RateLimiter()
+        self.outbound = Outbound(self, senders=outbound_senders, max_size=outbound_queue_size)
+
+    def create_session(self, pool_size, timeout, keep_alive):
+        """
+            Long lived session so connections to Discord are reused between calls
+            pool_size caps how many sockets are kept open per host, and should be
+            at least the number of greenlets that may call the API at once.
+            pool_block makes extra callers wait for a free socket instead of
+            opening throwaway connections
+        """
+        session = requests.Session()
+        adapter = TimeoutHTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=pool_size,
+            pool_block=True,
+            timeout=timeout
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+
+        if keep_alive is False:
+            session.headers["Connection"] = "close"
+
+        return session
+
+    def close(self):
+        self.outbound.stop()
+        self.session.close()
 
     # Gateway methods
     @rate_limit()
     def get_gateway(self):
-        return requests.get(
+        return self.session.get(
             f"{self.base_url}/gateway",
             headers=self.auth_headers
         )
 
     @rate_limit()
     def get_gateway_bot(self):
-        return requests.get(
+        return self.session.get(
             f"{self.base_url}/gateway/bot",
             headers=self.auth_headers
         )
@@ -85,14 +119,14 @@ class API():
     # Channel methods
     @rate_limit()
     def get_channel(self, channel_id):
-        return requests.get(
+        return self.session.get(
             f"{self.base_url}/channels/{channel_id}",
             headers=self.auth_headers
         )
 
     @rate_limit()
     def modify_channel(self, channel_id, **kwargs):
-        return requests.put(
+        return self.session.put(
             f"{self.base_url}/channels/{channel_id}",
             headers=self.auth_headers,
             data=json.dumps(kwargs)
@@ -100,14 +134,14 @@ class API():
 
     @rate_limit()
     def delete_channel(self, channel_id):
-        return requests.delete(
+        return self.session.delete(
             f"{self.base_url}/channels/{channel_id}",
             headers=self.auth_headers
         )
 
     @rate_limit()
     def get_channel_messages(self, channel_id, **kwargs):
-        return requests.get(
+        return self.session.get(
             f"{self.base_url}/channels/{channel_id}/messages",
             headers=self.auth_headers,
             params=kwargs
@@ -115,14 +149,14 @@ class API():
 
     @rate_limit()
     def get_channel_message(self, channel_id, message_id):
-        return requests.get(
+        return self.session.get(
             f"{self.base_url}/channels/{channel_id}/messages/{message_id}",
             headers=self.auth_headers
         )
 
     @rate_limit()
     def create_message(self, channel_id, message_data, files=None):
-        return requests.post(
+        return self.session.post(
             f"{self.base_url}/channels/{channel_id}/messages",
             data=json.dumps(message_data),
             files=files,
@@ -131,49 +165,49 @@ class API():
 
     @rate_limit()
     def crosspost_message(self, channel_id, message_id):
-        return requests.post(
+        return self.session.post(
             f"{self.base_url}/channels/{channel_id}/messages/{message_id}/crosspost",
             headers=self.auth_headers
         )
 
     @rate_limit()
     def create_reaction(self, channel_id, message_id, emoji):
-        return requests.put(
+        return self.session.put(
             f"{self.base_url}/channels/{channel_id}/messages/{message_id}/reactions/{emoji}/@me",
             headers=self.auth_headers
         )
 
     @rate_limit()
     def get_reactions(self, channel_id, message_id, emoji):
-        return requests.get(
+        return self.session.get(
             f"{self.base_url}/channels/{channel_id}/messages/{message_id}/reactions/{emoji}",
             headers=self.auth_headers
         )
 
     @rate_limit()
     def delete_own_reaction(self, channel_id, message_id, emoji):
-        return requests.delete(
+        return self.session.delete(
             f"{self.base_url}/channels/{channel_id}/messages/{message_id}/reactions/{emoji}/@me",
             headers=self.auth_headers
         )
 
     @rate_limit()
     def delete_user_reaction(self, channel_id, message_id, emoji, user_id):
-        return requests.delete(
+        return self.session.delete(
             f"{self.base_url}/channels/{channel_id}/messages/{message_id}/reactions/{emoji}/{user_id}",
             headers=self.auth_headers
         )
 
     @rate_limit()
     def delete_all_reactions(self, channel_id, message_id):
-        return requests.delete(
+        return self.session.delete(
             f"{self.base_url}/channels/{channel_id}/messages/{message_id}/reactions",
             headers=self.auth_headers
         )
 
     @rate_limit()
     def edit_message(self, channel_id, message_id, message_data):
-        return requests.patch(
+        return self.session.patch(
             f"{self.base_url}/channels/{channel_id}/messages/{message_id}",
             headers=self.auth_headers,
             data=json.dumps(message_data)
@@ -181,14 +215,14 @@ class API():
 
     @rate_limit()
     def delete_message(self, channel_id, message_id):
-        return requests.delete(
+        return self.session.delete(
             f"{self.base_url}/channels/{channel_id}/messages/{message_id}",
             headers=self.auth_headers
         )
 
     @rate_limit()
     def bulk_delete_messages(self, channel_id, **kwargs):
-        return requests.delete(
+        return self.session.delete(
             f"{self.base_url}/channels/{channel_id}/messages/bulk-delete",
             headers=self.auth_headers,
             data=json.dumps(kwargs)
@@ -197,21 +231,21 @@ class API():
     @rate_limit()
     def edit_channel_permissions(self, channel_id, overwrite_id):
         raise NotImplementedError
-        return requests.put(
+        return self.session.put(
             f"{self.base_url}/channels/{channel_id}/permissions/{overwrite_id}",
             headers=self.auth_headers
         )
 
     @rate_limit()
     def get_channel_invites(self, channel_id):
-        return requests.delete(
+        return self.session.delete(
             f"{self.base_url}/channels/{channel_id}/invites",
             headers=self.auth_headers
         )
 
     @rate_limit()
     def create_channel_invite(self, channel_id, **kwargs):
-        return requests.post(
+        return self.session.post(
             f"{self.base_url}/channels/{channel_id}/invites",
             headers=self.auth_headers,
             data=json.dumps(kwargs)
@@ -219,14 +253,14 @@ class API():
 
     @rate_limit()
     def delete_channel_permission(self, channel_id, overwrite_id):
-        return requests.delete(
+        return self.session.delete(
             f"{self.base_url}/channels/{channel_id}/permissions/{overwrite_id}",
             headers=self.auth_headers
         )
 
     @rate_limit()
     def follow_news_channel(self, channel_id, target_channel_id):
-        return requests.post(
+        return self.session.post(
             f"{self.base_url}/channels/{channel_id}/followers",
             data=json.dumps({"webhook_channel_id": target_channel_id}),
             headers=self.auth_headers
@@ -234,35 +268,35 @@ class API():
 
     @rate_limit()
     def trigger_typing(self, channel_id):
-        return requests.post(
+        return self.session.post(
             f"{self.base_url}/channels/{channel_id}/typing",
             headers=self.auth_headers
         )
 
     @rate_limit()
     def get_pinned_messages(self, channel_id):
-        return requests.get(
+        return self.session.get(
             f"{self.base_url}/channels/{channel_id}/pins",
             headers=self.auth_headers
         )
 
     @rate_limit()
     def add_pinned_channel_message(self, channel_id, message_id):
-        return requests.put(
+        return self.session.put(
             f"{self.base_url}/channels/{channel_id}/pins/{message_id}",
             headers=self.auth_headers
         )
 
     @rate_limit()
     def delete_pinned_channel_message(self, channel_id, message_id):
-        return requests.delete(
+        return self.session.delete(
             f"{self.base_url}/channels/{channel_id}/pins/{message_id}",
             headers=self.auth_headers
         )
 
     @rate_limit()
     def add_recipient_group_dm(self, channel_id, user_id, **kwargs):
-        return requests.put(
+        return self.session.put(
             f"{self.base_url}/channels/{channel_id}/recipients/{user_id}",
             headers=self.auth_headers,
             data=json.dumps(kwargs)
@@ -270,7 +304,7 @@ class API():
 
     @rate_limit()
     def remove_recipient_group_dm(self, channel_id, user_id):
-        return requests.delete(
+        return self.session.delete(
             f"{self.base_url}/channels/{channel_id}/recipients/{user_id}",
             headers=self.auth_headers,
         )
@@ -278,21 +312,21 @@ class API():
     # User Methods
     @rate_limit()
     def get_current_user(self):
-        return requests.get(
+        return self.session.get(
             f"{self.base_url}/users/@me",
             headers=self.auth_headers
         )
 
     @rate_limit()
     def get_user(self, user_id):
-        return requests.get(
+        return self.session.get(
             f"{self.base_url}/users/{user_id}",
             headers=self.auth_headers
         )
 
     @rate_limit()
     def modify_current_user(self, username, avatar_data=None):
-        return requests.patch(
+        return self.session.patch(
             f"{self.base_url}/users/@me",
             headers=self.auth_headers,
             data=json.dumps({"username": username, "avatar": avatar_data})
@@ -300,28 +334,28 @@ class API():
 
     @rate_limit()
     def get_current_user_guilds(self):
-        return requests.get(
+        return self.session.get(
             f"{self.base_url}/users/@me/guilds",
             headers=self.auth_headers
         )
 
     @rate_limit()
     def leave_guild(self, guild_id):
-        return requests.delete(
+        return self.session.delete(
             f"{self.base_url}/users/@me/guilds/{guild_id}",
             headers=self.auth_headers
         )
 
     @rate_limit()
     def get_user_dms(self):
-        return requests.get(
+        return self.session.get(
             f"{self.base_url}/users/@me/channels",
             headers=self.auth_headers
         )
 
     @rate_limit()
     def create_dm(self, user_id):
-        return requests.post(
+        return self.session.post(
             f"{self.base_url}/users/@me/channels",
             headers=self.auth_headers,
             data=json.dumps({"recipient_id": user_id})
@@ -333,7 +367,7 @@ class API():
 
     @rate_limit()
     def get_user_connections(self):
-        return requests.get(
+        return self.session.get(
             f"{self.base_url}/users/@me/connections",
             headers=self.auth_headers,
         )
@@ -341,7 +375,7 @@ class API():
     # Guild Methods
     @rate_limit()
     def create_guild(self, **kwargs):
-        return requests.post(
+        return self.session.post(
             f"{self.base_url}/guilds",
             headers=self.auth_headers,
             data=json.dumps(kwargs)
@@ -349,21 +383,21 @@ class API():
 
     @rate_limit()
     def get_guild(self, guild_id):
-        return requests.get(
+        return self.session.get(
             f"{self.base_url}/guilds/{guild_id}",
             headers=self.auth_headers
         )
 
     @rate_limit()
     def get_guild_preview(self, guild_id):
-        return requests.get(
+        return self.session.get(
             f"{self.base_url}/guilds/{guild_id}/preview",
             headers=self.auth_headers
         )
 
     @rate_limit()
     def modify_guild(self, guild_id, **kwargs):
-        return requests.patch(
+        return self.session.patch(
             f"{self.base_url}/guilds/{guild_id}",
             headers=self.auth_headers,
             data=json.dumps(kwargs)
@@ -371,14 +405,14 @@ class API():
 
     @rate_limit()
     def delete_guild(self, guild_id):
-        return requests.delete(
+        return self.session.delete(
             f"{self.base_url}/guilds/{guild_id}",
             headers=self.auth_headers
         )
 
     @rate_limit()
     def get_guild_channels(self, guild_id):
-        return requests.get(
+        return self.session.get(
             f"{self.base_url}/guilds/{guild_id}/channels",
             headers=self.auth_headers
         )
@@ -391,7 +425,7 @@ class API():
         }
         data.update(**kwargs)
 
-        return requests.post(
+        return self.session.post(
             f"{self.base_url}/guilds/{guild_id}/channels",
             data=json.dumps(data),
             headers=self.auth_headers
@@ -399,14 +433,14 @@ class API():
 
     @rate_limit()
     def get_guild_member(self, guild_id, user_id):
-        return requests.get(
+        return self.session.get(
             f"{self.base_url}/guilds/{guild_id}/members/{user_id}",
             headers=self.auth_headers
         )
 
     @rate_limit()
     def list_guild_members(self, guild_id, **kwargs):
-        return requests.get(
+        return self.session.get(
             f"{self.base_url}/guilds/{guild_id}/members",
             headers=self.auth_headers,
             data=json.dumps(kwargs)
@@ -414,7 +448,7 @@ class API():
 
     @rate_limit()
     def modify_guild_member(self, guild_id, user_id, **kwargs):
-        return requests.patch(
+        return self.session.patch(
             f"{self.base_url}/guilds/{guild_id}/members/{user_id}",
             headers=self.auth_headers,
             data=json.dumps(kwargs)
@@ -422,7 +456,7 @@ class API():
 
     @rate_limit()
     def modify_current_user_nick(self, guild_id, nick):
-        return requests.patch(
+        return self.session.patch(
             f"{self.base_url}/guilds/{guild_id}/members/@me/nick",
             headers=self.auth_headers,
             data=json.dumps({"nick": nick})
@@ -430,35 +464,35 @@ class API():
 
     @rate_limit()
     def add_guild_member_role(self, guild_id, user_id, role_id):
-        return requests.put(
+        return self.session.put(
             f"{self.base_url}/guilds/{guild_id}/members/{user_id}/roles/{role_id}",
             headers=self.auth_headers
         )
 
     @rate_limit()
     def remove_guild_member_role(self, guild_id, user_id, role_id):
-        return requests.delete(
+        return self.session.delete(
             f"{self.base_url}/guilds/{guild_id}/members/{user_id}/roles/{role_id}",
             headers=self.auth_headers
         )
 
     @rate_limit()
     def remove_guild_member(self, guild_id, user_id):
-        return requests.delete(
+        return self.session.delete(
             f"{self.base_url}/guilds/{guild_id}/members/{user_id}",
             headers=self.auth_headers
         )
 
     @rate_limit()
     def get_guild_bans(self, guild_id):
-        return requests.get(
+        return self.session.get(
             f"{self.base_url}/guilds/{guild_id}/bans",
             headers=self.auth_headers
         )
 
     @rate_limit()
     def create_guild_ban(self, guild_id, user_id, delete_message_days=0, reason="No reason given"):
-        return requests.put(
+        return self.session.put(
             f"{self.base_url}/guilds/{guild_id}/bans/{user_id}",
             headers=self.auth_headers,
             data=json.dumps({"delete-message-days": delete_message_days, "reason": reason})
@@ -466,14 +500,14 @@ class API():
 
     @rate_limit()
     def delete_guild_ban(self, guild_id, user_id):
-        return requests.delete(
+        return self.session.delete(
             f"{self.base_url}/guilds/{guild_id}/bans/{user_id}",
             headers=self.auth_headers
         )
 
     @rate_limit()
     def get_guild_roles(self, guild_id):
-        return requests.get(
+        return self.session.get(
             f"{self.base_url}/guilds/{guild_id}/roles",
             headers=self.auth_headers
         )
@@ -488,7 +522,7 @@ class API():
             "mentionable": mentionable
         }
 
-        return requests.post(
+        return self.session.post(
             f"{self.base_url}/guilds/{guild_id}/roles",
             headers=self.auth_headers,
             data=json.dumps(role_data)
@@ -496,7 +530,7 @@ class API():
 
     @rate_limit()
     def modify_guild_role_positions(self, guild_id, positions=[]):
-        return requests.patch(
+        return self.session.patch(
             f"{self.base_url}/guilds/{guild_id}/roles",
             headers=self.auth_headers,
             data=json.dumps(positions)
@@ -512,7 +546,7 @@ class API():
             "mentionable": mentionable
         }
 
-        return requests.patch(
+        return self.session.patch(
             f"{self.base_url}/guilds/{guild_id}/roles/{role_id}",
             headers=self.auth_headers,
             data=json.dumps(role_data)
@@ -520,14 +554,14 @@ class API():
 
     @rate_limit()
     def delete_guild_role(self, guild_id, role_id):
-        return requests.delete(
+        return self.session.delete(
             f"{self.base_url}/guilds/{guild_id}/roles/{role_id}",
             headers=self.auth_headers
         )
 
     @rate_limit()
     def get_guild_prune_count(self, guild_id, days=1):
-        return requests.get(
+        return self.session.get(
             f"{self.base_url}/guilds/{guild_id}/prune",
             headers=self.auth_headers,
             data=json.dumps({"days": days})
@@ -535,7 +569,7 @@ class API():
 
     @rate_limit()
     def begin_guild_prune(self, guild_id, days=1, compute_prune_count=False):
-        return requests.post(
+        return self.session.post(
             f"{self.base_url}/guilds/{guild_id}/prune",
             headers=self.auth_headers,
             data=json.dumps({"days": days, "compute_prune_count": compute_prune_count})
@@ -543,28 +577,28 @@ class API():
 
     @rate_limit()
     def get_guild_voice_regions(self, guild_id):
-        return requests.get(
+        return self.session.get(
             f"{self.base_url}/guilds/{guild_id}/regions",
             headers=self.auth_headers
         )
 
     @rate_limit()
     def get_guild_invites(self, guild_id):
-        return requests.get(
+        return self.session.get(
             f"{self.base_url}/guilds/{guild_id}/invites",
             headers=self.auth_headers
         )
 
     @rate_limit()
     def get_guild_integrations(self, guild_id):
-        return requests.get(
+        return self.session.get(
             f"{self.base_url}/guilds/{guild_id}/integrations",
             headers=self.auth_headers
         )
 
     @rate_limit()
     def create_guild_integration(self, guild_id, **kwargs):
-        return requests.post(
+        return self.session.post(
             f"{self.base_url}/guilds/{guild_id}/integrations",
             headers=self.auth_headers,
             data=json.dumps(kwargs)
@@ -572,7 +606,7 @@ class API():
 
     @rate_limit()
     def modify_guild_integrations(self, guild_id, integration_id, **kwargs):
-        return requests.post(
+        return self.session.post(
             f"{self.base_url}/guilds/{guild_id}/integrations/{integration_id}",
             headers=self.auth_headers,
             data=json.dumps(kwargs)
@@ -580,28 +614,28 @@ class API():
 
     @rate_limit()
     def delete_guild_integration(self, guild_id, integration_id):
-        return requests.delete(
+        return self.session.delete(
             f"{self.base_url}/guilds/{guild_id}/integrations/{integration_id}",
             headers=self.auth_headers
         )
 
     @rate_limit()
     def sync_guild_integration(self, guild_id, integration_id):
-        return requests.post(
+        return self.session.post(
             f"{self.base_url}/guilds/{guild_id}/integrations/{integration_id}/sync",
             headers=self.auth_headers
         )
 
     @rate_limit()
     def get_guild_embed(self, guild_id):
-        return requests.get(
+        return self.session.get(
             f"{self.base_url}/guilds/{guild_id}/embed",
             headers=self.auth_headers
         )
 
     @rate_limit()
     def modify_guild_embed(self, guild_id, **kwargs):
-        return requests.patch(
+        return self.session.patch(
             f"{self.base_url}/guilds/{guild_id}/embed",
             headers=self.auth_headers,
             data=json.dumps(kwargs)
@@ -609,14 +643,14 @@ class API():
 
     @rate_limit()
     def list_guild_emojis(self, guild_id):
-        return requests.get(
+        return self.session.get(
             f"{self.base_url}/guilds/{guild_id}/emojis",
             headers=self.auth_headers
         )
 
     @rate_limit()
     def get_guild_emoji(self, guild_id, emoji_id):
-        return requests.get(
+        return self.session.get(
             f"{self.base_url}/guilds/{guild_id}/emojis/{emoji_id}",
             headers=self.auth_headers
         )
@@ -631,7 +665,7 @@ class API():
             "roles": roles
         }
 
-        return requests.post(
+        return self.session.post(
             f"{self.base_url}/guilds/{guild_id}/emojis",
             headers=self.auth_headers,
             data=json.dumps(emoji_data)
@@ -639,7 +673,7 @@ class API():
 
     @rate_limit()
     def modify_guild_emoji(self, guild_id, emoji_id, emoji_data):
-        return requests.patch(
+        return self.session.patch(
             f"{self.base_url}/guilds/{guild_id}/emojis/{emoji_id}",
             headers=self.auth_headers,
             data=emoji_data
@@ -647,7 +681,7 @@ class API():
 
     @rate_limit()
     def delete_guild_emoji(self, guild_id, emoji_id):
-        return requests.delete(
+        return self.session.delete(
             f"{self.base_url}/guilds/{guild_id}/emojis/{emoji_id}",
             headers=self.auth_headers
         )
@@ -655,7 +689,7 @@ class API():
     # Webhooks
     @rate_limit()
     def create_webhook(self, channel_id, name=None, avatar=None):
-        return requests.post(
+        return self.session.post(
             f"{self.base_url}/channels/{channel_id}/webhooks",
             headers=self.auth_headers,
             data=json.dumps({"name": name, "avatar": avatar})
@@ -663,35 +697,35 @@ class API():
 
     @rate_limit()
     def get_channel_webhooks(self, channel_id):
-        return requests.get(
+        return self.session.get(
             f"{self.base_url}/channels/{channel_id}/webhooks",
             headers=self.auth_headers
         )
 
     @rate_limit()
     def get_guild_webhooks(self, guild_id):
-        return requests.get(
+        return self.session.get(
             f"{self.base_url}/guilds/{guild_id}/webhooks",
             headers=self.auth_headers
         )
 
     @rate_limit()
     def get_webhook(self, webhook_id):
-        return requests.get(
+        return self.session.get(
             f"{self.base_url}/webhooks/{webhook_id}",
             headers=self.auth_headers
         )
 
     @rate_limit()
     def get_webhook_with_token(self, webhook_id, webhook_token):
-        return requests.get(
+        return self.session.get(
             f"{self.base_url}/webhooks/{webhook_id}/{webhook_token}",
             headers=self.auth_headers
         )
 
     @rate_limit()
     def modify_webhook(self, webhook_id, name=None, avatar=None, channel_id=None):
-        return requests.patch(
+        return self.session.patch(
             f"{self.base_url}/webhooks/{webhook_id}",
             headers=self.auth_headers,
             data=json.dumps({"name": name, "avatar": avatar, "channel_id": channel_id})
@@ -699,7 +733,7 @@ class API():
 
     @rate_limit()
     def modify_webhook_with_token(self, webhook_id, webhook_token, name=None, avatar=None):
-        return requests.patch(
+        return self.session.patch(
             f"{self.base_url}/webhooks/{webhook_id}/{webhook_token}",
             headers=self.auth_headers,
             data=json.dumps({"name": name, "avatar": avatar})
@@ -707,21 +741,21 @@ class API():
 
     @rate_limit()
     def delete_webhook(self, webhook_id):
-        return requests.delete(
+        return self.session.delete(
             f"{self.base_url}/webhooks/{webhook_id}",
             headers=self.auth_headers
         )
 
     @rate_limit()
     def delete_webhook_with_token(self, webhook_id, webhook_token):
-        return requests.delete(
+        return self.session.delete(
             f"{self.base_url}/webhooks/{webhook_id}/webhook_token",
             headers=self.auth_headers
         )
 
     @rate_limit()
     def get_audit_log(self, guild_id, **kwargs):
-        return requests.get(
+        return self.session.get(
             f"{self.base_url}/guilds/{guild_id}/audit-logs",
             headers=self.auth_headers,
             params=kwargs
@@ -1,24 +1,48 @@
-from bolt.discord.models.base import SearchableList, SearchableDict
+from bolt.discord.models.base import IndexedList, IndexedDict, Snowflake, Timestamp
+from bolt.discord.models.guild import GuildMember, VoiceState
+from bolt.discord.models.message import Message
+from bolt.discord.messages import MessageStore
 from bolt.discord.events import Subscription
 from bolt.utils import snakecase_to_camelcase
 
 
 class Cache():
-    def __init__(self, api):
+    def __init__(self, api, messages_per_channel=100, max_messages=10000):
         self.api = api
 
-        self.guilds = SearchableDict()
-        self.private_channels = SearchableDict()
-        self.channels = SearchableDict()
-        self.users = SearchableDict()
-        self.voice_states = SearchableList()
+        self.guilds = IndexedDict(indexes=["id"])
+        self.private_channels = IndexedDict(indexes=["id"])
+        self.channels = IndexedDict(indexes=["id"])
+        self.users = IndexedDict(indexes=["id"])
+        self.voice_states = IndexedList(indexes=["user_id"])
+        self.messages = MessageStore(per_channel=messages_per_channel, max_messages=max_messages)
         self.user = None
 
+        # on_* handlers get marshalled events, raw_* handlers the event's data dict
         self.subscriptions = []
+        self.raw_subscriptions = []
         for name, item in self.__class__.__dict__.items():
             if type(item).__name__ == "function" and name.startswith("on_"):
-                event_name = snakecase_to_camelcase(name.replace("on_", ""))
+                event_name = snakecase_to_camelcase(name.replace("on_", "", 1))
                 self.subscriptions.append(Subscription(event_name, getattr(self, name)))
+            elif type(item).__name__ == "function" and name.startswith("raw_"):
+                event_name = snakecase_to_camelcase(name.replace("raw_", "", 1))
+                self.raw_subscriptions.append(Subscription(event_name, getattr(self, name)))
+
+    def marshal_message(self, data):
+        """
+            Message model for a payload from the message store
+        """
+        if data is None:
+            return None
+
+        message = Message.marshal(data)
+        message.api = self.api
+        message.cache = self
+        if message.author is not None:
+            message.author.api = self.api
+
+        return message
 
     def on_ready(self, event):
         for guild in event.guilds:
@@ -58,6 +82,7 @@ class Cache():
 
     def on_channel_delete(self, event):
         del self.channels[event.channel.id]
+        self.messages.drop_channel(event.channel.id)
         if event.channel.is_guild:
             guild = self.guilds.find(id=event.channel.guild_id)
             channel = guild.channels.find(id=event.channel.id)
@@ -66,8 +91,11 @@ class Cache():
         elif event.channel.is_dm:
             del self.private_channels[event.channel.id]
 
-    def on_channel_pins_update(self, event):
-        self.channels[event.channel.id].last_pin_timestamp = event.last_pin_timestamp
+    def raw_channel_pins_update(self, data):
+        channel = self.channels.get(Snowflake(data['channel_id']))
+        if channel is not None:
+            timestamp = data.get('last_pin_timestamp')
+            channel.last_pin_timestamp = None if timestamp is None else Timestamp(timestamp)
 
     def on_guild_create(self, event):
         event.guild.api = self.api
@@ -113,12 +141,42 @@ class Cache():
         member = self.guilds[event.guild_id].members.find(id=event.user.id)
         self.guilds[event.guild_id].members.remove(member)
 
-    def on_guild_member_update(self, event):
-        member = self.guilds[event.guild_id].members.find(id=event.user.id)
-        member.merge(event.member)
-
-    def on_guild_members_chunk(self, event):
-        pass
+    def raw_guild_member_update(self, data):
+        guild = self.guilds.get(Snowflake(data['guild_id']))
+        if guild is None:
+            return
+
+        member = guild.members.find(id=Snowflake(data['user']['id']))
+        if member is None:
+            return
+
+        # Update the cached user in place; it is the same object as in self.users
+        member.user.remarshal(data['user'])
+        member.remarshal({key: value for key, value in data.items() if key not in ("user", "guild_id")})
+
+    def raw_guild_members_chunk(self, data):
+        guild = self.guilds.get(Snowflake(data['guild_id']))
+        if guild is None:
+            return
+
+        for member_data in data.get('members', ()):
+            member = guild.members.find(id=Snowflake(member_data['user']['id']))
+            if member is None:
+                member = GuildMember.marshal(member_data)
+                member.api = self.api
+                member.guild_id = guild.id
+                guild.members.append(member)
+            else:
+                member.remarshal({key: value for key, value in member_data.items() if key != "user"})
+
+            # One User per id across guilds, kept up to date in place
+            user = self.users.get(member.id)
+            if user is None:
+                member.user.api = self.api
+                self.users[member.id] = member.user
+            else:
+                user.remarshal(member_data['user'])
+                member.user = user
 
     def on_guild_role_create(self, event):
         event.role.api = self.api
@@ -133,26 +191,39 @@ class Cache():
         role = self.guilds[event.guild_id].roles.find(id=event.role.id)
         self.guilds[event.guild_id].roles.remove(role)
 
-    def on_message_create(self, event):
-        event.message.api = self.api
-        event.message.cache = self
-        event.message.author.api = self.api
+    def raw_message_create(self, data):
+        channel = self.channels.get(Snowflake(data['channel_id']))
+        if channel is not None:
+            channel.last_message_id = Snowflake(data['id'])
 
-        if event.message.channel_id in self.channels:
-            self.channels[event.message.channel_id].last_message_id = event.message.id
+        self.messages.add(data)
 
-    def on_presence_update(self, event):
-        pass
+    def raw_message_update(self, data):
+        self.messages.update(data)
+
+    def raw_message_delete(self, data):
+        self.messages.remove(data['channel_id'], data['id'])
+
+    def raw_message_delete_bulk(self, data):
+        for message_id in data['ids']:
+            self.messages.remove(data['channel_id'], message_id)
 
     def on_user_update(self, event):
         self.user = event.user
 
-    def on_voice_state_update(self, event):
-        if event.connected is True:
-            event.guild.voice_states.upsert(event.voice_state)
-        else:
-            existing = event.guild.voice_states.find(user_id=event.voice_state.user_id)
-            event.guild.voice_states.remove(existing)
+    def raw_voice_state_update(self, data):
+        if data.get('guild_id') is None:
+            return
 
-    def on_webhooks_update(self, event):
-        pass
+        guild = self.guilds.get(Snowflake(data['guild_id']))
+        if guild is None:
+            return
+
+        existing = guild.voice_states.find(user_id=Snowflake(data['user_id']))
+        if data.get('channel_id') is None:
+            if existing is not None:
+                guild.voice_states.remove(existing)
+        elif existing is not None:
+            existing.remarshal(data)
+        else:
+            guild.voice_states.append(VoiceState.marshal(data))
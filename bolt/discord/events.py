@@ -60,27 +60,93 @@ class Events(Enum):
 
 
 class EventHandler():
+    """
+        Routes gateway events to their subscribers with one dict lookup per event
+        Tables are keyed by event class name ("MessageCreate"), the same name a
+        Subscription carries, so nothing is converted while dispatching
+
+        Direct subscribers (the cache) run inline; plugin subscribers are queued
+        for the workers. The plugin table is rebuilt when plugins load or unload
+
+        Raw subscribers are handed the payload's decoded "d" dict instead of an
+        event, so an event only they want is never marshalled
+    """
     def __init__(self, bot):
         self.bot = bot
         self.logger = logging.getLogger(__name__)
 
-    def dispatch(self, event, subscriptions, queue=False):
+        self.subscriptions = []
+        self.raw_subscriptions = []
+        self.direct = {}
+        self.queued = {}
+        self.raw = {}
+
+    @staticmethod
+    def table(subscriptions):
+        table = {}
         for subscription in subscriptions:
-            event_name = snakecase_to_camelcase(event.name)
-            if subscription.event_name == event_name:
+            table.setdefault(subscription.event_name, []).append(subscription.callback)
+
+        return {event_name: tuple(callbacks) for event_name, callbacks in table.items()}
+
+    def subscribe(self, subscriptions):
+        self.subscriptions.extend(subscriptions)
+        self.direct = self.table(self.subscriptions)
+
+    def subscribe_raw(self, subscriptions):
+        self.raw_subscriptions.extend(subscriptions)
+        self.raw = self.table(self.raw_subscriptions)
+
+    def rebuild(self):
+        self.queued = self.table(
+            subscription
+            for plugin in self.bot.plugins
+            if plugin.enabled is True
+            for subscription in plugin.subscriptions
+        )
+
+    def subscribed(self, event_name, handlers=None):
+        """
+            Whether anything needs a marshalled event for event_name
+        """
+        if event_name in self.direct or event_name in self.queued:
+            return True
+
+        return handlers is not None and event_name in handlers
+
+    def dispatch_raw(self, event_name, data, handlers=None):
+        for callback in self.raw.get(event_name, ()):
+            callback(data)
+
+        if handlers is not None:
+            for callback in handlers.get(event_name, ()):
+                callback(data)
+
+    def dispatch(self, event, handlers=None):
+        """
+            Cache subscribers first, then handlers (a table of callbacks that only
+            this caller wants, like a shard's own), then queue plugin subscribers
+        """
+        event_name = type(event).__name__
+
+        for callback in self.direct.get(event_name, ()):
+            callback(event)
+
+        if handlers is not None:
+            for callback in handlers.get(event_name, ()):
+                callback(event)
+
+        for callback in self.queued.get(event_name, ()):
+            if self.logger.isEnabledFor(logging.DEBUG):
                 self.logger.debug(
                     f"Dispatching \"{event_name}\" to "
-                    f"{subscription.callback.__self__.__module__}."
-                    f"{subscription.callback.__self__.__class__.__name__}."
-                    f"{subscription.callback.__name__}"
+                    f"{callback.__self__.__module__}."
+                    f"{callback.__self__.__class__.__name__}."
+                    f"{callback.__name__}"
                 )
 
-                if queue is True:
-                    self.bot.queue.put((subscription.callback, [event], {}))
-                    gevent.sleep(0)
-                    continue
-                else:
-                    subscription.callback(event)
+            self.bot.queue.put((callback, [event], {}))
+            gevent.sleep(0)
 
 
 class GatewayEvent(Model):
@@ -89,6 +155,25 @@ class GatewayEvent(Model):
     name = Field(str, json_key="t")
     cache = None
 
+    @classmethod
+    def from_payload(cls, payload):
+        """
+            Marshal a whole gateway payload in one pass
+            Fields keyed "d" get the event data, op/s/t come from the envelope
+            and every other field is read from inside the event data
+        """
+        data = payload.get('d')
+        if not isinstance(data, dict):
+            return cls.marshal(payload)
+
+        return cls.marshal(dict(data, op=payload.get('op'), s=payload.get('s'), t=payload.get('t'), d=data))
+
+    def bind(self, cache):
+        """
+            Attach the cache (and through it the API) to the event and the models it carries
+        """
+        self.cache = cache
+
 
 class Ready(GatewayEvent):
     version = Field(int, json_key='v')
@@ -222,6 +307,14 @@ class GuildMemberUpdate(GatewayEvent):
 class GuildMembersChunk(GatewayEvent):
     guild_id = Field(Snowflake)
     members = ListField(GuildMember)
+    chunk_index = Field(int, default=0)
+    chunk_count = Field(int, default=1)
+    not_found = ListField(Snowflake)
+    nonce = Field(str)
+
+    @property
+    def last(self):
+        return self.chunk_index + 1 >= self.chunk_count
 
     @property
     def guild(self):
@@ -258,6 +351,12 @@ class GuildRoleDelete(GatewayEvent):
 class MessageCreate(GatewayEvent):
     message = Field(Message, json_key="d")
 
+    def bind(self, cache):
+        super(MessageCreate, self).bind(cache)
+        self.message.api = cache.api
+        self.message.cache = cache
+        self.message.author.api = cache.api
+
     @property
     def channel(self):
         return self.cache.channels.get(self.message.channel_id)
@@ -275,6 +374,19 @@ class MessageCreate(GatewayEvent):
 
 class MessageUpdate(GatewayEvent):
     message = Field(Message, json_key="d")
+    before_data = None
+
+    def bind(self, cache):
+        # Read before the cache applies the edit
+        super(MessageUpdate, self).bind(cache)
+        self.before_data = cache.messages.get(self.message.channel_id, self.message.id)
+
+    @property
+    def before(self):
+        """
+            The message as it was before this edit, if it was still in the message cache
+        """
+        return self.cache.marshal_message(self.before_data)
 
     @property
     def channel(self):
@@ -290,6 +402,18 @@ class MessageDelete(GatewayEvent):
     id = Field(Snowflake)
     channel_id = Field(Snowflake)
     guild_id = Field(Snowflake)
+    message_data = None
+
+    def bind(self, cache):
+        super(MessageDelete, self).bind(cache)
+        self.message_data = cache.messages.get(self.channel_id, self.id)
+
+    @property
+    def message(self):
+        """
+            The deleted message, if it was still in the message cache
+        """
+        return self.cache.marshal_message(self.message_data)
 
     @property
     def channel(self):
@@ -297,7 +421,7 @@ class MessageDelete(GatewayEvent):
 
     @property
     def guild(self):
-        if self.message.is_guild:
+        if self.guild_id is not None:
             return self.cache.guilds.get(self.guild_id)
 
 
@@ -305,6 +429,18 @@ class MessageDeleteBulk(GatewayEvent):
     ids = ListField(Snowflake)
     channel_id = Field(Snowflake)
     guild_id = Field(Snowflake)
+    messages_data = ()
+
+    def bind(self, cache):
+        super(MessageDeleteBulk, self).bind(cache)
+        self.messages_data = [cache.messages.get(self.channel_id, message_id) for message_id in self.ids]
+
+    @property
+    def messages(self):
+        """
+            The deleted messages that were still in the message cache
+        """
+        return [self.cache.marshal_message(data) for data in self.messages_data if data is not None]
 
     @property
     def channel(self):
@@ -427,3 +563,19 @@ class WebhooksUpdate(GatewayEvent):
     @property
     def guild(self):
         return self.cache.guilds.get(self.guild_id)
+
+
+# Gateway event name ("MESSAGE_CREATE") -> event class, filled as names are first seen
+EVENT_CLASSES = {}
+
+
+def get_event_class(event_name):
+    try:
+        return EVENT_CLASSES[event_name]
+    except KeyError:
+        event_class = globals().get(snakecase_to_camelcase(event_name))
+        if not (isinstance(event_class, type) and issubclass(event_class, GatewayEvent)):
+            event_class = None
+
+        EVENT_CLASSES[event_name] = event_class
+        return event_class
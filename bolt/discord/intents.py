@@ -0,0 +1,88 @@
+"""
+    Description:
+        Gateway intents
+        https://discord.com/developers/docs/topics/gateway#gateway-intents
+
+        Discord only sends the events whose intents were given in IDENTIFY.
+        intents_for() works out the smallest set covering a group of event
+        names, so a bot that never reads PresenceUpdate or TypingStart is not
+        sent them
+
+    Contributors:
+        - Patrick Hennessy
+"""
+from enum import IntFlag
+
+
+class Intents(IntFlag):
+    GUILDS = 1 << 0
+    GUILD_MEMBERS = 1 << 1
+    GUILD_BANS = 1 << 2
+    GUILD_EMOJIS = 1 << 3
+    GUILD_INTEGRATIONS = 1 << 4
+    GUILD_WEBHOOKS = 1 << 5
+    GUILD_INVITES = 1 << 6
+    GUILD_VOICE_STATES = 1 << 7
+    GUILD_PRESENCES = 1 << 8
+    GUILD_MESSAGES = 1 << 9
+    GUILD_MESSAGE_REACTIONS = 1 << 10
+    GUILD_MESSAGE_TYPING = 1 << 11
+    DIRECT_MESSAGES = 1 << 12
+    DIRECT_MESSAGE_REACTIONS = 1 << 13
+    DIRECT_MESSAGE_TYPING = 1 << 14
+
+
+# Have to be switched on for the application in the developer portal too
+PRIVILEGED_INTENTS = Intents.GUILD_MEMBERS | Intents.GUILD_PRESENCES
+
+MESSAGES = Intents.GUILD_MESSAGES | Intents.DIRECT_MESSAGES
+REACTIONS = Intents.GUILD_MESSAGE_REACTIONS | Intents.DIRECT_MESSAGE_REACTIONS
+TYPING = Intents.GUILD_MESSAGE_TYPING | Intents.DIRECT_MESSAGE_TYPING
+
+# Event class name -> intents that make Discord send it; events missing here
+# (Ready, Resumed, GuildMembersChunk, UserUpdate, VoiceServerUpdate) need none
+EVENT_INTENTS = {
+    "GuildCreate": Intents.GUILDS,
+    "GuildUpdate": Intents.GUILDS,
+    "GuildDelete": Intents.GUILDS,
+    "GuildRoleCreate": Intents.GUILDS,
+    "GuildRoleUpdate": Intents.GUILDS,
+    "GuildRoleDelete": Intents.GUILDS,
+    "ChannelCreate": Intents.GUILDS,
+    "ChannelUpdate": Intents.GUILDS,
+    "ChannelDelete": Intents.GUILDS,
+    "ChannelPinsUpdate": Intents.GUILDS | Intents.DIRECT_MESSAGES,
+    "GuildMemberAdd": Intents.GUILD_MEMBERS,
+    "GuildMemberUpdate": Intents.GUILD_MEMBERS,
+    "GuildMemberRemove": Intents.GUILD_MEMBERS,
+    "GuildBanAdd": Intents.GUILD_BANS,
+    "GuildBanRemove": Intents.GUILD_BANS,
+    "GuildEmojisUpdate": Intents.GUILD_EMOJIS,
+    "GuildIntegrationsUpdate": Intents.GUILD_INTEGRATIONS,
+    "WebhooksUpdate": Intents.GUILD_WEBHOOKS,
+    "VoiceStateUpdate": Intents.GUILD_VOICE_STATES,
+    "PresenceUpdate": Intents.GUILD_PRESENCES,
+    "MessageCreate": MESSAGES,
+    "MessageUpdate": MESSAGES,
+    "MessageDelete": MESSAGES,
+    "MessageDeleteBulk": Intents.GUILD_MESSAGES,
+    "MessageReactionAdd": REACTIONS,
+    "MessageReactionRemove": REACTIONS,
+    "MessageReactionRemoveAll": REACTIONS,
+    "TypingStart": TYPING
+}
+
+
+def intents_for(event_names, privileged=True):
+    """
+        Intents needed to receive every event in event_names
+        GUILDS is always included; the cache cannot work without guilds
+    """
+    intents = Intents.GUILDS
+    for event_name in event_names:
+        intents |= EVENT_INTENTS.get(event_name, 0)
+
+    if not privileged:
+        intents &= ~PRIVILEGED_INTENTS
+
+    return intents
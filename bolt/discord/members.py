@@ -0,0 +1,152 @@
+"""
+    Description:
+        Fills guild member lists with REQUEST_GUILD_MEMBERS
+        https://discord.com/developers/docs/topics/gateway#request-guild-members
+
+        GUILD_CREATE leaves out offline members of guilds above large_threshold.
+        request(guild_id) asks the guild's shard for every member and returns a
+        gevent AsyncResult that is set to the guild once its last chunk is in
+        the cache. The cache stores chunks as they arrive, so plugins can read
+        members before the whole guild has been received
+
+        Every request carries its own nonce and only chunks echoing it count
+        towards it, so chunks for other requests of the same guild are stored
+        in the cache but never complete the wrong request
+
+        member_chunking decides when requests are made:
+            - off: never; request() raises InvalidConfigurationError
+            - on_demand: only when something calls request()
+            - background: for every large guild as its GUILD_CREATE arrives
+
+        Requests are sent from their own greenlet, one at a time, so the
+        gateway send limit never holds up a shard reading events
+
+    Contributors:
+        - Patrick Hennessy
+"""
+from bolt.discord.models.base import Snowflake
+from bolt.discord.events import Subscription
+from bolt.core.exceptions import InvalidConfigurationError
+
+from gevent.event import AsyncResult
+from gevent.queue import Queue
+import itertools
+import logging
+import gevent
+import time
+
+CHUNKING_MODES = ("off", "on_demand", "background")
+
+
+class MemberRequest():
+    def __init__(self, guild_id):
+        self.guild_id = guild_id
+        self.result = AsyncResult()
+        self.nonce = None
+        self.sent_at = None
+        self.chunks = 0
+        self.members = 0
+
+
+class MemberChunker():
+    # Seconds between checks for the guild's shard to (re)connect
+    retry_interval = 1
+    # A request with no final chunk after this long is sent again on the next request()
+    request_timeout = 60
+
+    def __init__(self, shards, mode="off"):
+        if mode not in CHUNKING_MODES:
+            raise ValueError(f"Unknown member chunking mode \"{mode}\", expected one of {', '.join(CHUNKING_MODES)}")
+
+        self.shards = shards
+        self.mode = mode
+        self.logger = logging.getLogger(__name__)
+
+        self.running = False
+        self.pending = Queue()
+        self.requests = {}
+        self.nonces = {}
+        self.sequence = itertools.count()
+        self.completed = 0
+
+        # Raw subscriptions; run after the cache has stored the chunk
+        self.subscriptions = [
+            Subscription("GuildCreate", self.handle_guild_create),
+            Subscription("GuildMembersChunk", self.handle_chunk)
+        ]
+
+    def request(self, guild_id):
+        if self.mode == "off":
+            raise InvalidConfigurationError("member_chunking is off; set it to on_demand or background")
+
+        guild_id = Snowflake(guild_id)
+        request = self.requests.get(guild_id)
+
+        stale = request is not None and request.sent_at is not None
+        stale = stale and time.monotonic() - request.sent_at > self.request_timeout
+        if request is None or stale:
+            if stale:
+                self.logger.warning(f"Member request for guild {guild_id} timed out, sending again")
+                self.nonces.pop(request.nonce, None)
+                request.nonce = request.sent_at = None
+                request.chunks = request.members = 0
+            else:
+                request = self.requests[guild_id] = MemberRequest(guild_id)
+
+            self.pending.put(request)
+
+        return request.result
+
+    def start(self):
+        self.running = True
+
+        while self.running:
+            request = self.pending.get()
+            shard = self.shards.shard_for(request.guild_id)
+            if shard is None:
+                self.requests.pop(request.guild_id, None)
+                request.result.set_exception(KeyError(f"No shard in this process runs guild {request.guild_id}"))
+                continue
+
+            while self.running and shard.websocket is None:
+                gevent.sleep(self.retry_interval)
+
+            if not self.running:
+                break
+
+            # Discord allows nonces of up to 32 characters
+            request.nonce = f"{request.guild_id}:{next(self.sequence)}"
+            self.nonces[request.nonce] = request
+
+            self.logger.debug(f"Requesting members of guild {request.guild_id}")
+            request.sent_at = time.monotonic()
+            shard.request_guild_members(request.guild_id, nonce=request.nonce)
+
+    def stop(self):
+        self.running = False
+
+    def handle_guild_create(self, data):
+        if self.mode == "background" and data.get('large') is True and not data.get('unavailable'):
+            self.request(data['id'])
+
+    def handle_chunk(self, data):
+        request = self.nonces.get(data.get('nonce'))
+        if request is None:
+            return
+
+        request.chunks += 1
+        request.members += len(data.get('members', ()))
+
+        if request.chunks >= data.get('chunk_count', 1):
+            del self.requests[request.guild_id]
+            del self.nonces[request.nonce]
+            self.completed += 1
+            self.logger.debug(f"Received {request.members} members of guild {request.guild_id}")
+            request.result.set(self.shards.cache.guilds.get(request.guild_id))
+
+    def stats(self):
+        return {
+            "mode": self.mode,
+            "pending": len(self.requests),
+            "completed": self.completed
+        }
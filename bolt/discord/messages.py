@@ -0,0 +1,122 @@
+"""
+    Description:
+        Bounded store of recent messages, so edits and deletes can be shown
+        without a REST call
+        Messages are kept as the raw payload dicts the gateway sent and only
+        marshalled when read. Each channel keeps at most per_channel messages
+        and the whole store at most max_messages; past either cap the least
+        recently used message is evicted
+
+    Contributors:
+        - Patrick Hennessy
+"""
+from collections import OrderedDict
+import sys
+
+
+class MessageStore():
+    def __init__(self, per_channel=100, max_messages=10000):
+        self.per_channel = per_channel
+        self.max_messages = max_messages
+
+        # channel_id -> OrderedDict(message_id -> data), least recently used first
+        self.channels = {}
+        # (channel_id, message_id) in global least recently used order
+        self.order = OrderedDict()
+
+        self.evictions = 0
+
+    @property
+    def enabled(self):
+        return self.per_channel > 0 and self.max_messages > 0
+
+    def __len__(self):
+        return len(self.order)
+
+    def add(self, data):
+        if not self.enabled:
+            return
+
+        channel_id, message_id = str(data['channel_id']), str(data['id'])
+        messages = self.channels.get(channel_id)
+        if messages is None:
+            messages = self.channels[channel_id] = OrderedDict()
+
+        messages[message_id] = data
+        messages.move_to_end(message_id)
+        self.order[(channel_id, message_id)] = None
+        self.order.move_to_end((channel_id, message_id))
+
+        if len(messages) > self.per_channel:
+            self.remove(channel_id, next(iter(messages)))
+            self.evictions += 1
+
+        while len(self.order) > self.max_messages:
+            self.remove(*next(iter(self.order)))
+            self.evictions += 1
+
+    def get(self, channel_id, message_id):
+        """
+            The stored payload dict, or None; counts as a use
+        """
+        channel_id, message_id = str(channel_id), str(message_id)
+        messages = self.channels.get(channel_id)
+        if messages is None or message_id not in messages:
+            return None
+
+        messages.move_to_end(message_id)
+        self.order.move_to_end((channel_id, message_id))
+        return messages[message_id]
+
+    def update(self, data):
+        """
+            Apply a MESSAGE_UPDATE, which may only carry the changed keys
+            Returns the stored payload from before the update
+        """
+        before = self.get(data['channel_id'], data['id'])
+        if before is not None:
+            self.channels[str(data['channel_id'])][str(data['id'])] = dict(before, **data)
+
+        return before
+
+    def remove(self, channel_id, message_id):
+        channel_id, message_id = str(channel_id), str(message_id)
+        messages = self.channels.get(channel_id)
+        if messages is None or message_id not in messages:
+            return None
+
+        data = messages.pop(message_id)
+        del self.order[(channel_id, message_id)]
+        if not messages:
+            del self.channels[channel_id]
+
+        return data
+
+    def drop_channel(self, channel_id):
+        for message_id in self.channels.pop(str(channel_id), ()):
+            del self.order[(str(channel_id), message_id)]
+
+    def memory(self):
+        """
+            Rough bytes held by stored payloads; walks every message, so not for hot paths
+        """
+        return sum(estimate_size(data) for messages in self.channels.values() for data in messages.values())
+
+    def stats(self):
+        return {
+            "messages": len(self),
+            "channels": len(self.channels),
+            "evictions": self.evictions,
+            "memory": self.memory()
+        }
+
+
+def estimate_size(value):
+    size = sys.getsizeof(value)
+
+    if isinstance(value, dict):
+        size += sum(estimate_size(key) + estimate_size(item) for key, item in value.items())
+    elif isinstance(value, list):
+        size += sum(estimate_size(item) for item in value)
+
+    return size
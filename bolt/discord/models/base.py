@@ -6,9 +6,9 @@
         - Patrick Hennessy
 """
 
+import re
 import enum
-from datetime import datetime
-import time
+from datetime import datetime, timedelta, timezone
 import dateparser
 
 
@@ -24,15 +24,203 @@ class ImmutableFieldError(Exception):
     pass
 
 
-class Model(object):
+class Field(object):
+    """
+        Conterpart class for Models, instructing the model how to consume json data
+        Includes a nice repr
+    """
+    def __init__(self, typ, default=None, required=False, json_key=None, max_length=-1, immutable=False, nullable=True,
+                 lazy=False):
+        self.type = typ
+        self.default = default
+        self.required = required
+        self.json_key = json_key
+        self.max_length = max_length
+        self.immutable = immutable
+        self.nullable = nullable
+        self.lazy = lazy
+        self.default_factory = None
+        self.name = None
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, instance, owner):
+        """
+            Lazy fields keep their raw JSON in the instance's __lazy__ dict until
+            first access, then marshal it and cache the result on the instance
+        """
+        if instance is None or not self.lazy:
+            return self
+
+        pending = instance.__dict__.get('__lazy__')
+        if not pending or self.name not in pending:
+            return self
+
+        value = self.marshal(pending.pop(self.name))
+        instance.__dict__[self.name] = value
+        return value
+
+    def __repr__(self):
+        if self.required is True:
+            return f"Field({self.type.__name__}, required=True)"
+        else:
+            return f"Field({self.type.__name__})"
+
+    def marshal(self, data):
+        # Recursively marshal types of other models
+        if issubclass(self.type, Model):
+            return self.type.marshal(data)
+        else:
+            # Check if data is able to be None type
+            if data is None:
+                if self.nullable is True:
+                    return None
+                else:
+                    raise ModelValidationError(f"Field cannot be nullified")
+
+            # Cast it to intended type
+            value = self.type(data)
+
+            # Validate field
+            if not self.max_length == -1 and len(value) > self.max_length:
+                raise ModelValidationError("Length of input is too long")
+
+            return value
+
+
+class ListField(Field):
+    """
+        Subclass of Field that allows one to create a list of some primitive
+        Passing indexes makes it produce an IndexedList keyed on those attributes
+        Without an explicit default, each instance gets its own empty list
+    """
+    def __init__(self, *args, indexes=None, **kwargs):
+        super(ListField, self).__init__(*args, **kwargs)
+        self.indexes = indexes
+
+        if 'default' not in kwargs:
+            self.default_factory = self.empty
+
+    def empty(self):
+        if self.indexes:
+            return IndexedList(indexes=self.indexes)
+        return SearchableList()
+
+    def marshal(self, data):
+        if not self.max_length == -1 and len(data) > self.max_length:
+            raise ModelValidationError("Length of input is too long")
+
+        if not isinstance(data, list):
+            raise ModelValidationError("Input data is not of type list")
+
+        convert = self.type.marshal if issubclass(self.type, Model) else self.type
+
+        if self.indexes:
+            return IndexedList(map(convert, data), indexes=self.indexes)
+
+        ret_list = SearchableList()
+        for item in data:
+            ret_list.append(convert(item))
+
+        return ret_list
+
+
+class ModelMeta(type):
+    """
+        Metaclass for Models that compiles a marshal plan once per class
+        The plan is an ordered tuple of
+            (attr_name, json_key, converter, required, default, immutable, lazy)
+        built from every Field visible through the full MRO
+
+        Models that set __slotted__ = True have their Fields moved off the
+        class body and into __slots__, so instances carry no __dict__.
+        Lazy fields need that __dict__, so slotted models cannot declare them
+    """
+    def __new__(mcs, name, bases, namespace):
+        slotted = namespace.get('__slotted__', any(getattr(base, '__slotted__', False) for base in bases))
+
+        if slotted:
+            inherited_slots = set()
+            for base in bases:
+                for klass in base.__mro__:
+                    slots = klass.__dict__.get('__slots__', ())
+                    inherited_slots.update([slots] if isinstance(slots, str) else slots)
+
+            own_fields = {key: value for key, value in namespace.items() if isinstance(value, Field)}
+            for key, field in own_fields.items():
+                if field.lazy:
+                    raise TypeError(f"Slotted model {name} cannot declare lazy field {key}")
+                del namespace[key]
+
+            extra_slots = namespace.get('__extra_slots__', ())
+            for base in bases:
+                extra_slots = extra_slots or getattr(base, '__extra_slots__', ())
+
+            slots = [key for key in own_fields if key not in inherited_slots]
+            slots += [key for key in extra_slots if key not in inherited_slots and key not in namespace]
+
+            namespace['__slots__'] = tuple(slots)
+            namespace['__slotted__'] = True
+            namespace['__slotted_fields__'] = own_fields
+
+        return super(ModelMeta, mcs).__new__(mcs, name, bases, namespace)
+
+    def __init__(cls, name, bases, namespace):
+        super(ModelMeta, cls).__init__(name, bases, namespace)
+
+        fields = {}
+        for klass in reversed(cls.__mro__):
+            slotted_fields = klass.__dict__.get('__slotted_fields__', {})
+
+            for attr_name, value in vars(klass).items():
+                if attr_name in slotted_fields:
+                    continue
+                elif isinstance(value, Field):
+                    fields[attr_name] = value
+                elif attr_name in fields:
+                    # Subclass shadowed the field with a property or method
+                    del fields[attr_name]
+
+            fields.update(slotted_fields)
+
+        cls.__fields__ = fields
+        cls.__immutable_fields__ = frozenset(
+            field_name for field_name, field in fields.items() if field.immutable
+        )
+        cls.__lazy_fields__ = frozenset(
+            field_name for field_name, field in fields.items() if field.lazy
+        )
+        cls.__default_factories__ = {
+            field_name: field.default_factory for field_name, field in fields.items() if field.default_factory
+        }
+        cls.__marshal_plan__ = tuple(
+            (
+                field_name,
+                field.json_key if field.json_key else field_name,
+                field.marshal,
+                field.required,
+                field.default,
+                field.immutable,
+                field.lazy
+            )
+            for field_name, field in fields.items()
+        )
+
+
+class Model(object, metaclass=ModelMeta):
     """
         Base class for data bound objects
         Allows consumers to instaniate new instances from json (marshaling)
         Able to serialize back to json from it's object format
         __repr_keys__ allows consumers to designate what the repr will print out
+        __slotted__ opts a model into __slots__ storage, __extra_slots__ names
+        the non-field attributes (api, cache) such instances may still be given
     """
+    __slots__ = ()
     __repr_keys__ = []
-    __immutable_fields__ = []
+    __slotted__ = False
+    __extra_slots__ = ('api', 'cache')
 
     @classmethod
     def marshal(cls, data):
@@ -40,34 +228,24 @@ class Model(object):
             Create a new instance of the class from the JSON data passed in
         """
         new_obj = cls()
-        new_obj.__fields__ = {}
-        new_obj.__immutable_fields__ = []
-
-        # Get all fields from super classes
-        fields = {}
-        for base in cls.__bases__:
-            fields.update(base.__dict__.items())
-        fields.update(cls.__dict__.items())
-
-        for field_name, field in fields.items():
-            if not isinstance(field, Field):
-                continue
+        setter = object.__setattr__
 
-            new_obj.__fields__[field_name] = field
+        if cls.__lazy_fields__:
+            pending = {}
+            setter(new_obj, '__lazy__', pending)
 
-            json_key = field.json_key if field.json_key else field_name
+        for field_name, json_key, converter, required, default, _, lazy in cls.__marshal_plan__:
             json_data = data.get(json_key, None)
 
-            if json_data is None and field.required:
-                raise ModelMissingRequiredKeyError(f"{cls.__name__} model is missing required key {json_key}")
-            elif json_data is None:
-                setattr(new_obj, field_name, field.default)
+            if json_data is None:
+                if required:
+                    raise ModelMissingRequiredKeyError(f"{cls.__name__} model is missing required key {json_key}")
+                factory = cls.__default_factories__.get(field_name)
+                setter(new_obj, field_name, factory() if factory else default)
+            elif lazy:
+                pending[field_name] = json_data
             else:
-                attr = field.marshal(json_data)
-                setattr(new_obj, field_name, attr)
-
-            if field.immutable:
-                new_obj.__immutable_fields__.append(field_name)
+                setter(new_obj, field_name, converter(json_data))
 
         return new_obj
 
@@ -76,20 +254,20 @@ class Model(object):
             Apply updates to existing fields given JSON data
             Fails if an update comes to an immutable field
         """
-        for field_name, field in self.__fields__.items():
-            if not isinstance(field, Field):
+        for field_name, json_key, converter, _, _, immutable, lazy in self.__marshal_plan__:
+            if json_key not in data:
                 continue
 
-            json_key = field.json_key if field.json_key else field_name
-
-            if json_key not in data.keys():
+            if lazy and not immutable and data[json_key] is not None:
+                self._defer(field_name, data[json_key])
                 continue
 
-            json_data = data[json_key]
-            attr = field.marshal(json_data)
+            attr = converter(data[json_key])
 
-            if field.immutable and not getattr(self, field_name) == attr:
-                raise ImmutableFieldError(f"Field {field_name} cannot be updated")
+            if immutable:
+                if not getattr(self, field_name) == attr:
+                    raise ImmutableFieldError(f"Field {field_name} cannot be updated")
+                continue
 
             setattr(self, field_name, attr)
 
@@ -99,9 +277,8 @@ class Model(object):
         """
         dct = {}
 
-        for item, field in self.__fields__.items():
+        for item, key, _, _, _, _, _ in self.__marshal_plan__:
             attr = getattr(self, item)
-            key = field.json_key if field.json_key != item and field.json_key is not None else item
 
             if isinstance(attr, Model):
                 dct[key] = attr.serialize()
@@ -132,8 +309,22 @@ class Model(object):
             if preserve and field_name in preserve:
                 continue
 
+            # Hand over still-unmarshalled data instead of forcing it
+            if field_name in self.__lazy_fields__ and field_name not in new_obj.__dict__:
+                pending = new_obj.__dict__.get('__lazy__', {})
+                if field_name in pending:
+                    self._defer(field_name, pending[field_name])
+                    continue
+
             setattr(self, field_name, getattr(new_obj, field_name))
 
+    def _defer(self, field_name, json_data):
+        """
+            Stash raw JSON for a lazy field, dropping any value already marshalled
+        """
+        self.__dict__.pop(field_name, None)
+        self.__dict__.setdefault('__lazy__', {})[field_name] = json_data
+
     def __repr__(self):
         """
             Pretty repr that allows models to specify keys to use
@@ -153,8 +344,17 @@ class Model(object):
     def __setattr__(self, name, value):
         if name in self.__immutable_fields__:
             raise ImmutableFieldError(f"Field \"{name}\" is immutable, cannot be changed")
-        else:
+
+        try:
             return object.__setattr__(self, name, value)
+        except AttributeError:
+            # Slotted instances have no __dict__ for attributes that are not fields or __extra_slots__
+            if self.__slotted__ and not hasattr(type(self), name):
+                raise AttributeError(
+                    f"{type(self).__name__} is slotted and cannot be given attribute \"{name}\"; "
+                    f"add it to __extra_slots__ on a slotted subclass or keep it elsewhere"
+                ) from None
+            raise
 
     def __delattr__(self, name):
         if name in self.__immutable_fields__:
@@ -163,73 +363,6 @@ class Model(object):
             return object.__delattr__(self, name)
 
 
-class Field(object):
-    """
-        Conterpart class for Models, instructing the model how to consume json data
-        Includes a nice repr
-    """
-    def __init__(self, typ, default=None, required=False, json_key=None, max_length=-1, immutable=False, nullable=True):
-        self.type = typ
-        self.default = default
-        self.required = required
-        self.json_key = json_key
-        self.max_length = max_length
-        self.immutable = immutable
-        self.nullable = nullable
-
-    def __repr__(self):
-        if self.required is True:
-            return f"Field({self.type.__name__}, required=True)"
-        else:
-            return f"Field({self.type.__name__})"
-
-    def marshal(self, data):
-        # Recursively marshal types of other models
-        if issubclass(self.type, Model):
-            return self.type.marshal(data)
-        else:
-            # Check if data is able to be None type
-            if data is None:
-                if self.nullable is True:
-                    return None
-                else:
-                    raise ModelValidationError(f"Field cannot be nullified")
-
-            # Cast it to intended type
-            value = self.type(data)
-
-            # Validate field
-            if not self.max_length == -1 and len(value) > self.max_length:
-                raise ModelValidationError("Length of input is too long")
-
-            return value
-
-
-class ListField(Field):
-    """
-        Subclass of Field that allows one to create a list of some primitive
-    """
-    def __init__(self, *args, **kwargs):
-        super(ListField, self).__init__(*args, **kwargs)
-        self.default = kwargs.get('default', SearchableList())
-
-    def marshal(self, data):
-        if not self.max_length == -1 and len(data) > self.max_length:
-            raise ModelValidationError("Length of input is too long")
-
-        if not isinstance(data, list):
-            raise ModelValidationError("Input data is not of type list")
-
-        ret_list = SearchableList()
-        for item in data:
-            if issubclass(self.type, Model):
-                ret_list.append(self.type.marshal(item))
-            else:
-                ret_list.append(self.type(item))
-
-        return ret_list
-
-
 class Enum(enum.Enum):
     """
         A nice repr for enums
@@ -264,22 +397,97 @@ class Snowflake(str):
 
 
 class Timestamp():
+    """
+        Lazily parsed ISO-8601 timestamp
+        Discord's own format is parsed with a strict regex on first access to
+        .datetime, anything else falls back to dateparser
+    """
+    __slots__ = ('iso_date', '_datetime')
+
+    ISO_8601 = re.compile(
+        r"(\d{4})-(\d{2})-(\d{2})[T ](\d{2}):(\d{2}):(\d{2})(?:\.(\d{1,6})\d*)?(Z|[+-]\d{2}:?\d{2})?$"
+    )
+    TIMEZONES = {None: None, "Z": timezone.utc, "+00:00": timezone.utc}
+
     def __init__(self, iso_date):
-        self.datetime = dateparser.parse(iso_date)
+        self.iso_date = iso_date
+        self._datetime = None
 
     def __repr__(self):
         return f"{self.__class__.__name__}({self.timestamp})"
 
+    @property
+    def datetime(self):
+        if self._datetime is None:
+            self._datetime = self.parse(self.iso_date)
+
+        return self._datetime
+
     @property
     def timestamp(self):
         return int(self.datetime.timestamp())
 
+    @classmethod
+    def parse(cls, iso_date):
+        match = cls.ISO_8601.match(iso_date)
+        if match is None:
+            return dateparser.parse(iso_date)
+
+        year, month, day, hour, minute, second, fraction, offset = match.groups()
+        microsecond = int(fraction.ljust(6, "0")) if fraction else 0
+
+        return datetime(
+            int(year), int(month), int(day),
+            int(hour), int(minute), int(second), microsecond,
+            tzinfo=cls.get_timezone(offset)
+        )
+
+    @classmethod
+    def get_timezone(cls, offset):
+        tzinfo = cls.TIMEZONES.get(offset)
+
+        if tzinfo is None and offset is not None:
+            sign = -1 if offset[0] == "-" else 1
+            hours, minutes = int(offset[1:3]), int(offset[-2:])
+            tzinfo = timezone(sign * timedelta(hours=hours, minutes=minutes))
+            cls.TIMEZONES[offset] = tzinfo
+
+        return tzinfo
+
     @classmethod
     def from_unix(cls, ts):
-        dt = datetime.fromtimestamp(ts)
-        iso_date = str(dt.isoformat()) + ":.0" + time.strftime('%z')
+        dt = datetime.fromtimestamp(ts).astimezone()
 
-        return cls(iso_date)
+        timestamp = cls(dt.isoformat())
+        timestamp._datetime = dt
+        return timestamp
+
+
+def query_matches(item, query):
+    """
+        Mongo-esque comparison used by the Searchable collections
+        Query values are cast to the type of the item's attribute before comparing
+    """
+    for key, value in query.items():
+        attr = getattr(item, key, None)
+        attr_type = type(attr)
+
+        if issubclass(attr_type, (int, bool, str, float)):
+            if (attr == attr_type(value)) is False:
+                return False
+
+    return True
+
+
+def index_key(value):
+    """
+        Normalise a value for use as an index key, so that Snowflakes, ints
+        and digit strings referring to the same id hash identically
+    """
+    if isinstance(value, (str, int)) and not isinstance(value, bool):
+        return str(value)
+
+    return value
 
 
 class SearchableList(list):
@@ -291,14 +499,7 @@ class SearchableList(list):
     """
     def find(self, *args, **kwargs):
         for item in self.__iter__():
-            for key, value in kwargs.items():
-                attr = getattr(item, key, None)
-                attr_type = type(attr)
-
-                if issubclass(attr_type, (int, bool, str, float)):
-                    if (attr == attr_type(value)) is False:
-                        break
-            else:
+            if query_matches(item, kwargs):
                 return item
 
         return None
@@ -324,14 +525,7 @@ class SearchableDict(dict):
     """
     def find(self, *args, **kwargs):
         for _, item in self.items():
-            for key, value in kwargs.items():
-                attr = getattr(item, key, None)
-                attr_type = type(attr)
-
-                if issubclass(attr_type, (int, bool, str, float)):
-                    if (attr == attr_type(value)) is False:
-                        break
-            else:
+            if query_matches(item, kwargs):
                 return item
 
         return None
@@ -340,3 +534,212 @@ class SearchableDict(dict):
         for _, item in self.items():
             if expression(item) is True:
                 yield item
+
+
+class Index(object):
+    """
+        Hash index from attribute value to the items holding it, kept in insertion order
+        Indexed attributes are assumed not to change while an item is stored
+    """
+    def __init__(self, keys):
+        self.maps = {key: {} for key in keys}
+
+    def add(self, item):
+        for key, mapping in self.maps.items():
+            value = index_key(getattr(item, key, None))
+            try:
+                mapping.setdefault(value, []).append(item)
+            except TypeError:
+                continue
+
+    def discard(self, item):
+        for key, mapping in self.maps.items():
+            value = index_key(getattr(item, key, None))
+            try:
+                bucket = mapping.get(value)
+            except TypeError:
+                continue
+
+            if not bucket:
+                continue
+
+            for position, candidate in enumerate(bucket):
+                if candidate is item:
+                    del bucket[position]
+                    break
+
+            if not bucket:
+                del mapping[value]
+
+    def clear(self):
+        for mapping in self.maps.values():
+            mapping.clear()
+
+    def candidates(self, query):
+        """
+            Items that could satisfy the query, or None if no queried key is indexed
+        """
+        for key, value in query.items():
+            mapping = self.maps.get(key)
+            if mapping is not None:
+                try:
+                    return mapping.get(index_key(value), ())
+                except TypeError:
+                    return None
+
+        return None
+
+
+class IndexedList(SearchableList):
+    """
+        SearchableList that keeps hash indexes on the given attributes
+        find() on an indexed key is a dict lookup, other keys fall back to a scan
+        Example:
+            members = IndexedList(indexes=["id"])
+            members.find(id=1234)
+    """
+    def __init__(self, iterable=(), indexes=("id",)):
+        super(IndexedList, self).__init__()
+        self.index_keys = tuple(indexes)
+        self.indexes = Index(self.index_keys)
+        self.extend(iterable)
+
+    def find(self, *args, **kwargs):
+        candidates = self.indexes.candidates(kwargs)
+        if candidates is None:
+            return super(IndexedList, self).find(*args, **kwargs)
+
+        for item in candidates:
+            if query_matches(item, kwargs):
+                return item
+
+        return None
+
+    def upsert(self, new_item):
+        # Items that compare equal are expected to share their first indexed key
+        candidates = self.indexes.candidates({self.index_keys[0]: getattr(new_item, self.index_keys[0], None)})
+
+        for item in candidates or ():
+            if item == new_item:
+                self[list.index(self, item)] = new_item
+                break
+        else:
+            self.append(new_item)
+
+    def reindex(self):
+        self.indexes.clear()
+        for item in self:
+            self.indexes.add(item)
+
+    def append(self, item):
+        super(IndexedList, self).append(item)
+        self.indexes.add(item)
+
+    def extend(self, iterable):
+        items = list(iterable)
+        super(IndexedList, self).extend(items)
+        for item in items:
+            self.indexes.add(item)
+
+    def __iadd__(self, iterable):
+        self.extend(iterable)
+        return self
+
+    def insert(self, position, item):
+        super(IndexedList, self).insert(position, item)
+        self.indexes.add(item)
+
+    def remove(self, item):
+        del self[list.index(self, item)]
+
+    def pop(self, position=-1):
+        item = super(IndexedList, self).pop(position)
+        self.indexes.discard(item)
+        return item
+
+    def clear(self):
+        super(IndexedList, self).clear()
+        self.indexes.clear()
+
+    def __setitem__(self, position, value):
+        if isinstance(position, slice):
+            value = list(value)
+            old_items = self[position]
+        else:
+            old_items = [self[position]]
+
+        super(IndexedList, self).__setitem__(position, value)
+
+        for item in old_items:
+            self.indexes.discard(item)
+        for item in (value if isinstance(position, slice) else [value]):
+            self.indexes.add(item)
+
+    def __delitem__(self, position):
+        old_items = self[position] if isinstance(position, slice) else [self[position]]
+        super(IndexedList, self).__delitem__(position)
+
+        for item in old_items:
+            self.indexes.discard(item)
+
+
+class IndexedDict(SearchableDict):
+    """
+        SearchableDict that keeps hash indexes on attributes of its values
+        Example:
+            guilds = IndexedDict(indexes=["id"])
+            guilds.find(id=1234)
+    """
+    def __init__(self, *args, indexes=("id",), **kwargs):
+        super(IndexedDict, self).__init__()
+        self.indexes = Index(indexes)
+        self.update(*args, **kwargs)
+
+    def find(self, *args, **kwargs):
+        candidates = self.indexes.candidates(kwargs)
+        if candidates is None:
+            return super(IndexedDict, self).find(*args, **kwargs)
+
+        for item in candidates:
+            if query_matches(item, kwargs):
+                return item
+
+        return None
+
+    def __setitem__(self, key, value):
+        if key in self:
+            self.indexes.discard(self[key])
+
+        super(IndexedDict, self).__setitem__(key, value)
+        self.indexes.add(value)
+
+    def __delitem__(self, key):
+        value = self[key]
+        super(IndexedDict, self).__delitem__(key)
+        self.indexes.discard(value)
+
+    def pop(self, key, *default):
+        if key not in self:
+            return super(IndexedDict, self).pop(key, *default)
+
+        value = super(IndexedDict, self).pop(key)
+        self.indexes.discard(value)
+        return value
+
+    def popitem(self):
+        key, value = super(IndexedDict, self).popitem()
+        self.indexes.discard(value)
+        return key, value
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def update(self, *args, **kwargs):
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def clear(self):
+        super(IndexedDict, self).clear()
+        self.indexes.clear()
@@ -35,6 +35,7 @@ class PermissionOverwrite(Model):
 
 class Channel(Model):
     __repr_keys__ = ['id', 'name', 'type']
+    __slotted__ = True
 
     id = Field(Snowflake, required=True)
     type = Field(ChannelType, required=True)
@@ -72,7 +73,11 @@ class Channel(Model):
         all_files = {os.path.basename(file): open(file, 'rb') for file in files}
         return self.bot.create_message(files=all_files, headers=self.auth_headers)
 
-    def say(self, message="", embed=None, mentions=None):
+    def say(self, message="", embed=None, mentions=None, wait=True):
+        """
+            Send a message to this channel and return the Message, raising if the send fails
+            With wait=False, return its OutboundMessage as soon as it is queued instead
+        """
         from bolt.discord.models.message import Message
 
         embed = {} if embed is None else embed
@@ -82,14 +87,23 @@ class Channel(Model):
             message = f"{user.mention} {message}"
 
         message_data = {"content": message, "embed": embed}
+        cache = getattr(self, "cache", None)
 
-        message = Message.marshal(self.api.create_message(self.id, message_data))
-        message.api = self.api
+        def marshal(data):
+            message = Message.marshal(data)
+            message.api = self.api
 
-        if getattr(self, "cache", None) is not None:
-            message.cache = self.cache
+            if cache is not None:
+                message.cache = cache
 
-        return message
+            return message
+
+        outbound = self.api.outbound.send(self.id, message_data, marshal)
+
+        if wait is False:
+            return outbound
+
+        return outbound.get()
 
     def trigger_typing(self):
         return self.api.trigger_typing(self.id)
@@ -37,6 +37,7 @@ class PremiumTier(Enum):
 
 class GuildMember(Model):
     __repr_keys__ = ['id', 'name']
+    __slotted__ = True
 
     user = Field(User)
     guild_id = Field(Snowflake)
@@ -115,6 +116,7 @@ class GuildMember(Model):
 
 class Role(Model):
     __repr_keys__ = ['id', 'name']
+    __slotted__ = True
 
     id = Field(Snowflake, required=True)
     name = Field(str, required=True)
@@ -135,6 +137,8 @@ class Role(Model):
 
 
 class VoiceState(Model):
+    __slotted__ = True
+
     guild_id = Field(Snowflake)
     channel_id = Field(Snowflake)
     user_id = Field(Snowflake)
@@ -231,8 +235,8 @@ class Guild(Model):
     verification_level = Field(VerificationLevel)
     default_message_notifications = Field(MessageNotificationLevel)
     explicit_content_filter = Field(ExplicitContentFilterLevel)
-    roles = ListField(Role)
-    emojis = ListField(Emoji)
+    roles = ListField(Role, indexes=["id"])
+    emojis = ListField(Emoji, lazy=True)
     features = ListField(str)
     mfa_level = Field(MFALevel)
     application_id = Field(Snowflake)
@@ -243,10 +247,10 @@ class Guild(Model):
     large = Field(bool)
     unavailable = Field(bool)
     member_count = Field(int)
-    voice_states = ListField(VoiceState)
-    members = ListField(GuildMember)
-    channels = ListField(Channel)
-    presences = ListField(Presence)
+    voice_states = ListField(VoiceState, indexes=["user_id"])
+    members = ListField(GuildMember, lazy=True, indexes=["id"])
+    channels = ListField(Channel, indexes=["id"])
+    presences = ListField(Presence, lazy=True)
     max_presences = Field(int)
     max_members = Field(int)
     vanity_url_code = Field(str)
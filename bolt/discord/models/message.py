@@ -91,21 +91,21 @@ class Message(Model):
     edited_timestamp = Field(Timestamp)
     tts = Field(bool, default=False)
     mention_everyone = Field(bool, default=False)
-    mentions = ListField(User)
-    mention_roles = ListField(Role)
-    mention_channels = ListField(ChannelMention)
-    attachments = ListField(Attachment)
-    embeds = ListField(Embed)
-    reactions = ListField(Reaction)
+    mentions = ListField(User, lazy=True)
+    mention_roles = ListField(Role, lazy=True)
+    mention_channels = ListField(ChannelMention, lazy=True)
+    attachments = ListField(Attachment, lazy=True)
+    embeds = ListField(Embed, lazy=True)
+    reactions = ListField(Reaction, lazy=True)
     nonce = Field(Snowflake)
     pinned = Field(bool)
     webhook_id = Field(Snowflake)
     type = Field(MessageType)
-    activity = Field(MessageActivity)
-    application = Field(MessageApplication)
-    message_reference = Field(MessageReference)
+    activity = Field(MessageActivity, lazy=True)
+    application = Field(MessageApplication, lazy=True)
+    message_reference = Field(MessageReference, lazy=True)
     flags = Field(int)
-    strickers = ListField(Sticker)
+    strickers = ListField(Sticker, lazy=True)
 
     def add_reaction(self):
         pass
@@ -123,8 +123,8 @@ class Message(Model):
         message_data = {"content": message, "embed": embed}
         self.api.edit_message(self.channel_id, self.id, message_data)
 
-    def reply(self, message):
-        self.channel.say(message, mentions=[self.author])
+    def reply(self, message, wait=True):
+        return self.channel.say(message, mentions=[self.author], wait=wait)
 
     @property
     def member(self):
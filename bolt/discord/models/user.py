@@ -8,6 +8,7 @@ class PremiumType(Enum):
 
 class User(Model):
     __repr_keys__ = ['id', 'name']
+    __slotted__ = True
 
     id = Field(Snowflake, required=True, immutable=True)
     name = Field(str, json_key="username")
@@ -0,0 +1,131 @@
+"""
+    Description:
+        Outbound message pipeline
+        Channel.say hands messages to a pool of sender greenlets. By default
+        it waits for the send and returns the Message as before; with
+        wait=False the caller carries on while the message goes out at
+        whatever pace the rate limiter allows
+
+        Each channel always maps to the same sender lane, so messages to one
+        channel go out in the order they were queued. Lanes are bounded; once
+        a lane is full further sends block until it drains
+
+    Contributors:
+        - Patrick Hennessy
+"""
+from gevent.queue import JoinableQueue
+from gevent.event import AsyncResult
+import logging
+import gevent
+
+
+class OutboundMessage():
+    """
+        Promise for a queued message
+        get() waits for the send and returns the marshalled Message, or raises
+        the error the send failed with. Any other attribute is read from that
+        Message. Failures nobody is waiting on are logged by the sender
+    """
+    def __init__(self, channel_id, message_data, marshal):
+        self.channel_id = channel_id
+        self.message_data = message_data
+        self.marshal = marshal
+        self.result = AsyncResult()
+        self.message = None
+        self.awaited = False
+
+    def ready(self):
+        return self.result.ready()
+
+    def successful(self):
+        return self.result.successful()
+
+    @property
+    def exception(self):
+        return self.result.exception
+
+    def get(self, block=True, timeout=None):
+        self.awaited = True
+
+        if self.message is None:
+            self.message = self.marshal(self.result.get(block=block, timeout=timeout))
+
+        return self.message
+
+    def __getattr__(self, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+
+        return getattr(self.get(), name)
+
+    def __repr__(self):
+        state = "sent" if self.ready() else "queued"
+        return f"<OutboundMessage channel_id={self.channel_id} {state}>"
+
+
+class Outbound():
+    def __init__(self, api, senders=8, max_size=1000):
+        self.api = api
+        self.logger = logging.getLogger(__name__)
+
+        self.lanes = [JoinableQueue(maxsize=max(1, max_size // senders)) for _ in range(senders)]
+        self.greenlets = []
+
+        self.sent = 0
+        self.failed = 0
+
+    @property
+    def pending(self):
+        return sum(lane.qsize() for lane in self.lanes)
+
+    def start(self):
+        if not self.greenlets:
+            self.greenlets = [gevent.spawn(self.sender, lane) for lane in self.lanes]
+
+    def stop(self):
+        gevent.killall(self.greenlets)
+        self.greenlets = []
+
+    def join(self):
+        """
+            Block until everything queued so far has been sent
+        """
+        for lane in self.lanes:
+            lane.join()
+
+    def lane(self, channel_id):
+        return self.lanes[int(channel_id) % len(self.lanes)]
+
+    def send(self, channel_id, message_data, marshal, block=True, timeout=None):
+        """
+            Queue a message for channel_id and return its OutboundMessage
+            Blocks while the channel's lane is full, raising gevent.queue.Full
+            if block is False or the timeout passes first
+        """
+        self.start()
+
+        outbound = OutboundMessage(channel_id, message_data, marshal)
+        lane = self.lane(channel_id)
+
+        if lane.full():
+            self.logger.warning(f"Outbound lane for channel {channel_id} is full, waiting for it to drain")
+
+        lane.put(outbound, block=block, timeout=timeout)
+        return outbound
+
+    def sender(self, lane):
+        while True:
+            outbound = lane.get()
+
+            try:
+                data = self.api.create_message(outbound.channel_id, outbound.message_data)
+            except Exception as e:
+                self.failed += 1
+                if not outbound.awaited:
+                    self.logger.exception(f"Failed to send message to channel {outbound.channel_id}")
+                outbound.result.set_exception(e)
+            else:
+                self.sent += 1
+                outbound.result.set(data)
+            finally:
+                lane.task_done()
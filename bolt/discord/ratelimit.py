@@ -0,0 +1,175 @@
+"""
+    Description:
+        Tracks Discord's REST rate limits per bucket
+        https://discord.com/developers/docs/topics/rate-limits
+
+        A bucket is keyed by the route's bucket hash (X-RateLimit-Bucket, or the
+        route itself until Discord has told us the hash) plus the major parameter
+        of the request (channel_id, guild_id or webhook_id). Requests to the same
+        bucket queue up behind each other in order, requests to other buckets
+        carry on untouched, and a global 429 pauses everything
+
+    Contributors:
+        - Patrick Hennessy
+"""
+from bolt.core.exceptions import RateLimitExceeded
+
+from gevent.lock import Semaphore
+from gevent.event import Event
+import logging
+import gevent
+import time
+
+MAJOR_PARAMETERS = ("channel_id", "guild_id", "webhook_id")
+
+
+class Bucket():
+    def __init__(self, key):
+        self.key = key
+        self.lock = Semaphore()
+        self.limit = None
+        self.remaining = None
+        self.reset_at = 0
+        self.reset_after = 0
+
+    @property
+    def discovered(self):
+        return self.limit is not None
+
+    def delay(self):
+        """
+            Seconds until this bucket can take another request
+        """
+        now = time.monotonic()
+
+        if self.reset_at <= now:
+            # Assume a fresh window of the last known length until a response says otherwise
+            self.remaining = self.limit
+            self.reset_at = now + self.reset_after
+            return 0
+
+        if self.remaining is None or self.remaining > 0:
+            return 0
+
+        return self.reset_at - now
+
+    def update(self, headers):
+        if 'X-RateLimit-Limit' in headers:
+            self.limit = int(headers['X-RateLimit-Limit'])
+        if 'X-RateLimit-Remaining' in headers:
+            # Requests still in flight have already been taken off our own count
+            remaining = int(headers['X-RateLimit-Remaining'])
+            self.remaining = remaining if self.remaining is None else min(self.remaining, remaining)
+        if 'X-RateLimit-Reset-After' in headers:
+            self.reset_after = float(headers['X-RateLimit-Reset-After'])
+            self.reset_at = time.monotonic() + self.reset_after
+
+    def __repr__(self):
+        return f"<Bucket {self.key} {self.remaining}/{self.limit}>"
+
+
+class RateLimiter():
+    def __init__(self, max_retries=3):
+        self.max_retries = max_retries
+        self.logger = logging.getLogger(__name__)
+
+        self.routes = {}
+        self.buckets = {}
+
+        # Set while requests are allowed; cleared for the length of a global rate limit
+        self.global_unlocked = Event()
+        self.global_unlocked.set()
+
+    def get_bucket(self, route, major):
+        key = (self.routes.get(route, route), major)
+
+        bucket = self.buckets.get(key)
+        if bucket is None:
+            bucket = self.buckets[key] = Bucket(key)
+
+        return bucket
+
+    def learn_bucket(self, route, major, bucket, headers):
+        """
+            Map a route onto the bucket hash Discord reported for it, so routes
+            sharing a limit also share a Bucket from now on
+        """
+        bucket_hash = headers.get('X-RateLimit-Bucket')
+        if bucket_hash is None or self.routes.get(route) == bucket_hash:
+            return bucket
+
+        self.routes[route] = bucket_hash
+        shared = self.buckets.setdefault((bucket_hash, major), bucket)
+        if shared is not bucket:
+            shared.update(headers)
+
+        return shared
+
+    def request(self, route, major, send):
+        """
+            Call send() once the bucket for route/major has room, retrying on 429s
+            send must return a requests.Response
+        """
+        bucket = self.get_bucket(route, major)
+
+        for attempt in range(self.max_retries + 1):
+            lock = bucket.lock
+            lock.acquire()
+            try:
+                self.reserve(route, bucket)
+            except BaseException:
+                lock.release()
+                raise
+
+            # Until Discord has told us the limit, only let one request probe the bucket
+            holding = not bucket.discovered
+            if not holding:
+                lock.release()
+
+            try:
+                response = send()
+                bucket.update(response.headers)
+                bucket = self.learn_bucket(route, major, bucket, response.headers)
+            finally:
+                if holding:
+                    lock.release()
+
+            if response.status_code != 429:
+                return response
+
+            self.handle_too_many_requests(route, bucket, response, attempt)
+
+        raise RateLimitExceeded(f"Exceeded max retries for \"{route}\" on bucket {bucket.key}")
+
+    def reserve(self, route, bucket):
+        while True:
+            self.global_unlocked.wait()
+
+            delay = bucket.delay()
+            if delay <= 0:
+                break
+
+            self.logger.debug(f"Bucket {bucket.key} exhausted on \"{route}\", queueing for {delay:.2f} seconds")
+            gevent.sleep(delay)
+
+        if bucket.remaining is not None:
+            bucket.remaining -= 1
+
+    def handle_too_many_requests(self, route, bucket, response, attempt):
+        try:
+            body = response.json()
+        except ValueError:
+            body = {}
+
+        retry_after = float(body.get('retry_after', response.headers.get('Retry-After', 1)))
+        is_global = body.get('global', False) or 'X-RateLimit-Global' in response.headers
+        retries_left = self.max_retries - attempt
+
+        if is_global:
+            self.logger.warning(f"Globally rate limited on \"{route}\", pausing all requests for {retry_after} seconds. Retries left: {retries_left}")  # noqa: E501
+            self.global_unlocked.clear()
+            gevent.spawn_later(retry_after, self.global_unlocked.set)
+        else:
+            self.logger.warning(f"Rate limited on \"{route}\", bucket {bucket.key} resets in {retry_after} seconds. Retries left: {retries_left}")  # noqa: E501
+            bucket.remaining = 0
+            bucket.reset_at = max(bucket.reset_at, time.monotonic() + retry_after)
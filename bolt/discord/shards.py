@@ -0,0 +1,180 @@
+"""
+    Description:
+        Runs several gateway shards inside one process
+        https://discord.com/developers/docs/topics/gateway#sharding
+
+        Every shard is a Websocket greenlet. They share one Cache and one
+        EventHandler, so plugins see a single bot no matter which shard an
+        event arrived on, and all of them feed the bot's worker queue
+
+    Contributors:
+        - Patrick Hennessy
+"""
+from bolt.discord.websocket import Websocket
+from bolt.discord.events import EventHandler
+from bolt.discord.members import MemberChunker
+from bolt.discord.cache import Cache
+
+from gevent.lock import Semaphore
+from collections import Counter
+import logging
+import gevent
+import time
+
+
+class IdentifyLimiter():
+    """
+        Discord lets max_concurrency shards IDENTIFY per identify_interval seconds
+        Shard n belongs to rate limit key n % max_concurrency; each key has its own slot
+    """
+    def __init__(self, max_concurrency=1, identify_interval=5):
+        self.max_concurrency = max(1, max_concurrency)
+        self.identify_interval = identify_interval
+        self.locks = [Semaphore() for _ in range(self.max_concurrency)]
+        self.last_identify = [0] * self.max_concurrency
+
+    def wait(self, shard_id, timeout=None):
+        """
+            Block until shard_id may IDENTIFY. With a timeout, give up without
+            taking the slot once it cannot be had in time, and return False
+        """
+        key = shard_id % self.max_concurrency
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        if not self.locks[key].acquire(timeout=timeout):
+            return False
+
+        try:
+            delay = self.last_identify[key] + self.identify_interval - time.monotonic()
+            if deadline is not None and time.monotonic() + delay > deadline:
+                return False
+            if delay > 0:
+                gevent.sleep(delay)
+
+            self.last_identify[key] = time.monotonic()
+            return True
+        finally:
+            self.locks[key].release()
+
+
+class ShardManager():
+    def __init__(self, bot, token):
+        self.bot = bot
+        self.token = token
+        self.logger = logging.getLogger(__name__)
+
+        self.cache = Cache(
+            self.bot.api,
+            messages_per_channel=self.bot.config.message_cache_per_channel,
+            max_messages=self.bot.config.message_cache_max
+        )
+        self.event_handler = EventHandler(self.bot)
+        self.event_handler.subscribe(self.cache.subscriptions)
+        self.event_handler.subscribe_raw(self.cache.raw_subscriptions)
+
+        self.chunker = MemberChunker(self, self.bot.config.member_chunking)
+        self.event_handler.subscribe_raw(self.chunker.subscriptions)
+
+        self.shard_total = self.bot.config.shard_total
+        self.identify_limiter = None
+        self.shards = {}
+        self.greenlets = []
+
+    def create_shards(self):
+        """
+            With shard_auto, ask Discord how many shards to run and how many may
+            IDENTIFY at once; otherwise use shard_total from the config
+            shard_ids limits this process to some of the shards
+        """
+        gateway_url = None
+        max_concurrency = 1
+
+        if self.bot.config.shard_auto is True:
+            gateway = self.bot.api.get_gateway_bot()
+            gateway_url = gateway['url']
+            self.shard_total = gateway['shards']
+            max_concurrency = gateway.get('session_start_limit', {}).get('max_concurrency', 1)
+            shard_ids = self.bot.config.shard_ids or range(self.shard_total)
+        else:
+            self.shard_total = self.bot.config.shard_total
+            shard_ids = self.bot.config.shard_ids or [self.bot.config.shard_id]
+
+        # A cluster worker is handed a limiter shared with the other processes
+        if self.identify_limiter is None:
+            self.identify_limiter = IdentifyLimiter(max_concurrency)
+
+        for shard_id in shard_ids:
+            shard = Websocket(
+                self.bot,
+                self.token,
+                shard_id=shard_id,
+                shard_total=self.shard_total,
+                cache=self.cache,
+                event_handler=self.event_handler,
+                identify_limiter=self.identify_limiter
+            )
+            shard.gateway_url = gateway_url
+            self.shards[shard_id] = shard
+
+        self.logger.info(f"Running shards {list(self.shards)} of {self.shard_total}")
+
+    def start(self):
+        if not self.shards:
+            self.create_shards()
+
+        chunker = gevent.spawn(self.chunker.start)
+        self.greenlets = [gevent.spawn(shard.start) for shard in self.shards.values()]
+        gevent.joinall(self.greenlets)
+        chunker.kill()
+
+    def stop(self):
+        self.chunker.stop()
+        for shard in self.shards.values():
+            shard.stop()
+
+    def request_members(self, guild_id):
+        """
+            Fetch every member of a guild into the cache; returns an AsyncResult set to the guild
+        """
+        return self.chunker.request(guild_id)
+
+    def shard_for(self, guild_id):
+        return self.shards.get((int(guild_id) >> 22) % self.shard_total)
+
+    @property
+    def primary(self):
+        if not self.shards:
+            return None
+
+        return self.shards[min(self.shards)]
+
+    @property
+    def latency(self):
+        pings = [shard.ping for shard in self.shards.values() if shard.ping >= 0]
+        if not pings:
+            return -1
+
+        return sum(pings) / len(pings)
+
+    def status(self):
+        return [
+            {
+                "shard_id": shard_id,
+                "state": shard.state.value,
+                "latency": shard.ping,
+                "sequence": shard.sequence,
+                "session_id": shard.session_id
+            }
+            for shard_id, shard in sorted(self.shards.items())
+        ]
+
+    def event_counts(self):
+        counts = Counter()
+        for shard in self.shards.values():
+            counts.update(shard.event_counts)
+
+        return dict(counts)
+
+    def set_status(self, status):
+        for shard in self.shards.values():
+            shard.status = status
@@ -7,28 +7,94 @@
 """
 from bolt.discord.events import Subscription
 from bolt.discord.events import EventHandler
+from bolt.discord.events import MessageCreate
+from bolt.discord.intents import Intents, EVENT_INTENTS, intents_for
 from bolt.discord import events
 
 from bolt.discord.cache import Cache
-from bolt.utils import snakecase_to_camelcase
+from bolt.discord import etf
 from bolt.core.exceptions import InvalidBotToken
+from bolt.core.queue import Lane
 
+from collections import Counter, deque
 from datetime import timedelta
 from platform import system
-from enum import IntEnum
+from enum import Enum, IntEnum
 import ujson as json
 import websocket
 import logging
 import gevent
+import random
 import time
+import zlib
+
+# Every complete zlib-stream message ends with a Z_SYNC_FLUSH marker
+ZLIB_SUFFIX = b'\x00\x00\xff\xff'
+
+# Close codes that reconnecting cannot fix
+FATAL_CLOSE_CODES = {
+    4004: "authentication failed",
+    4010: "invalid shard",
+    4011: "sharding required",
+    4012: "invalid API version",
+    4013: "invalid intents",
+    4014: "disallowed intents"
+}
+
+
+class ShardState(Enum):
+    DISCONNECTED = "disconnected"
+    CONNECTING = "connecting"
+    IDENTIFYING = "identifying"
+    RESUMING = "resuming"
+    CONNECTED = "connected"
+    STOPPED = "stopped"
+
+
+class GatewaySendLimiter():
+    """
+        Discord closes a connection that sends more than limit payloads in interval seconds
+        The last reserved slots are kept for heartbeats, IDENTIFY and RESUME
+    """
+    def __init__(self, limit=120, interval=60, reserved=5):
+        self.limit = limit
+        self.interval = interval
+        self.reserved = reserved
+        self.sent = deque()
+
+    def reset(self):
+        self.sent.clear()
+
+    def wait(self, priority=False):
+        limit = self.limit if priority else self.limit - self.reserved
+
+        while True:
+            now = time.monotonic()
+            while self.sent and self.sent[0] <= now - self.interval:
+                self.sent.popleft()
+
+            if len(self.sent) < limit:
+                break
+
+            # Sleep until enough of the window has expired
+            gevent.sleep(self.sent[len(self.sent) - limit] + self.interval - now)
+
+        self.sent.append(time.monotonic())
 
 
 class Websocket():
-    def __init__(self, bot, token):
+    def __init__(self, bot, token, shard_id=None, shard_total=None, cache=None, event_handler=None,
+                 identify_limiter=None):
         self.bot = bot
         self.token = token
         self.logger = logging.getLogger(__name__)
 
+        # Sharding; defaults to the single shard from the config
+        self.shard_id = self.bot.config.shard_id if shard_id is None else shard_id
+        self.shard_total = self.bot.config.shard_total if shard_total is None else shard_total
+        self.identify_limiter = identify_limiter
+        self.state = ShardState.DISCONNECTED
+
         # Initalize Things
         self.websocket = None
         self.ping = -1
@@ -38,116 +104,366 @@ class Websocket():
         self.session_time = 0
         self.login_time = 0
         self.heartbeat_greenlet = None
-
-        self.cache = Cache(self.bot.api)
-        self.event_handler = EventHandler(self.bot)
-
-        # Subscribe to events
+        self.login_greenlet = None
+        self.send_limiter = GatewaySendLimiter()
+
+        # Reconnecting
+        self.gateway_url = None
+        self.running = False
+        self.reconnect_attempts = 0
+        self.backoff_base = 1
+        self.backoff_cap = 60
+        self.invalid_session_delay = (1, 5)
+
+        # Payload encoding
+        self.encoding = self.bot.config.gateway_encoding
+        if self.encoding == "etf":
+            self.loads, self.dumps, self.opcode = etf.unpack, etf.pack, websocket.ABNF.OPCODE_BINARY
+        else:
+            self.loads, self.dumps, self.opcode = json.loads, json.dumps, websocket.ABNF.OPCODE_TEXT
+
+        # Transport compression
+        self.compress = self.bot.config.gateway_compress
+        self.decompressor = None
+        self.buffer = bytearray()
+        self.bytes_received = 0
+        self.bytes_decompressed = 0
+        self.decompress_time = 0
+
+        # Dispatches received per event name, to see what the intents let through
+        self.event_counts = Counter()
+        self.events_skipped = 0
+        self.warned_intents = False
+
+        if cache is None:
+            cache = Cache(
+                self.bot.api,
+                messages_per_channel=self.bot.config.message_cache_per_channel,
+                max_messages=self.bot.config.message_cache_max
+            )
+        self.cache = cache
+        if event_handler is None:
+            event_handler = EventHandler(self.bot)
+            event_handler.subscribe(self.cache.subscriptions)
+            event_handler.subscribe_raw(self.cache.raw_subscriptions)
+            event_handler.rebuild()
+        self.event_handler = event_handler
+
+        # Subscribe to events, only for this shard
         self.subscriptions = [
             Subscription("Ready", self.handle_gateway_ready),
+            Subscription("Resumed", self.handle_gateway_resumed)
+        ]
+        self.raw_subscriptions = [
             Subscription("MessageCreate", self.handle_gateway_message)
         ]
+        self.handlers = EventHandler.table(self.subscriptions)
+        self.raw_handlers = EventHandler.table(self.raw_subscriptions)
 
     def start(self):
+        """
+            Connect to the gateway and keep reconnecting until stop() is called
+            or Discord closes the connection with one of the FATAL_CLOSE_CODES
+            Reconnects RESUME the existing session when there is one, so Discord
+            replays only the missed events instead of every GUILD_CREATE
+        """
         self.logger.debug('Spawning Gateway Greenlet')
+        self.running = True
+
+        while self.running:
+            if self.gateway_url is None:
+                self.gateway_url = self.get_gateway_url()
+
+            self.socket_url = f"{self.gateway_url}?v=6&encoding={self.encoding}"
+            if self.compress is True:
+                self.socket_url += "&compress=zlib-stream"
+            self.login_time = time.time()
+            self.state = ShardState.CONNECTING
+
+            self.websocket_app = websocket.WebSocketApp(
+                self.socket_url,
+                on_message=self.handle_websocket_message,
+                on_error=self.handle_websocket_error,
+                on_open=self.handle_websocket_open,
+                # Three named arguments, or older websocket-client leaves out the close code
+                on_close=lambda socket, code=None, reason=None: self.handle_websocket_close(socket, code, reason)
+            )
+            self.websocket_app.run_forever()
+
+            if not self.running:
+                break
+
+            delay = self.reconnect_delay(self.reconnect_attempts)
+            self.reconnect_attempts += 1
+            self.logger.info(f"Reconnecting to Discord in {delay:.2f} seconds (attempt {self.reconnect_attempts})")
+            gevent.sleep(delay)
+
+    def stop(self):
+        self.running = False
+        self.state = ShardState.STOPPED
+
+        if self.websocket is not None:
+            self.websocket.close()
 
+    def get_gateway_url(self):
         gateway = self.bot.api.get_gateway_bot()
         if gateway.get("message") == "401: Unauthorized":
             raise InvalidBotToken()
 
-        self.socket_url = f"{gateway['url']}?v=6&encoding=json"
-        self.login_time = time.time()
+        return gateway['url']
 
-        self.websocket_app = websocket.WebSocketApp(
-            self.socket_url,
-            on_message=self.handle_websocket_message,
-            on_error=self.handle_websocket_error,
-            on_open=self.handle_websocket_open,
-            on_close=self.handle_websocket_close
-        )
-        self.logger.info("Successfully connected to Discord")
-        self.websocket_app.run_forever()
+    def reconnect_delay(self, attempt):
+        """
+            Exponential backoff with full jitter, so shards dropped together do not reconnect in lockstep
+        """
+        return random.uniform(0, min(self.backoff_cap, self.backoff_base * 2 ** attempt))
+
+    def identify(self):
+        self.state = ShardState.IDENTIFYING
+
+        # Discord only allows a few shards to IDENTIFY at a time
+        if self.identify_limiter is not None:
+            self.identify_limiter.wait(self.shard_id)
 
-    def send(self, data):
-        self.websocket.send(json.dumps(data))
+        self.send({
+            "op": GatewayOpCodes.IDENTIFY,
+            "v": 6,
+            "d": {
+                "token": self.token,
+                "shard": [
+                    self.shard_id,
+                    self.shard_total
+                ],
+                "properties": {
+                    "$os": system(),
+                    "$browser": "Bolt",
+                    "$device": "Bolt"
+                },
+                "large_threshold": self.bot.config.gateway_large_threshold,
+                "intents": self.intents(),
+                # Payload compression; not used alongside zlib-stream transport compression
+                "compress": False
+            }
+        }, priority=True)
+
+    def intents(self):
+        """
+            The configured intents, or the fewest that still deliver every event
+            something subscribes to. Privileged intents, for the cache or for
+            plugin subscriptions, are only asked for with
+            gateway_privileged_intents; Discord closes the connection with 4014
+            if the application has not been granted them
+            Worked out at each IDENTIFY; a RESUME keeps the session's intents
+        """
+        if self.bot.config.gateway_intents is not None:
+            return self.bot.config.gateway_intents
+
+        event_names = set(self.event_handler.queued)
+        if self.bot.router.groups:
+            event_names.add("MessageCreate")
+
+        cache_names = set(self.event_handler.direct) | set(self.event_handler.raw)
+        subscribed = event_names | cache_names
+        wanted = intents_for(subscribed)
+        intents = intents_for(subscribed, privileged=self.bot.config.gateway_privileged_intents)
+
+        # Discord only answers REQUEST_GUILD_MEMBERS with the members intent
+        if self.bot.config.member_chunking != "off":
+            intents |= Intents.GUILD_MEMBERS
+
+        dropped = wanted & ~intents
+        if dropped and not self.warned_intents:
+            self.warned_intents = True
+            names = ", ".join(intent.name for intent in Intents if intent & dropped)
+            missed = ", ".join(sorted(name for name in event_names if EVENT_INTENTS.get(name, 0) & dropped))
+
+            lost = "the cache's members will go stale"
+            if missed:
+                lost += f" and plugins will not receive {missed}"
+
+            self.logger.warning(
+                f"Not requesting privileged intents {names}; {lost}. "
+                f"Set gateway_privileged_intents once they are enabled for the application"
+            )
+
+        return int(intents)
+
+    def login(self, resumable=True, delay=0):
+        """
+            RESUME the session when possible, otherwise IDENTIFY afresh
+            Runs in its own greenlet: waiting for an identify slot or an
+            invalid session delay must not stop the socket from being read
+        """
+        gevent.sleep(delay)
+
+        if resumable and self.session_id is not None:
+            self.resume()
+            return
+
+        self.session_id = None
+        self.sequence = 0
+
+        try:
+            self.identify()
+        except ConnectionError as e:
+            # No identify slot could be had; drop the connection and go through the reconnect backoff
+            self.logger.error(f"Could not identify shard {self.shard_id}: {e}")
+            if self.websocket is not None:
+                self.websocket.close()
+
+    def resume(self):
+        self.state = ShardState.RESUMING
+        self.logger.info(f"Resuming session {self.session_id} from sequence {self.sequence}")
+        self.send({
+            "op": GatewayOpCodes.RESUME,
+            "d": {
+                "token": self.token,
+                "session_id": self.session_id,
+                "seq": self.sequence
+            }
+        }, priority=True)
+
+    def send(self, data, priority=False):
+        self.send_limiter.wait(priority)
+        self.websocket.send(self.dumps(data), self.opcode)
+
+    def request_guild_members(self, guild_id, query="", limit=0, nonce=None):
+        """
+            Ask for a guild's members; they arrive as GUILD_MEMBERS_CHUNK events
+            An empty query with limit 0 returns every member
+        """
+        payload = {"guild_id": str(guild_id), "query": query, "limit": limit}
+        if nonce is not None:
+            payload['nonce'] = nonce
+
+        self.send({"op": GatewayOpCodes.REQUEST_GUILD_MEMBERS, "d": payload})
+
+    def decode(self, message):
+        """
+            Turn websocket frames into one encoded gateway payload
+            With zlib-stream, frames are fed to one decompressor for the whole
+            connection, and a message may span several frames; returns None
+            until the last frame of a message has arrived
+        """
+        if self.compress is not True or isinstance(message, str):
+            self.bytes_received += len(message)
+            self.bytes_decompressed += len(message)
+            return message
+
+        self.bytes_received += len(message)
+        self.buffer.extend(message)
+
+        if self.buffer[-4:] != ZLIB_SUFFIX:
+            return None
+
+        start = time.perf_counter()
+        message = self.decompressor.decompress(self.buffer)
+        self.decompress_time += time.perf_counter() - start
+
+        self.buffer.clear()
+        self.bytes_decompressed += len(message)
+        return message
+
+    @property
+    def compression_ratio(self):
+        if self.bytes_received == 0:
+            return 1.0
+
+        return self.bytes_decompressed / self.bytes_received
 
     def heartbeat(self, interval):
         while True:
             self._heartbeat_start = time.monotonic()
             self.logger.debug(f'Heartbeat. Ping: {self.ping} @ {int(self._heartbeat_start)}')
-            self.send({"op": GatewayOpCodes.HEARTBEAT, "d": self.sequence})
+            self.send({"op": GatewayOpCodes.HEARTBEAT, "d": self.sequence}, priority=True)
             gevent.sleep(interval / 1000)
 
     def handle_websocket_error(self, socket, error):
         self.logger.warning(f"Socket error {error}")
 
-    def handle_websocket_close(self, socket):
-        self.logger.warning("Socket closed unexpectedly")
+    def handle_websocket_close(self, socket, code=None, reason=None):
+        if self.running and code in FATAL_CLOSE_CODES:
+            self.logger.error(
+                f"Discord closed shard {self.shard_id} with {code} ({FATAL_CLOSE_CODES[code]}), not reconnecting"
+            )
+            self.running = False
+            self.state = ShardState.STOPPED
+
+        elif self.running:
+            self.logger.warning(f"Socket closed unexpectedly ({code})" if code else "Socket closed unexpectedly")
 
-        self.websocket.close()
         self.websocket = None
+        if self.running:
+            self.state = ShardState.DISCONNECTED
 
         if self.heartbeat_greenlet:
             self.heartbeat_greenlet.kill()
+            self.heartbeat_greenlet = None
 
-        self.start()
+        if self.login_greenlet:
+            self.login_greenlet.kill()
+            self.login_greenlet = None
 
     def handle_websocket_open(self, socket):
+        self.logger.info("Successfully connected to Discord")
         self.session_time = time.time()
         self.websocket = socket
 
+        # The zlib context and the send rate limit live exactly as long as the connection
+        self.decompressor = zlib.decompressobj()
+        self.buffer.clear()
+        self.send_limiter.reset()
+
     def handle_websocket_message(self, socket, message):
-        message = json.loads(message)
+        message = self.decode(message)
+        if message is None:
+            return True
+
+        message = self.loads(message)
         op_code = message.get('op', None)
 
         if op_code == GatewayOpCodes.DISPATCH:
-            event_name = snakecase_to_camelcase(message['t'])
-            event_class = getattr(events, event_name)
+            self.event_counts[message['t']] += 1
+            self.sequence = message.get('s') or self.sequence
 
-            event = event_class.marshal(message)
-            event.remarshal(message['d'])
-            event.cache = self.cache
+            event_class = events.get_event_class(message['t'])
+            if event_class is None:
+                self.logger.debug(f"Ignoring unknown event {message['t']}")
+                return True
 
-            self.sequence = event.sequence
+            # Only marshal the event when something wants the model. It is bound
+            # before the raw handlers run, so it can capture cache state they replace
+            event_name = event_class.__name__
+            event = None
+            if self.event_handler.subscribed(event_name, self.handlers):
+                event = event_class.from_payload(message)
+                event.bind(self.cache)
 
-            # Update cache
-            self.event_handler.dispatch(event, self.cache.subscriptions)
+            self.event_handler.dispatch_raw(event_name, message.get('d'), self.raw_handlers)
 
-            # Dispatch event to all subscribers
-            self.event_handler.dispatch(event, self.subscriptions)
-            for plugin in self.bot.plugins:
-                if plugin.enabled is True:
-                    self.event_handler.dispatch(event, plugin.subscriptions, queue=True)
+            if event is None:
+                self.events_skipped += 1
+                return True
+
+            # Update cache, then this shard's handlers, then queue plugin subscribers
+            self.event_handler.dispatch(event, self.handlers)
 
         elif op_code == GatewayOpCodes.RECONNECT:
             self.logger.warning("Got reconnect signal")
             self.websocket.close()
 
         elif op_code == GatewayOpCodes.INVALID_SESSION:
-            self.logger.warning("Invalid websocket session")
-            self.websocket.close()
+            resumable = message.get('d') is True
+            self.logger.warning(f"Invalid websocket session, {'resuming' if resumable else 'identifying'} again")
 
-        elif op_code == GatewayOpCodes.HELLO:
-            self.send({
-                "op": GatewayOpCodes.IDENTIFY,
-                "v": 6,
-                "d": {
-                    "token": self.token,
-                    "shard": [
-                        self.bot.config.shard_id,
-                        self.bot.config.shard_total
-                    ],
-                    "properties": {
-                        "$os": system(),
-                        "$browser": "Bolt",
-                        "$device": "Bolt"
-                    },
-                    "large_threshold": 50,
-                    "compress": False
-                }
-            })
+            # Discord asks for a short random wait before trying again
+            delay = random.uniform(*self.invalid_session_delay)
+            self.login_greenlet = gevent.spawn(self.login, resumable, delay)
 
+        elif op_code == GatewayOpCodes.HELLO:
+            # Heartbeat from the start; a shard queued for an identify slot would otherwise be dropped
             self.heartbeat_greenlet = gevent.spawn(self.heartbeat, message['d']['heartbeat_interval'])
+            self.login_greenlet = gevent.spawn(self.login)
 
         elif op_code == GatewayOpCodes.HEARTBEAT_ACK:
             delta = timedelta(seconds=time.monotonic() - self._heartbeat_start)
@@ -186,42 +502,43 @@ class Websocket():
         self.logger.debug(f"Setting status: {status}")
 
     # Event handlers
-    def handle_gateway_message(self, event):
-        if event.message.author.id == self.cache.user.id:
+    def handle_gateway_message(self, data):
+        """
+            Commands are matched on the raw message data; only a message that
+            runs a command is marshalled here
+        """
+        if self.cache.user is not None and str(data['author']['id']) == self.cache.user.id:
+            return
+
+        matches = self.bot.router.route(data.get('content') or "")
+        if not matches:
             return
 
-        content = event.message.content
-        for command in self.iter_commands():
-            if command.matches(content):
-                event.args, event.kwargs = command.parse(content)
+        payload = {"op": GatewayOpCodes.DISPATCH, "s": self.sequence, "t": "MESSAGE_CREATE", "d": data}
+        event = MessageCreate.from_payload(payload)
+        event.bind(self.cache)
+
+        for match in matches:
+            event.args, event.kwargs = match.args, match.kwargs
 
-                for hook in self.iter_pre_command_hooks():
-                    output = hook(command, event)
-                    if output is False:
-                        return
+            for hook in self.bot.router.pre_command_hooks:
+                output = hook(match.command, event)
+                if output is False:
+                    return
 
-                self.bot.queue.put((command.invoke, [event], {}))
-                gevent.sleep(0)
+            self.bot.queue.put((match.command.invoke, [event], {"match": match}), lane=Lane.COMMAND)
+            gevent.sleep(0)
 
     def handle_gateway_ready(self, event):
         self.user_id = event.user.id
         self.session_id = event.session_id
+        self.reconnect_attempts = 0
+        self.state = ShardState.CONNECTED
 
-    def iter_commands(self):
-        for plugin in self.bot.plugins:
-            if not plugin.enabled:
-                continue
-
-            for command in plugin.commands:
-                yield command
-
-    def iter_pre_command_hooks(self):
-        for plugin in self.bot.plugins:
-            if not plugin.enabled:
-                continue
-
-            for hook in plugin.pre_command_hooks:
-                yield hook
+    def handle_gateway_resumed(self, event):
+        self.logger.info(f"Resumed session {self.session_id}")
+        self.reconnect_attempts = 0
+        self.state = ShardState.CONNECTED
 
 
 class GatewayOpCodes(IntEnum):
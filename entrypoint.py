@@ -13,6 +13,8 @@
 from bolt.utils.shell import Shell
 from bolt import Bot
 from bolt.core.config import Config
+from bolt.core.cluster import ClusterSupervisor
+from bolt.utils import setup_logger
 
 import argparse
 import sys
@@ -47,6 +49,8 @@ def main():
         verify_config(config_path)
     elif args['command'] == "verify-plugins":
         verify_plugins()
+    elif args['command'] == "cluster":
+        run_cluster(config_path, args.get('processes'))
     else:
         run_bot(config_path, plugin_dir)
 
@@ -62,6 +66,8 @@ def init_parser():
     parser_shell = subparser.add_parser('shell')
     parser_verify_config = subparser.add_parser('verify-config')
     parser_verify_plugins = subparser.add_parser('verify-plugins')
+    parser_cluster = subparser.add_parser('cluster')
+    parser_cluster.add_argument("--processes", type=int, default=None)
 
     return parser
 
@@ -104,6 +110,20 @@ def run_bot(config_path, plugin_dir):
     except KeyboardInterrupt:
         sys.exit(0)
 
+
+def run_cluster(config_path, processes):
+    config = Config.from_yaml_file(config_path)
+    setup_logger(config)
+
+    supervisor = ClusterSupervisor(config, config_path, processes=processes)
+
+    try:
+        supervisor.start()
+    except KeyboardInterrupt:
+        supervisor.stop()
+        sys.exit(0)
+
+
 def run_shell():
     while True:
         with Shell('localhost', 5000) as shell:
@@ -0,0 +1,154 @@
+import unittest
+import tempfile
+import sys
+import os
+
+import gevent
+
+from bolt.core.config import Config
+from bolt.core.cluster import shard_groups, ipc_request, IPCServer, ClusterNode, ClusterSupervisor
+from bolt.core.cluster import ClusterIdentifyLimiter
+from tests.discord.fake_bot import FakeBot
+
+
+class FakeCache():
+    def __init__(self, guilds):
+        self.guilds = {guild_id: None for guild_id in range(guilds)}
+        self.channels = {}
+        self.users = {}
+
+
+def cluster_bot(guilds):
+    bot = FakeBot()
+    bot.cache = FakeCache(guilds)
+    return bot
+
+
+class TestShardGroups(unittest.TestCase):
+
+    def test_even_split(self):
+        self.assertEqual(shard_groups(range(8), 4), [[0, 1], [2, 3], [4, 5], [6, 7]])
+
+    def test_uneven_split(self):
+        self.assertEqual(shard_groups(range(7), 3), [[0, 1, 2], [3, 4], [5, 6]])
+
+    def test_more_processes_than_shards(self):
+        self.assertEqual(shard_groups([4, 5], 4), [[4], [5]])
+
+
+class TestIPC(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_request_reply(self):
+        server = IPCServer(os.path.join(self.directory.name, "test.sock"), lambda request: request['value'] * 2)
+        server.start()
+
+        try:
+            self.assertEqual(ipc_request(server.path, {"value": 21}), {"result": 42})
+            self.assertIn("error", ipc_request(server.path, {}))
+        finally:
+            server.stop()
+
+        self.assertFalse(os.path.exists(server.path))
+
+    def test_cluster_query(self):
+        nodes = [
+            ClusterNode(cluster_bot(guilds), index=index, workers=3, ipc_dir=self.directory.name)
+            for index, guilds in enumerate([10, 20, 30])
+        ]
+        for node in nodes:
+            node.start()
+            node.register("worker", lambda node=node: node.index)
+
+        try:
+            self.assertEqual(nodes[1].query("worker"), {0: 0, 1: 1, 2: 2})
+            self.assertEqual(nodes[0].total("guild_count"), 60)
+
+            # A worker that is down is left out rather than failing the query
+            nodes[2].stop()
+            self.assertEqual(nodes[0].total("guild_count"), 30)
+        finally:
+            for node in nodes:
+                node.stop()
+
+    def test_identify_retries_until_granted(self):
+        replies = [False, False, True]
+        server = IPCServer(os.path.join(self.directory.name, "supervisor.sock"), lambda request: replies.pop(0))
+        server.start()
+
+        try:
+            ClusterIdentifyLimiter(server.path, timeout=1).wait(0)
+        finally:
+            server.stop()
+
+        self.assertEqual(replies, [])
+
+    def test_identify_without_supervisor(self):
+        limiter = ClusterIdentifyLimiter(os.path.join(self.directory.name, "supervisor.sock"), timeout=1, attempts=2)
+        limiter.retry_delay = 0.01
+
+        with gevent.Timeout(5):
+            with self.assertRaises(ConnectionError):
+                limiter.wait(0)
+
+    def test_single_process(self):
+        node = ClusterNode(cluster_bot(5))
+
+        self.assertFalse(node.enabled)
+        self.assertEqual(node.query("guild_count"), {0: 5})
+
+
+class TestClusterSupervisor(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        config = Config({"api_key": "token", "shard_total": 4, "cluster_ipc_dir": self.directory.name})
+        self.supervisor = ClusterSupervisor(config, "config.yml", processes=2)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_create_workers(self):
+        self.supervisor.create_workers()
+
+        self.assertEqual([worker.shard_ids for worker in self.supervisor.workers], [[0, 1], [2, 3]])
+        self.assertIn("0,1", self.supervisor.command(self.supervisor.workers[0]))
+
+    def test_restart_exited_workers(self):
+        self.supervisor.backoff_base = 0.01
+        self.supervisor.command = lambda worker: [sys.executable, "-c", f"import sys; sys.exit({worker.index + 1})"]
+
+        self.supervisor.create_workers()
+        greenlet = gevent.spawn(self.supervisor.start)
+        try:
+            with gevent.Timeout(10):
+                while not all(worker.restarts >= 2 for worker in self.supervisor.workers):
+                    gevent.sleep(0.01)
+        finally:
+            self.supervisor.stop()
+            greenlet.join(timeout=5)
+
+        self.assertTrue(greenlet.dead)
+        self.assertFalse(os.path.exists(self.supervisor.supervisor_path))
+
+    def test_identify_gate(self):
+        self.supervisor.create_workers()
+        self.supervisor.identify_limiter.identify_interval = 0.1
+
+        self.assertTrue(self.supervisor.handle({"op": "identify", "shard_id": 0}))
+        with gevent.Timeout(0.05, False):
+            self.supervisor.handle({"op": "identify", "shard_id": 1})
+            self.fail("second identify was not delayed")
+
+    def test_identify_gate_timeout(self):
+        self.supervisor.create_workers()
+        self.supervisor.identify_limiter.identify_interval = 10
+
+        self.assertTrue(self.supervisor.handle({"op": "identify", "shard_id": 0, "timeout": 1}))
+        with gevent.Timeout(1):
+            self.assertFalse(self.supervisor.handle({"op": "identify", "shard_id": 1, "timeout": 0.05}))
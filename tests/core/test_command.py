@@ -1,7 +1,10 @@
 import unittest
-from bolt.core.command import Command, RegexCommand, ParseCommand
+import re
+from bolt.core.command import Command, RegexCommand, ParseCommand, CommandRouter, regex_prefix, parse_prefix
+from bolt.core.command import is_ascii
 from bolt.discord.events import MessageCreate
 from bolt.discord.models.message import Message
+from tests.discord.fake_bot import FakePlugin
 
 
 class TestCommand(unittest.TestCase):
@@ -97,3 +100,142 @@ class TestParseCommand(unittest.TestCase):
     def test_change_trigger(self):
         command = ParseCommand("test command", self.dummycallback, trigger="?!")
         self.assertTrue(command.matches("?!test command"))
+
+
+class TestCommandRouter(unittest.TestCase):
+
+    def dummycallback(self):
+        pass
+
+    def route(self, commands, text):
+        router = CommandRouter()
+        router.rebuild([FakePlugin(commands=commands)])
+        return [match.command for match in router.route(text)]
+
+    def test_regex_prefix(self):
+        self.assertEqual(regex_prefix(re.compile(r"^test command$")), "test command")
+        self.assertEqual(regex_prefix(re.compile(r"^roll (\d+)")), "roll ")
+        self.assertEqual(regex_prefix(re.compile(r"^foo\.bar")), "foo.bar")
+        self.assertEqual(regex_prefix(re.compile(r"^ab?c")), "a")
+        self.assertEqual(regex_prefix(re.compile(r"^ab{2}")), "a")
+        self.assertEqual(regex_prefix(re.compile(r"test")), "")
+        self.assertEqual(regex_prefix(re.compile(r"^a|b")), "")
+        self.assertEqual(regex_prefix(re.compile(r"^abc", re.IGNORECASE)), "")
+
+    def test_parse_prefix(self):
+        self.assertEqual(parse_prefix("roll {sides:d}"), "roll ")
+        self.assertEqual(parse_prefix("set {{key}} {value}"), "set {key} ")
+        self.assertEqual(parse_prefix("ping"), "ping")
+
+    def test_is_ascii(self):
+        self.assertTrue(is_ascii(""))
+        self.assertTrue(is_ascii("roll "))
+        self.assertFalse(is_ascii("café"))
+        self.assertFalse(is_ascii("\u212a"))
+
+    def test_routes_each_kind(self):
+        ping = Command("ping", self.dummycallback, trigger="!")
+        roll = RegexCommand(r"^roll (\d+)$", self.dummycallback, trigger="!")
+        say = ParseCommand("say {text}", self.dummycallback, trigger="!")
+
+        self.assertEqual(self.route([ping, roll, say], "!ping"), [ping])
+        self.assertEqual(self.route([ping, roll, say], "!roll 20"), [roll])
+        self.assertEqual(self.route([ping, roll, say], "!SAY hello"), [say])
+        self.assertEqual(self.route([ping, roll, say], "ping"), [])
+        self.assertEqual(self.route([ping, roll, say], "!roll dice"), [])
+
+    def test_unanchored_regex(self):
+        command = RegexCommand("hello", self.dummycallback, trigger="")
+        self.assertEqual(self.route([command], "well hello there"), [command])
+
+    def test_registration_order(self):
+        commands = [
+            ParseCommand("echo {text}", self.dummycallback, trigger="!"),
+            RegexCommand(r"^echo", self.dummycallback, trigger="!"),
+            RegexCommand(r"echo", self.dummycallback, trigger=""),
+            Command("echo hi", self.dummycallback, trigger="!")
+        ]
+
+        self.assertEqual(self.route(commands, "!echo hi"), commands)
+
+    def test_skips_disabled_plugins(self):
+        router = CommandRouter()
+        hook = self.dummycallback
+        router.rebuild([
+            FakePlugin(commands=[Command("a", self.dummycallback, trigger="!")], pre_command_hooks=[hook]),
+            FakePlugin(commands=[Command("b", self.dummycallback, trigger="!")], enabled=False)
+        ])
+
+        self.assertEqual([match.command.pattern for match in router.route("!a")], ["a"])
+        self.assertEqual(router.route("!b"), [])
+        self.assertEqual(router.pre_command_hooks, (hook,))
+
+    def test_same_as_trying_every_command(self):
+        commands = []
+        for index in range(30):
+            trigger = "!" if index % 3 else "?"
+            commands.append(Command(f"cmd{index}", self.dummycallback, trigger=trigger))
+            commands.append(RegexCommand(rf"^cmd{index}(\d*)$", self.dummycallback, trigger=trigger))
+            commands.append(ParseCommand(f"Cmd{index} {{value}}", self.dummycallback, trigger=trigger))
+        commands.append(RegexCommand(r"cmd1", self.dummycallback, trigger=""))
+
+        router = CommandRouter()
+        router.rebuild([FakePlugin(commands=commands)])
+
+        for text in ["!cmd1", "!cmd12", "?cmd0", "!cmd1 x", "?CMD3 y", "cmd1", "!cmd", "hello", "!", "!cmd4 K"]:
+            expected = [command for command in commands if command.matches(text)]
+            self.assertEqual([match.command for match in router.route(text)], expected, text)
+
+
+class TestCommandMatch(unittest.TestCase):
+
+    def dummycallback(self):
+        pass
+
+    def test_regex_match(self):
+        command = RegexCommand(r"^roll (\d+)d(\d+)$", self.dummycallback, trigger="!")
+        match = command.match("!roll 2d20")
+
+        self.assertIs(match.command, command)
+        self.assertEqual(match.content, "roll 2d20")
+        self.assertEqual(match.args, ["2", "20"])
+        self.assertEqual(match.kwargs, {})
+        self.assertIsNone(command.match("roll 2d20"))
+
+    def test_parse_match(self):
+        command = ParseCommand("remind {who} in {minutes:d}", self.dummycallback, trigger="!")
+        match = command.match("!remind me in 5")
+
+        self.assertEqual(match.kwargs, {"who": "me", "minutes": 5})
+        self.assertIsNone(command.match("!remind me later"))
+
+    def test_parse_runs_once(self):
+        command = ParseCommand("echo {text}", self.dummycallback, trigger="!")
+        calls = []
+        compiled = command.compiled_pattern
+
+        class CountingPattern():
+            def parse(self, text):
+                calls.append(text)
+                return compiled.parse(text)
+
+        command.compiled_pattern = CountingPattern()
+        router = CommandRouter()
+        router.rebuild([FakePlugin(commands=[command])])
+
+        match, = router.route("!echo hi")
+        self.assertEqual(match.kwargs, {"text": "hi"})
+        self.assertEqual(calls, ["echo hi"])
+
+    def test_invoke_with_match(self):
+        def callback(event):
+            return event
+
+        command = RegexCommand(r"^say (.+)$", callback, trigger="!")
+        event = MessageCreate()
+        event.message = Message.marshal({"id": "1", "channel_id": "2", "content": "!say !hello"})
+
+        event = command.invoke(event, match=command.match(event.message.content))
+
+        self.assertEqual(event.message.content, "say !hello")
+        self.assertEqual(event.args, ["!hello"])
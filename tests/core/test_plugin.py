@@ -3,6 +3,8 @@ from bolt.core.plugin import Plugin
 from bolt import interval, command, cron, webhook
 from bolt import Bot
 
+import gevent
+import gevent.event
 import yaml
 
 
@@ -85,3 +87,73 @@ class TestPlugins(unittest.TestCase):
         plugin = TestPlugin(bot)
         plugin.load()
         self.assertTrue(len(plugin.webhooks) > 0)
+
+
+class TestPluginGreenlets(unittest.TestCase):
+    def setUp(self):
+        self.config_file = "/tmp/bolt-test-config.yaml"
+        fake_config = {
+            "api_key": "1234",
+            "log_dir": "/tmp/",
+            "plugin_greenlets": 2
+        }
+        with open(self.config_file, "w") as tempconfig:
+            tempconfig.write(yaml.dump(fake_config))
+
+        self.plugin = TestPlugin(Bot(self.config_file))
+        self.plugin.load()
+
+    def tearDown(self):
+        self.plugin.unload()
+
+    def test_spawn_is_immediate(self):
+        started = gevent.event.Event()
+        self.plugin.spawn_greenlet(started.set)
+
+        self.assertTrue(started.wait(timeout=0.1))
+
+    def test_pool_limits_greenlets(self):
+        release = gevent.event.Event()
+        for _ in range(5):
+            self.plugin.spawn_greenlet(release.wait)
+
+        gevent.sleep(0.01)
+        self.assertEqual(len(self.plugin.greenlets), 2)
+        self.assertEqual(self.plugin.greenlet_queue.qsize(), 2)
+
+        release.set()
+        with gevent.Timeout(1):
+            while self.plugin.greenlets or self.plugin.greenlet_queue.qsize():
+                gevent.sleep(0.01)
+
+    def test_finished_greenlets_are_reaped(self):
+        for _ in range(20):
+            self.plugin.spawn_greenlet(gevent.sleep, 0)
+
+        self.plugin.pool.join(timeout=1)
+        gevent.sleep(0.01)
+        self.assertEqual(self.plugin.greenlets, [])
+
+    def test_unload_kills_greenlets(self):
+        self.plugin.spawn_greenlet(gevent.sleep, 60)
+        gevent.sleep(0.01)
+        self.assertEqual(len(self.plugin.greenlets), 1)
+
+        self.plugin.unload()
+        self.assertEqual(self.plugin.greenlets, [])
+        self.assertIsNone(self.plugin.spawner)
+
+    def test_appended_greenlets_are_adopted(self):
+        # Plugins used to keep their own greenlets in the plugin.greenlets list
+        sleeper = gevent.spawn(gevent.sleep, 60)
+        finisher = gevent.spawn(gevent.sleep, 0)
+        self.plugin.greenlets.append(sleeper)
+        self.plugin.greenlets.extend([finisher])
+
+        finisher.join(timeout=1)
+        gevent.sleep(0.01)
+        self.assertEqual(self.plugin.greenlets, [sleeper])
+
+        self.plugin.unload()
+        self.assertTrue(sleeper.dead)
+        self.assertEqual(self.plugin.greenlets, [])
@@ -0,0 +1,136 @@
+import unittest
+
+import gevent
+from gevent.queue import Empty, Full
+
+from bolt.core.queue import WorkQueue, Lane, owner_name
+from bolt.core.command import Command
+from tests.discord.fake_bot import FakePlugin
+
+
+class TestWorkQueue(unittest.TestCase):
+
+    def setUp(self):
+        self.presence = FakePlugin("Presence")
+        self.music = FakePlugin("Music")
+
+    def item(self, plugin, label):
+        return (plugin.callback, [label], {})
+
+    def drain(self, queue):
+        labels = []
+        while not queue.empty():
+            labels.append(queue.get_nowait()[1][0])
+        return labels
+
+    def test_lane_priority(self):
+        queue = WorkQueue()
+        queue.put(self.item(self.music, "scheduled"), lane=Lane.SCHEDULED)
+        queue.put(self.item(self.music, "event"))
+        queue.put(self.item(self.music, "command"), lane=Lane.COMMAND)
+
+        self.assertEqual(self.drain(queue), ["command", "event", "scheduled"])
+
+    def test_plugins_take_turns(self):
+        queue = WorkQueue()
+        for index in range(3):
+            queue.put(self.item(self.presence, f"p{index}"))
+        queue.put(self.item(self.music, "m0"))
+        queue.put(self.item(self.music, "m1"))
+
+        self.assertEqual(self.drain(queue), ["p0", "m0", "p1", "m1", "p2"])
+
+    def test_weights(self):
+        queue = WorkQueue(weights={"Music": 2})
+        for index in range(3):
+            queue.put(self.item(self.presence, f"p{index}"))
+            queue.put(self.item(self.music, f"m{index}"))
+
+        self.assertEqual(self.drain(queue), ["p0", "m0", "m1", "p1", "m2", "p2"])
+
+    def test_drop_oldest_from_busiest_plugin(self):
+        queue = WorkQueue(max_size=3)
+        queue.put(self.item(self.presence, "p0"))
+        queue.put(self.item(self.presence, "p1"))
+        queue.put(self.item(self.music, "m0"))
+        queue.put(self.item(self.music, "command"), lane=Lane.COMMAND)
+
+        self.assertEqual(queue.qsize(), 3)
+        self.assertEqual(self.drain(queue), ["command", "p1", "m0"])
+        self.assertEqual(queue.stats()["event"]["dropped"], 1)
+
+    def test_drop_oldest_keeps_higher_lanes(self):
+        queue = WorkQueue(max_size=2)
+        queue.put(self.item(self.music, "c0"), lane=Lane.COMMAND)
+        queue.put(self.item(self.music, "c1"), lane=Lane.COMMAND)
+
+        self.assertFalse(queue.put(self.item(self.presence, "p0")))
+        self.assertEqual(self.drain(queue), ["c0", "c1"])
+
+    def test_drop_newest(self):
+        queue = WorkQueue(max_size=1, policy="drop_newest")
+        self.assertTrue(queue.put(self.item(self.music, "m0")))
+        self.assertFalse(queue.put(self.item(self.music, "m1"), lane=Lane.COMMAND))
+
+        self.assertEqual(self.drain(queue), ["m0"])
+        self.assertEqual(queue.stats()["command"]["dropped"], 1)
+
+    def test_drop_warning_rate_limited(self):
+        queue = WorkQueue(max_size=1, policy="drop_newest")
+        queue.put(self.item(self.music, "m0"))
+
+        with self.assertLogs("bolt.core.queue", level="WARNING") as logs:
+            for index in range(5):
+                queue.put(self.item(self.music, f"e{index}"))
+            queue.last_warning -= WorkQueue.warn_interval
+            queue.put(self.item(self.music, "c0"), lane=Lane.COMMAND)
+
+        self.assertEqual(len(logs.records), 2)
+        self.assertIn("command 0, event 1, scheduled 0", logs.output[0])
+        self.assertIn("command 1, event 5, scheduled 0", logs.output[1])
+
+    def test_block(self):
+        queue = WorkQueue(max_size=1, policy="block")
+        queue.put(self.item(self.music, "m0"))
+
+        with self.assertRaises(Full):
+            queue.put(self.item(self.music, "m1"), timeout=0.01)
+
+        greenlet = gevent.spawn(queue.put, self.item(self.music, "m2"))
+        gevent.sleep(0.01)
+        self.assertFalse(greenlet.ready())
+
+        queue.get()
+        greenlet.join(timeout=1)
+        self.assertEqual(self.drain(queue), ["m2"])
+
+    def test_get_blocks_until_put(self):
+        queue = WorkQueue()
+
+        with self.assertRaises(Empty):
+            queue.get(timeout=0.01)
+
+        gevent.spawn_later(0.02, queue.put, self.item(self.music, "late"))
+        self.assertEqual(queue.get(timeout=1)[1], ["late"])
+
+    def test_wait_metrics(self):
+        queue = WorkQueue()
+        queue.put(self.item(self.music, "m0"), lane=Lane.COMMAND)
+        gevent.sleep(0.02)
+        queue.get()
+
+        stats = queue.stats()["command"]
+        self.assertEqual(stats["dequeued"], 1)
+        self.assertGreaterEqual(stats["max_wait"], 0.02)
+        self.assertEqual(stats["mean_wait"], stats["max_wait"])
+
+    def test_invalid_policy(self):
+        with self.assertRaises(ValueError):
+            WorkQueue(policy="random")
+
+    def test_owner_name(self):
+        command = Command("ping", self.music.callback)
+
+        self.assertEqual(owner_name(self.music.callback), "Music")
+        self.assertEqual(owner_name(command.invoke), "Music")
+        self.assertEqual(owner_name(lambda: None), "")
@@ -0,0 +1,122 @@
+import unittest
+import time
+
+import gevent
+
+from bolt.core.scheduler import Scheduler, Interval, Cron
+from tests.discord.fake_bot import FakeBot, FakePlugin
+
+
+class TestScheduler(unittest.TestCase):
+
+    def setUp(self):
+        self.bot = FakeBot()
+        self.scheduler = Scheduler(self.bot)
+        # Wake exactly when jobs are due so the timing checks are precise
+        self.scheduler.resolution = 0
+        self.greenlet = gevent.spawn(self.scheduler.start)
+
+    def tearDown(self):
+        self.scheduler.stop()
+        self.greenlet.join(timeout=1)
+
+    def collect(self, seconds):
+        runs = []
+        with gevent.Timeout(seconds, False):
+            while True:
+                callback, _, _ = self.bot.queue.get()
+                runs.append((time.time(), callback))
+        return runs
+
+    def test_sub_second_interval(self):
+        plugin = FakePlugin()
+        plugin.intervals.append(Interval(0.05, plugin.tick))
+        self.scheduler.rebuild([plugin])
+
+        runs = self.collect(0.33)
+
+        self.assertGreaterEqual(len(runs), 6)
+        self.assertLessEqual(len(runs), 8)
+
+    def test_no_drift(self):
+        plugin = FakePlugin()
+        interval = Interval(0.05, plugin.tick)
+        plugin.intervals.append(interval)
+        self.scheduler.rebuild([plugin])
+
+        runs = self.collect(0.28)
+        first = runs[0][0]
+
+        # Runs stay on the grid set by the first run
+        for index, (ran, _) in enumerate(runs):
+            self.assertAlmostEqual(ran - first, index * 0.05, delta=0.02)
+
+        self.assertLess(self.scheduler.max_lateness, 0.02)
+
+    def test_wakes_for_sooner_job(self):
+        slow = FakePlugin()
+        slow.intervals.append(Interval(60, slow.tick))
+        self.scheduler.rebuild([slow])
+        self.collect(0.01)
+
+        fast = FakePlugin()
+        fast.intervals.append(Interval(0.02, fast.tick))
+        self.scheduler.rebuild([slow, fast])
+
+        runs = self.collect(0.1)
+        self.assertGreaterEqual(len(runs), 4)
+
+    def test_batches_due_jobs(self):
+        self.scheduler.resolution = Scheduler.resolution
+        plugin = FakePlugin()
+        for index in range(50):
+            plugin.intervals.append(Interval(0.05 + index * 0.001, plugin.tick))
+        self.scheduler.rebuild([plugin])
+        self.scheduler.wakeups = 0
+
+        runs = self.collect(0.5)
+
+        # Every job keeps running, but the loop only wakes once per resolution
+        self.assertGreaterEqual(len(runs), 200)
+        self.assertLessEqual(self.scheduler.wakeups, 0.5 / Scheduler.resolution + 2)
+        self.assertLess(self.scheduler.max_lateness, Scheduler.resolution + 0.02)
+
+    def test_rebuild_cancels_removed_jobs(self):
+        keep = FakePlugin()
+        keep.intervals.append(Interval(10, keep.tick))
+        drop = FakePlugin()
+        drop.intervals.append(Interval(10, drop.tick))
+        drop.crons.append(Cron("* * * * *", drop.tick))
+
+        self.scheduler.rebuild([keep, drop])
+        self.assertEqual(len(self.scheduler.next_runs()), 3)
+
+        drop.enabled = False
+        self.scheduler.rebuild([keep, drop])
+
+        self.assertEqual([job for _, job in self.scheduler.next_runs()], keep.intervals)
+        self.assertIsNone(drop.intervals[0].next_run)
+        self.assertIsNotNone(keep.intervals[0].next_run)
+
+
+class TestJobs(unittest.TestCase):
+
+    def test_interval_skips_missed_periods(self):
+        interval = Interval(10, None)
+
+        self.assertEqual(interval.following(100, 100.5), 110)
+        self.assertEqual(interval.following(100, 125), 130)
+        self.assertEqual(interval.last, 100)
+
+    def test_interval_rejects_non_positive_period(self):
+        for period in [0, -1, -0.5]:
+            with self.assertRaises(ValueError):
+                Interval(period, None)
+
+    def test_cron_skips_missed_runs(self):
+        cron = Cron("* * * * *", None)
+        due = cron.first_run(time.time())
+
+        following = cron.following(due, due + 600)
+        self.assertGreater(following, due + 600)
+        self.assertLessEqual(following, due + 660)
@@ -0,0 +1,78 @@
+import unittest
+
+import gevent
+
+from bolt.core.queue import WorkQueue, Lane
+from bolt.core.workers import WorkerPool
+
+
+class TestWorkerPool(unittest.TestCase):
+
+    def setUp(self):
+        self.queue = WorkQueue()
+        self.pool = WorkerPool(self.queue, min_workers=1, max_workers=4, task_timeout=1, idle_timeout=0.1)
+        self.pool.scale_interval = 0.01
+        self.greenlet = gevent.spawn(self.pool.start)
+        gevent.sleep(0)
+
+    def tearDown(self):
+        self.pool.stop()
+        self.greenlet.kill()
+
+    def put(self, callback, *args, lane=Lane.COMMAND):
+        self.queue.put((callback, list(args), {}), lane=lane)
+
+    def wait_for(self, condition, timeout=1):
+        with gevent.Timeout(timeout):
+            while not condition():
+                gevent.sleep(0.005)
+
+    def test_slow_task_does_not_block_others(self):
+        done = []
+        self.put(gevent.sleep, 0.5)
+        self.put(done.append, "fast")
+
+        self.wait_for(lambda: done, timeout=0.1)
+        self.assertEqual(self.pool.size, 2)
+
+    def test_scales_up_to_max(self):
+        for _ in range(10):
+            self.put(gevent.sleep, 0.1)
+
+        self.wait_for(lambda: self.pool.busy == 4)
+        self.assertEqual(self.pool.size, 4)
+        self.assertEqual(self.pool.peak, 4)
+
+    def test_scales_down_to_min(self):
+        for _ in range(4):
+            self.put(gevent.sleep, 0.02)
+
+        self.wait_for(lambda: self.pool.peak == 4)
+        self.wait_for(lambda: self.pool.size == 1)
+        self.assertEqual(self.pool.stats()["tasks"], 4)
+
+    def test_task_timeout(self):
+        self.pool.task_timeout = 0.05
+        done = []
+        self.put(gevent.sleep, 10)
+        self.put(done.append, "after")
+
+        self.wait_for(lambda: self.pool.timeouts == 1)
+        self.wait_for(lambda: done)
+
+    def test_errors_are_counted(self):
+        def fail():
+            raise ValueError("broken")
+
+        self.put(fail)
+        self.wait_for(lambda: self.pool.errors == 1)
+        self.assertEqual(self.pool.size, 1)
+
+    def test_utilisation(self):
+        self.pool.stats()
+        self.put(gevent.sleep, 0.1)
+        gevent.sleep(0.2)
+
+        utilisation = self.pool.stats()["utilisation"]
+        self.assertGreater(utilisation, 0.3)
+        self.assertLess(utilisation, 0.7)
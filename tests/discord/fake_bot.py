@@ -0,0 +1,60 @@
+"""
+    Description:
+        Minimal stand-ins for Bot, its plugins and the gateway API in tests
+        FakeBot carries just the config, API client, plugin list, command
+        router and work queue that the gateway, events and scheduler read
+
+    Contributors:
+        - Patrick Hennessy
+"""
+from bolt.core.command import CommandRouter
+from bolt.core.config import Config
+from bolt.core.queue import WorkQueue
+
+
+class FakeBot():
+    def __init__(self, api=None, **config):
+        self.config = Config({"api_key": "token", **config})
+        self.api = api
+        self.plugins = []
+        self.router = CommandRouter()
+        self.queue = WorkQueue()
+
+
+class FakePlugin():
+    def __init__(self, name="FakePlugin", commands=None, subscriptions=None, intervals=None, crons=None,
+                 enabled=True, pre_command_hooks=None):
+        self.name = name
+        self.commands = commands or []
+        self.subscriptions = subscriptions or []
+        self.intervals = intervals or []
+        self.crons = crons or []
+        self.enabled = enabled
+        self.pre_command_hooks = pre_command_hooks or []
+
+    def callback(self):
+        pass
+
+    def tick(self):
+        pass
+
+
+class FakeGatewayAPI():
+    def __init__(self, url, shards=1, max_concurrency=1):
+        self.url = url
+        self.shards = shards
+        self.max_concurrency = max_concurrency
+        self.gateway_calls = 0
+
+    def get_gateway_bot(self):
+        self.gateway_calls += 1
+        return {
+            "url": self.url,
+            "shards": self.shards,
+            "session_start_limit": {
+                "total": 1000,
+                "remaining": 1000,
+                "reset_after": 0,
+                "max_concurrency": self.max_concurrency
+            }
+        }
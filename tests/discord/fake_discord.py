@@ -0,0 +1,165 @@
+"""
+    Description:
+        Local stand-in for the Discord REST API that enforces rate limit buckets
+        Used by the rate limiter tests and benchmarks/bench_ratelimit.py
+
+        Every route answers with the JSON body registered for it (an empty object
+        by default) and the same rate limit headers Discord sends. Routes are grouped into buckets by hash, each
+        bucket is limited per major parameter, and an optional global limit
+        caps all requests. Requests over a limit get a 429 and are counted
+
+    Contributors:
+        - Patrick Hennessy
+"""
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+import ujson as json
+import threading
+import time
+import re
+
+MAJOR_ROUTE = re.compile(r"^/api/(channels|guilds|webhooks)/(\d+)")
+
+
+class FakeServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024
+
+
+class FakeBucket():
+    def __init__(self, limit, window):
+        self.limit = limit
+        self.window = window
+        self.used = 0
+        self.reset_at = 0
+
+    def take(self, now):
+        if now >= self.reset_at:
+            self.used = 0
+            self.reset_at = now + self.window
+
+        if self.used >= self.limit:
+            return False
+
+        self.used += 1
+        return True
+
+
+class FakeDiscord():
+    """
+        routes maps a path regex to (bucket_hash, limit, window seconds)
+        Paths matching no route fall into a default bucket per path
+        responses maps a path regex to the JSON body returned for it
+    """
+    def __init__(self, routes=None, default_limit=5, default_window=1.0, global_limit=None, latency=0,
+                 responses=None):
+        self.routes = [(re.compile(pattern), bucket) for pattern, bucket in (routes or {}).items()]
+        self.responses = [(re.compile(pattern), body) for pattern, body in (responses or {}).items()]
+        self.default_limit = default_limit
+        self.default_window = default_window
+        self.global_limit = global_limit
+        self.latency = latency
+
+        self.buckets = {}
+        self.global_bucket = FakeBucket(global_limit, 1.0) if global_limit else None
+        self.lock = threading.Lock()
+
+        self.requests = 0
+        self.rate_limited = 0
+
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def handle_any(self):
+                self.rfile.read(int(self.headers.get('Content-Length', 0)))
+                status, headers, body = fake.respond(self.path)
+
+                payload = json.dumps(body).encode()
+                self.send_response(status)
+                for key, value in headers.items():
+                    self.send_header(key, value)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = handle_any
+
+            def log_message(self, *args):
+                pass
+
+        self.server = FakeServer(("127.0.0.1", 0), Handler)
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.server.server_address[1]}/api"
+
+    def start(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def bucket_for(self, path):
+        path = path.split("?")[0]
+        bucket_hash, limit, window = path, self.default_limit, self.default_window
+
+        for pattern, route in self.routes:
+            if pattern.search(path):
+                bucket_hash, limit, window = route
+                break
+
+        major = MAJOR_ROUTE.match(path)
+        key = (bucket_hash, major.group(0) if major else None)
+
+        if key not in self.buckets:
+            self.buckets[key] = FakeBucket(limit, window)
+
+        return bucket_hash, self.buckets[key]
+
+    def too_many_requests(self, retry_after, is_global):
+        return {"message": "You are being rate limited.", "retry_after": retry_after, "global": is_global}
+
+    def respond(self, path):
+        if self.latency:
+            time.sleep(self.latency)
+
+        with self.lock:
+            now = time.monotonic()
+            self.requests += 1
+
+            bucket_hash, bucket = self.bucket_for(path)
+
+            if self.global_bucket is not None and not self.global_bucket.take(now):
+                self.rate_limited += 1
+                retry_after = round(self.global_bucket.reset_at - now, 3)
+                headers = {"X-RateLimit-Global": "true", "Retry-After": str(retry_after)}
+                return 429, headers, self.too_many_requests(retry_after, True)
+
+            allowed = bucket.take(now)
+            reset_after = round(bucket.reset_at - now, 3)
+            headers = {
+                "X-RateLimit-Bucket": bucket_hash,
+                "X-RateLimit-Limit": str(bucket.limit),
+                "X-RateLimit-Remaining": str(bucket.limit - bucket.used),
+                "X-RateLimit-Reset-After": str(reset_after)
+            }
+
+            if not allowed:
+                self.rate_limited += 1
+                headers["Retry-After"] = str(reset_after)
+                return 429, headers, self.too_many_requests(reset_after, False)
+
+            return 200, headers, self.body_for(path)
+
+    def body_for(self, path):
+        for pattern, body in self.responses:
+            if pattern.search(path):
+                return body
+
+        return {}
@@ -0,0 +1,162 @@
+"""
+    Description:
+        Local stand-in for the Discord gateway
+        A bare-bones WebSocket server (RFC 6455, text frames only) that greets
+        every connection with HELLO, records each payload the client sends and
+        hands it to on_payload(connection, payload) so tests can script Discord
+
+    Contributors:
+        - Patrick Hennessy
+"""
+import ujson as json
+import threading
+import base64
+import hashlib
+import socket
+import struct
+
+WEBSOCKET_GUID = b"258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+
+class FakeConnection():
+    def __init__(self, index, sock):
+        self.index = index
+        self.sock = sock
+        self.closed = False
+
+    def send(self, payload):
+        data = json.dumps(payload).encode()
+
+        if len(data) < 126:
+            header = struct.pack(">BB", 0x81, len(data))
+        elif len(data) < 65536:
+            header = struct.pack(">BBH", 0x81, 126, len(data))
+        else:
+            header = struct.pack(">BBQ", 0x81, 127, len(data))
+
+        self.sock.sendall(header + data)
+
+    def close(self, code):
+        """
+            Send a close frame with code, the way Discord ends a session it rejects
+        """
+        self.sock.sendall(struct.pack(">BBH", 0x88, 2, code))
+
+    def drop(self):
+        """
+            Close the TCP connection without a close frame, like a network blip
+        """
+        self.closed = True
+        self.sock.shutdown(socket.SHUT_RDWR)
+        self.sock.close()
+
+
+class FakeGateway():
+    def __init__(self, heartbeat_interval=45000):
+        self.heartbeat_interval = heartbeat_interval
+        self.connections = []
+        self.received = []
+
+        self.server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.server.bind(("127.0.0.1", 0))
+        self.server.listen(16)
+
+    @property
+    def url(self):
+        return f"ws://127.0.0.1:{self.server.getsockname()[1]}"
+
+    def start(self):
+        threading.Thread(target=self.accept, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.server.close()
+        for connection in self.connections:
+            if not connection.closed:
+                connection.drop()
+
+    def ops(self, index):
+        """
+            Op codes the client sent on one connection, heartbeats left out
+        """
+        return [payload['op'] for connection, payload in self.received if connection == index and payload['op'] != 1]
+
+    def on_payload(self, connection, payload):
+        pass
+
+    def accept(self):
+        while True:
+            try:
+                sock, _ = self.server.accept()
+            except OSError:
+                return
+
+            connection = FakeConnection(len(self.connections), sock)
+            self.connections.append(connection)
+            threading.Thread(target=self.serve, args=(connection,), daemon=True).start()
+
+    def serve(self, connection):
+        try:
+            self.handshake(connection.sock)
+            connection.send({"op": 10, "d": {"heartbeat_interval": self.heartbeat_interval}})
+
+            while not connection.closed:
+                payload = self.read_frame(connection.sock)
+                if payload is None:
+                    break
+
+                self.received.append((connection.index, payload))
+                self.on_payload(connection, payload)
+        except OSError:
+            pass
+
+    def handshake(self, sock):
+        request = b""
+        while b"\r\n\r\n" not in request:
+            request += sock.recv(4096)
+
+        headers = {}
+        for line in request.decode().split("\r\n")[1:]:
+            if ": " in line:
+                key, value = line.split(": ", 1)
+                headers[key.lower()] = value
+
+        accept = base64.b64encode(hashlib.sha1(headers["sec-websocket-key"].encode() + WEBSOCKET_GUID).digest())
+        sock.sendall(
+            b"HTTP/1.1 101 Switching Protocols\r\n"
+            b"Upgrade: websocket\r\n"
+            b"Connection: Upgrade\r\n"
+            b"Sec-WebSocket-Accept: " + accept + b"\r\n\r\n"
+        )
+
+    def read_exactly(self, sock, length):
+        data = b""
+        while len(data) < length:
+            chunk = sock.recv(length - len(data))
+            if not chunk:
+                return None
+            data += chunk
+        return data
+
+    def read_frame(self, sock):
+        header = self.read_exactly(sock, 2)
+        if header is None:
+            return None
+
+        opcode = header[0] & 0x0F
+        length = header[1] & 0x7F
+        if length == 126:
+            length, = struct.unpack(">H", self.read_exactly(sock, 2))
+        elif length == 127:
+            length, = struct.unpack(">Q", self.read_exactly(sock, 8))
+
+        mask = self.read_exactly(sock, 4)
+        data = bytes(byte ^ mask[index % 4] for index, byte in enumerate(self.read_exactly(sock, length)))
+
+        # Echo close frames so the client is not left waiting for one
+        if opcode == 0x8:
+            sock.sendall(b"\x88\x00")
+            return None
+
+        return json.loads(data)
@@ -0,0 +1,31 @@
+import unittest
+from unittest import mock
+
+from bolt.discord.api import API, TimeoutHTTPAdapter
+
+
+class TestAPISession(unittest.TestCase):
+
+    def test_session_pool(self):
+        api = API("token", pool_size=25, timeout=3)
+        adapter = api.session.get_adapter(api.base_url)
+
+        self.assertIsInstance(adapter, TimeoutHTTPAdapter)
+        self.assertEqual(adapter._pool_maxsize, 25)
+        self.assertEqual(adapter.timeout, 3)
+        self.assertEqual(api.session.headers["Connection"], "keep-alive")
+
+    def test_keep_alive_disabled(self):
+        api = API("token", keep_alive=False)
+
+        self.assertEqual(api.session.headers["Connection"], "close")
+
+    def test_default_timeout(self):
+        adapter = TimeoutHTTPAdapter(timeout=3)
+
+        with mock.patch('requests.adapters.HTTPAdapter.send') as send:
+            adapter.send("request")
+            adapter.send("request", timeout=1)
+
+        self.assertEqual(send.call_args_list[0][1]['timeout'], 3)
+        self.assertEqual(send.call_args_list[1][1]['timeout'], 1)
@@ -0,0 +1,85 @@
+import unittest
+
+from bolt.discord.cache import Cache
+from bolt.discord.events import GuildCreate, MessageCreate
+
+GUILD_ID = "41771983423143937"
+CHANNEL_ID = "41771983423143938"
+
+
+def user(index):
+    return {"id": str(80351110224678912 + index), "username": f"user{index}", "discriminator": "0001"}
+
+
+class TestCacheRawHandlers(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = Cache(api=None)
+        guild = {
+            "id": GUILD_ID,
+            "name": "Bolt",
+            "channels": [{"id": CHANNEL_ID, "type": 0, "name": "general"}],
+            "members": [{"user": user(index), "roles": [], "nick": None} for index in range(3)],
+            "voice_states": []
+        }
+        event = GuildCreate.from_payload({"op": 0, "s": 1, "t": "GUILD_CREATE", "d": guild})
+        event.bind(self.cache)
+        self.cache.on_guild_create(event)
+        self.guild = self.cache.guilds[event.guild.id]
+
+    def test_handlers_registered(self):
+        raw = {subscription.event_name for subscription in self.cache.raw_subscriptions}
+        models = {subscription.event_name for subscription in self.cache.subscriptions}
+
+        self.assertTrue({"MessageCreate", "GuildMemberUpdate", "VoiceStateUpdate"} <= raw)
+        self.assertFalse(raw & models)
+
+    def test_message_create(self):
+        self.cache.raw_message_create({"id": "41771983423143999", "channel_id": CHANNEL_ID, "author": user(0)})
+
+        self.assertEqual(self.cache.channels[self.guild.channels[0].id].last_message_id, "41771983423143999")
+
+    def test_guild_member_update(self):
+        cached_user = self.cache.users[self.guild.members[1].id]
+        self.cache.raw_guild_member_update({
+            "guild_id": GUILD_ID,
+            "user": dict(user(1), username="renamed"),
+            "roles": ["1", "2"],
+            "nick": "Nick"
+        })
+
+        member = self.guild.members[1]
+        self.assertEqual(member.nick, "Nick")
+        self.assertEqual(list(member.roles), [1, 2])
+        self.assertIs(member.user, cached_user)
+        self.assertEqual(cached_user.name, "renamed")
+
+    def test_guild_member_update_unknown_guild(self):
+        self.cache.raw_guild_member_update({"guild_id": "1", "user": user(1), "roles": [], "nick": None})
+
+    def test_voice_state_update(self):
+        state = {"guild_id": GUILD_ID, "channel_id": CHANNEL_ID, "user_id": user(2)["id"], "session_id": "a"}
+
+        self.cache.raw_voice_state_update(state)
+        self.assertEqual(len(self.guild.voice_states), 1)
+
+        self.cache.raw_voice_state_update(dict(state, self_mute=True))
+        self.assertEqual(len(self.guild.voice_states), 1)
+        self.assertTrue(self.guild.voice_states[0].self_mute)
+
+        self.cache.raw_voice_state_update(dict(state, channel_id=None))
+        self.assertEqual(len(self.guild.voice_states), 0)
+
+
+class TestBind(unittest.TestCase):
+
+    def test_message_create_bind(self):
+        cache = Cache(api="api")
+        data = {"id": "41771983423143999", "channel_id": CHANNEL_ID, "author": user(0), "content": "hi"}
+        event = MessageCreate.from_payload({"op": 0, "s": 1, "t": "MESSAGE_CREATE", "d": data})
+        event.bind(cache)
+
+        self.assertIs(event.cache, cache)
+        self.assertIs(event.message.cache, cache)
+        self.assertEqual(event.message.api, "api")
+        self.assertEqual(event.message.author.api, "api")
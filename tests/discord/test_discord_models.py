@@ -3,7 +3,7 @@ from bolt.discord.models.base import ModelValidationError
 from bolt.discord.models.user import User
 from bolt.discord.models.embed import Embed
 from bolt.discord.models.channel import Channel, ChannelType
-from bolt.discord.models.guild import Guild
+from bolt.discord.models.guild import Guild, GuildMember, Role, VoiceState
 
 
 class TestDiscordModel(unittest.TestCase):
@@ -30,6 +30,26 @@ class TestDiscordModel(unittest.TestCase):
         self.assertEqual(serialized['username'], input_data['username'])
         self.assertEqual(serialized['email'], input_data['email'])
 
+    def test_core_models_slotted(self):
+        user = {"id": "80351110224678912", "username": "Nelly", "discriminator": "1337"}
+        instances = [
+            User.marshal(user),
+            GuildMember.marshal({"user": user}),
+            Role.marshal({"id": "41771983423143936", "name": "admin"}),
+            VoiceState.marshal({"user_id": "80351110224678912"}),
+            Channel.marshal({"id": "41771983423143937", "type": 0})
+        ]
+
+        for instance in instances:
+            # Fields and __extra_slots__ can be set; anything else is rejected
+            instance.api = "api"
+            instance.cache = "cache"
+            self.assertEqual(instance.api, "api")
+            self.assertFalse(hasattr(instance, "__dict__"))
+
+            with self.assertRaisesRegex(AttributeError, "slotted"):
+                instance.plugin_note = "hello"
+
     def test_embed(self):
         input_data = {
             "title": "Title",
@@ -0,0 +1,67 @@
+import unittest
+import zlib
+
+from bolt.discord import etf
+from bolt.discord.models.message import Message
+
+
+class TestETF(unittest.TestCase):
+
+    def test_round_trip(self):
+        payload = {
+            "op": 0,
+            "s": 42,
+            "t": "MESSAGE_CREATE",
+            "d": {
+                "id": 80351110224678912,
+                "content": "Supa Hot ✨",
+                "nonce": -70000,
+                "pinned": False,
+                "tts": True,
+                "edited_timestamp": None,
+                "mentions": [],
+                "embeds": [{"color": 2710212, "fields": [{"name": "a", "value": "b"}]}],
+                "score": 2.5
+            }
+        }
+
+        self.assertEqual(etf.unpack(etf.pack(payload)), payload)
+
+    def test_erlpack_frame(self):
+        # erlpack.pack({'a': 'b', 'n': None, 'i': 80351110224678912, 'l': [1, 2.5, True]})
+        frame = (
+            b'\x83t\x00\x00\x00\x04m\x00\x00\x00\x01am\x00\x00\x00\x01bm\x00\x00\x00\x01ns\x03nil'
+            b'm\x00\x00\x00\x01in\x08\x00\x00\x10@\xb6\xe8v\x1d\x01m\x00\x00\x00\x01ll\x00\x00\x00\x03'
+            b'a\x01F@\x04\x00\x00\x00\x00\x00\x00s\x04truej'
+        )
+
+        self.assertEqual(etf.unpack(frame), {"a": "b", "n": None, "i": 80351110224678912, "l": [1, 2.5, True]})
+
+    def test_compressed_frame(self):
+        term = etf.pack({"op": 11})
+        frame = bytes([131, etf.COMPRESSED]) + (len(term) - 1).to_bytes(4, 'big') + zlib.compress(term[1:])
+
+        self.assertEqual(etf.unpack(frame), {"op": 11})
+
+    def test_unknown_tag(self):
+        with self.assertRaises(etf.ETFDecodeError):
+            etf.unpack(b'\x83\x01')
+
+    def test_marshal(self):
+        data = etf.unpack(etf.pack({
+            "id": 4000000,
+            "channel_id": 2000000,
+            "author": {"id": 80351110224678912, "username": "Bolt", "discriminator": "0001"},
+            "content": "hello",
+            "timestamp": "2017-07-11T17:27:07.299000+00:00",
+            "tts": False,
+            "mention_everyone": False,
+            "pinned": False,
+            "type": 0
+        }))
+
+        message = Message.marshal(data)
+
+        self.assertEqual(message.author.id, "80351110224678912")
+        self.assertEqual(message.author.id.value, 80351110224678912)
+        self.assertEqual(message.content, "hello")
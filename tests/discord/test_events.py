@@ -0,0 +1,136 @@
+import unittest
+import types
+
+import yaml
+
+from bolt import Bot, Plugin, subscriber, Events
+from bolt.discord.events import EventHandler, Subscription, MessageCreate, GuildCreate, GuildBanAdd, get_event_class
+from tests.discord.fake_bot import FakeBot, FakePlugin
+
+
+class TestEventHandler(unittest.TestCase):
+
+    def setUp(self):
+        self.bot = FakeBot()
+        self.handler = EventHandler(self.bot)
+        self.calls = []
+
+    def callback(self, label):
+        return lambda event: self.calls.append(label)
+
+    def test_dispatch_order(self):
+        self.handler.subscribe([Subscription("MessageCreate", self.callback("cache"))])
+        self.bot.plugins.append(FakePlugin(subscriptions=[
+            Subscription(Events.MESSAGE_CREATE, self.callback("plugin"))
+        ]))
+        self.handler.rebuild()
+
+        handlers = EventHandler.table([Subscription("MessageCreate", self.callback("shard"))])
+        self.handler.dispatch(MessageCreate(), handlers)
+
+        self.assertEqual(self.calls, ["cache", "shard"])
+
+        callback, args, _ = self.bot.queue.get_nowait()
+        callback(*args)
+        self.assertEqual(self.calls, ["cache", "shard", "plugin"])
+
+    def test_only_matching_subscribers(self):
+        self.handler.subscribe([
+            Subscription("GuildCreate", self.callback("guild")),
+            Subscription("MessageCreate", self.callback("message"))
+        ])
+
+        self.handler.dispatch(GuildCreate())
+        self.assertEqual(self.calls, ["guild"])
+
+    def test_rebuild_skips_disabled_plugins(self):
+        self.bot.plugins.append(FakePlugin(subscriptions=[Subscription("MessageCreate", self.callback("enabled"))]))
+        self.bot.plugins.append(FakePlugin(
+            subscriptions=[Subscription("MessageCreate", self.callback("disabled"))],
+            enabled=False
+        ))
+        self.handler.rebuild()
+
+        self.handler.dispatch(MessageCreate())
+        self.assertEqual(self.bot.queue.qsize(), 1)
+
+        self.bot.plugins.clear()
+        self.handler.rebuild()
+        self.assertEqual(self.handler.queued, {})
+
+    def test_raw_subscribers(self):
+        self.handler.subscribe_raw([Subscription("GuildBanAdd", lambda data: self.calls.append(data['guild_id']))])
+
+        self.handler.dispatch_raw("GuildBanAdd", {"guild_id": "1"})
+        self.handler.dispatch_raw("GuildBanRemove", {"guild_id": "2"})
+        self.assertEqual(self.calls, ["1"])
+
+    def test_subscribed(self):
+        self.handler.subscribe([Subscription("GuildCreate", self.callback("guild"))])
+        self.handler.subscribe_raw([Subscription("GuildBanAdd", self.callback("raw"))])
+        self.bot.plugins.append(FakePlugin(subscriptions=[Subscription("MessageCreate", self.callback("plugin"))]))
+        self.handler.rebuild()
+
+        self.assertTrue(self.handler.subscribed("GuildCreate"))
+        self.assertTrue(self.handler.subscribed("MessageCreate"))
+        self.assertFalse(self.handler.subscribed("GuildBanAdd"))
+        self.assertTrue(self.handler.subscribed("Ready", {"Ready": ()}))
+
+
+class TestFromPayload(unittest.TestCase):
+
+    def test_envelope_and_data(self):
+        payload = {
+            "op": 0, "s": 42, "t": "GUILD_BAN_ADD",
+            "d": {"guild_id": "41771983423143937", "user": {"id": "80351110224678912", "username": "Nelly"}}
+        }
+        event = GuildBanAdd.from_payload(payload)
+
+        self.assertEqual(event.sequence, 42)
+        self.assertEqual(event.name, "GUILD_BAN_ADD")
+        self.assertEqual(event.guild_id, "41771983423143937")
+        self.assertEqual(event.user.name, "Nelly")
+
+    def test_data_keyed_field(self):
+        payload = {"op": 0, "s": 1, "t": "GUILD_CREATE", "d": {"id": "41771983423143937", "name": "Bolt"}}
+        event = GuildCreate.from_payload(payload)
+
+        self.assertEqual(event.guild.id, "41771983423143937")
+        self.assertEqual(event.guild.name, "Bolt")
+
+
+class TestGetEventClass(unittest.TestCase):
+
+    def test_known_event(self):
+        self.assertIs(get_event_class("MESSAGE_CREATE"), MessageCreate)
+        self.assertIs(get_event_class("MESSAGE_CREATE"), MessageCreate)
+
+    def test_unknown_event(self):
+        self.assertIsNone(get_event_class("SOMETHING_NEW"))
+        self.assertIsNone(get_event_class("EVENT_HANDLER"))
+
+
+class MessagePlugin(Plugin):
+    @subscriber(Events.MESSAGE_CREATE)
+    def on_message(self, event):
+        pass
+
+
+class TestPluginsChanged(unittest.TestCase):
+
+    def setUp(self):
+        config_file = "/tmp/bolt-test-config.yaml"
+        with open(config_file, "w") as tempconfig:
+            tempconfig.write(yaml.dump({"api_key": "1234", "log_dir": "/tmp/"}))
+
+        self.bot = Bot(config_file)
+
+    def test_load_and_unload(self):
+        module = types.ModuleType("message_plugin")
+        module.MessagePlugin = MessagePlugin
+
+        self.bot.loader.load_plugin_module(module)
+        self.assertEqual(len(self.bot.shards.event_handler.queued["MessageCreate"]), 1)
+
+        self.bot.loader.unload_plugin("MessagePlugin")
+        self.assertNotIn("MessageCreate", self.bot.shards.event_handler.queued)
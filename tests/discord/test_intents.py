@@ -0,0 +1,102 @@
+import unittest
+
+from bolt import Events
+from bolt.discord.events import Subscription, GatewayEvent
+from bolt.discord import events
+from bolt.discord.intents import Intents, EVENT_INTENTS, PRIVILEGED_INTENTS, intents_for
+from bolt.discord.websocket import Websocket
+from tests.discord.fake_bot import FakeBot, FakePlugin
+
+
+class TestIntentsFor(unittest.TestCase):
+
+    def test_guilds_always_included(self):
+        self.assertEqual(intents_for([]), Intents.GUILDS)
+        self.assertEqual(intents_for(["Ready", "UserUpdate"]), Intents.GUILDS)
+
+    def test_union(self):
+        intents = intents_for(["MessageCreate", "GuildBanAdd"])
+
+        expected = Intents.GUILDS | Intents.GUILD_MESSAGES | Intents.DIRECT_MESSAGES | Intents.GUILD_BANS
+        self.assertEqual(intents, expected)
+
+    def test_privileged_left_out(self):
+        intents = intents_for(["PresenceUpdate", "GuildMemberAdd", "VoiceStateUpdate"], privileged=False)
+
+        self.assertFalse(intents & PRIVILEGED_INTENTS)
+        self.assertTrue(intents & Intents.GUILD_VOICE_STATES)
+
+    def test_mapped_names_are_events(self):
+        for event_name in EVENT_INTENTS:
+            self.assertTrue(issubclass(getattr(events, event_name), GatewayEvent))
+
+
+class TestWebsocketIntents(unittest.TestCase):
+
+    def setUp(self):
+        self.bot = FakeBot()
+        self.websocket = Websocket(self.bot, "token")
+
+    def test_cache_only(self):
+        with self.assertLogs("bolt.discord.websocket", level="WARNING") as logs:
+            intents = Intents(self.websocket.intents())
+            self.websocket.intents()
+
+        # The cache follows members and voice states, but only asks for privileged intents when allowed
+        self.assertFalse(intents & PRIVILEGED_INTENTS)
+        self.assertTrue(intents & Intents.GUILD_VOICE_STATES)
+        self.assertFalse(intents & Intents.GUILD_MESSAGE_TYPING)
+
+        # Warned once that the member cache will go stale
+        self.assertEqual(len(logs.records), 1)
+        self.assertIn("GUILD_MEMBERS", logs.output[0])
+
+    def test_cache_privileged(self):
+        websocket = Websocket(FakeBot(gateway_privileged_intents=True), "token")
+
+        intents = Intents(websocket.intents())
+
+        self.assertTrue(intents & Intents.GUILD_MEMBERS)
+        self.assertFalse(websocket.warned_intents)
+
+    def subscribe_plugins(self, bot):
+        bot.plugins.append(FakePlugin(subscriptions=[
+            Subscription(Events.TYPING_START, lambda event: None),
+            Subscription(Events.PRESENCE_UPDATE, lambda event: None)
+        ]))
+        bot.plugins.append(FakePlugin(
+            subscriptions=[Subscription(Events.GUILD_BAN_ADD, lambda event: None)],
+            enabled=False
+        ))
+
+        websocket = Websocket(bot, "token")
+        websocket.event_handler.rebuild()
+        return websocket
+
+    def test_plugin_subscriptions(self):
+        websocket = self.subscribe_plugins(FakeBot(gateway_privileged_intents=True))
+
+        intents = Intents(websocket.intents())
+
+        self.assertTrue(intents & Intents.GUILD_MESSAGE_TYPING)
+        self.assertTrue(intents & Intents.GUILD_PRESENCES)
+        self.assertFalse(intents & Intents.GUILD_BANS)
+
+    def test_plugin_subscriptions_privileged(self):
+        websocket = self.subscribe_plugins(FakeBot())
+
+        with self.assertLogs("bolt.discord.websocket", level="WARNING") as logs:
+            intents = Intents(websocket.intents())
+
+        # Plugins do not get privileged intents the application may not have either
+        self.assertTrue(intents & Intents.GUILD_MESSAGE_TYPING)
+        self.assertFalse(intents & PRIVILEGED_INTENTS)
+
+        self.assertEqual(len(logs.records), 1)
+        self.assertIn("GUILD_PRESENCES", logs.output[0])
+        self.assertIn("PresenceUpdate", logs.output[0])
+
+    def test_config_override(self):
+        bot = FakeBot(gateway_intents=Intents.GUILDS | Intents.GUILD_MESSAGES)
+
+        self.assertEqual(Websocket(bot, "token").intents(), Intents.GUILDS | Intents.GUILD_MESSAGES)
@@ -0,0 +1,164 @@
+import unittest
+import time
+
+import gevent
+
+from bolt.core.exceptions import InvalidConfigurationError
+from bolt.discord.events import GuildCreate
+from bolt.discord.intents import Intents
+from bolt.discord.models.base import Snowflake
+from bolt.discord.shards import ShardManager
+from bolt.discord.websocket import GatewayOpCodes, GatewaySendLimiter, Websocket
+from tests.discord.fake_bot import FakeBot, FakeGatewayAPI
+from tests.discord.fake_gateway import FakeGateway
+
+GUILD_ID = Snowflake("41771983423143937")
+
+
+def member(index):
+    user = {"id": str(80351110224678912 + index), "username": f"user{index}", "discriminator": "0001"}
+    return {"user": user, "roles": [], "nick": None}
+
+
+class ChunkingGateway(FakeGateway):
+    """
+        Sends one large guild with a single member and answers member requests in two chunks
+    """
+    def on_payload(self, connection, payload):
+        if payload['op'] == GatewayOpCodes.IDENTIFY:
+            connection.send({"op": 0, "s": 1, "t": "READY", "d": {
+                "v": 6,
+                "session_id": "session0",
+                "user": {"id": "1", "username": "Bolt", "discriminator": "0001"},
+                "guilds": [],
+                "private_channels": []
+            }})
+            connection.send({"op": 0, "s": 2, "t": "GUILD_CREATE", "d": {
+                "id": GUILD_ID, "name": "Large", "large": True, "members": [member(0)], "channels": []
+            }})
+
+        elif payload['op'] == GatewayOpCodes.REQUEST_GUILD_MEMBERS:
+            for index, members in enumerate([[member(0), member(1)], [member(2)]]):
+                connection.send({"op": 0, "s": 3 + index, "t": "GUILD_MEMBERS_CHUNK", "d": {
+                    "guild_id": payload['d']['guild_id'],
+                    "members": members,
+                    "chunk_index": index,
+                    "chunk_count": 2,
+                    "nonce": payload['d'].get('nonce')
+                }})
+
+
+class RecordingShard():
+    websocket = "connected"
+
+    def __init__(self):
+        self.nonces = []
+
+    def request_guild_members(self, guild_id, nonce=None):
+        self.nonces.append(nonce)
+
+
+class TestGatewaySendLimiter(unittest.TestCase):
+
+    def test_reserved_slots(self):
+        limiter = GatewaySendLimiter(limit=3, interval=0.1, reserved=1)
+        start = time.monotonic()
+
+        limiter.wait()
+        limiter.wait()
+        limiter.wait(priority=True)
+        self.assertLess(time.monotonic() - start, 0.05)
+
+        limiter.wait()
+        self.assertGreaterEqual(time.monotonic() - start, 0.09)
+
+
+class TestMemberChunking(unittest.TestCase):
+
+    def test_background_fill(self):
+        gateway = ChunkingGateway().start()
+        api = FakeGatewayAPI(gateway.url, shards=1, max_concurrency=1)
+        manager = ShardManager(FakeBot(api, shard_auto=True, member_chunking="background"), "token")
+
+        greenlet = gevent.spawn(manager.start)
+        try:
+            with gevent.Timeout(5):
+                # Requested by the chunker itself when the large guild arrives
+                while manager.chunker.completed < 1:
+                    gevent.sleep(0.01)
+        finally:
+            manager.stop()
+            greenlet.join(timeout=5)
+            gateway.stop()
+
+        guild = manager.cache.guilds[GUILD_ID]
+        self.assertEqual(len(guild.members), 3)
+        self.assertEqual(len(manager.cache.users), 3)
+        user_id = Snowflake(member(0)['user']['id'])
+        self.assertIs(guild.members.find(id=user_id).user, manager.cache.users[user_id])
+
+        requests = [payload for _, payload in gateway.received if payload['op'] == GatewayOpCodes.REQUEST_GUILD_MEMBERS]
+        self.assertEqual(len(requests), 1)
+        nonce = requests[0]['d'].pop('nonce')
+        self.assertLessEqual(len(nonce), 32)
+        self.assertEqual(requests[0]['d'], {"guild_id": GUILD_ID, "query": "", "limit": 0})
+        self.assertEqual(manager.chunker.requests, {})
+        self.assertEqual(manager.chunker.nonces, {})
+
+    def test_on_demand_waits_for_request(self):
+        manager = ShardManager(FakeBot(None, member_chunking="on_demand"), "token")
+        shard = RecordingShard()
+        manager.shard_for = lambda guild_id: shard
+        manager.chunker.handle_guild_create({"id": GUILD_ID, "large": True})
+        self.assertEqual(manager.chunker.pending.qsize(), 0)
+
+        result = manager.request_members(GUILD_ID)
+        self.assertIs(manager.request_members(GUILD_ID), result)
+        self.assertEqual(manager.chunker.pending.qsize(), 1)
+
+        greenlet = gevent.spawn(manager.chunker.start)
+        try:
+            gevent.sleep(0)
+            self.assertEqual(len(shard.nonces), 1)
+
+            # Only chunks echoing this request's nonce complete it
+            manager.cache.guilds[GUILD_ID] = "guild"
+            chunk = {"guild_id": str(GUILD_ID), "members": [], "chunk_index": 0, "chunk_count": 1}
+            manager.chunker.handle_chunk(chunk)
+            manager.chunker.handle_chunk(dict(chunk, nonce="someone else"))
+            self.assertFalse(result.ready())
+
+            manager.chunker.handle_chunk(dict(chunk, nonce=shard.nonces[0]))
+            self.assertEqual(result.get(timeout=1), "guild")
+        finally:
+            manager.chunker.stop()
+            greenlet.kill()
+
+    def test_off_raises(self):
+        manager = ShardManager(FakeBot(None), "token")
+
+        with self.assertRaises(InvalidConfigurationError):
+            manager.request_members(GUILD_ID)
+
+    def test_chunk_updates_known_member(self):
+        manager = ShardManager(FakeBot(None), "token")
+        event = GuildCreate.from_payload({"op": 0, "s": 1, "t": "GUILD_CREATE", "d": {
+            "id": GUILD_ID, "name": "Large", "members": [member(0)], "channels": []
+        }})
+        event.bind(manager.cache)
+        manager.cache.on_guild_create(event)
+
+        manager.cache.raw_guild_members_chunk({"guild_id": GUILD_ID, "members": [dict(member(0), nick="Nick")]})
+
+        guild = manager.cache.guilds[GUILD_ID]
+        self.assertEqual(len(guild.members), 1)
+        self.assertEqual(guild.members[0].nick, "Nick")
+
+    def test_intents(self):
+        self.assertFalse(Websocket(FakeBot(None), "token").intents() & Intents.GUILD_MEMBERS)
+        websocket = Websocket(FakeBot(None, member_chunking="on_demand"), "token")
+        self.assertTrue(websocket.intents() & Intents.GUILD_MEMBERS)
+
+    def test_unknown_mode(self):
+        with self.assertRaises(ValueError):
+            ShardManager(FakeBot(None, member_chunking="sometimes"), "token")
@@ -0,0 +1,118 @@
+import unittest
+
+import ujson as json
+
+from bolt.discord.events import Subscription
+from bolt.discord.messages import MessageStore
+from bolt.discord.websocket import Websocket
+from tests.discord.fake_bot import FakeBot
+
+
+def message(message_id, channel_id="1", content="hello"):
+    return {
+        "id": str(message_id),
+        "channel_id": str(channel_id),
+        "author": {"id": "80351110224678912", "username": "Nelly", "discriminator": "0001"},
+        "content": content
+    }
+
+
+class TestMessageStore(unittest.TestCase):
+
+    def test_per_channel_cap(self):
+        store = MessageStore(per_channel=2, max_messages=10)
+        for message_id in range(3):
+            store.add(message(message_id))
+
+        self.assertIsNone(store.get("1", "0"))
+        self.assertEqual(store.get("1", "2")["id"], "2")
+        self.assertEqual(len(store), 2)
+        self.assertEqual(store.evictions, 1)
+
+    def test_global_cap_evicts_least_recently_used(self):
+        store = MessageStore(per_channel=10, max_messages=3)
+        store.add(message(1, channel_id=1))
+        store.add(message(2, channel_id=2))
+        store.add(message(3, channel_id=3))
+
+        store.get(1, 1)
+        store.add(message(4, channel_id=4))
+
+        self.assertIsNotNone(store.get(1, 1))
+        self.assertIsNone(store.get(2, 2))
+        self.assertNotIn("2", store.channels)
+        self.assertEqual(len(store), 3)
+
+    def test_partial_update(self):
+        store = MessageStore()
+        store.add(message(1))
+
+        before = store.update({"id": "1", "channel_id": "1", "content": "edited"})
+
+        self.assertEqual(before["content"], "hello")
+        self.assertEqual(store.get(1, 1)["content"], "edited")
+        self.assertEqual(store.get(1, 1)["author"]["username"], "Nelly")
+        self.assertIsNone(store.update({"id": "9", "channel_id": "1", "content": "unknown"}))
+        self.assertIsNone(store.get(1, 9))
+
+    def test_remove_and_drop_channel(self):
+        store = MessageStore()
+        store.add(message(1))
+        store.add(message(2))
+        store.add(message(3, channel_id=2))
+
+        self.assertEqual(store.remove(1, 1)["id"], "1")
+        self.assertIsNone(store.remove(1, 1))
+
+        store.drop_channel(1)
+        self.assertEqual(len(store), 1)
+        self.assertGreater(store.memory(), 0)
+
+    def test_disabled(self):
+        store = MessageStore(per_channel=0)
+        store.add(message(1))
+
+        self.assertEqual(len(store), 0)
+
+
+class TestMessageEvents(unittest.TestCase):
+
+    def setUp(self):
+        self.websocket = Websocket(FakeBot(), "token")
+        self.events = []
+        self.websocket.event_handler.subscribe([
+            Subscription("MessageUpdate", self.events.append),
+            Subscription("MessageDelete", self.events.append),
+            Subscription("MessageDeleteBulk", self.events.append)
+        ])
+        self.sequence = 0
+
+    def receive(self, name, data):
+        self.sequence += 1
+        self.websocket.handle_websocket_message(None, json.dumps({"op": 0, "s": self.sequence, "t": name, "d": data}))
+
+    def test_update_before(self):
+        self.receive("MESSAGE_CREATE", message(1))
+        self.receive("MESSAGE_UPDATE", {"id": "1", "channel_id": "1", "content": "edited"})
+
+        event = self.events[0]
+        self.assertEqual(event.before.content, "hello")
+        self.assertEqual(event.message.content, "edited")
+        self.assertIs(event.before.cache, self.websocket.cache)
+        self.assertEqual(self.websocket.cache.messages.get(1, 1)["content"], "edited")
+
+    def test_delete_message(self):
+        self.receive("MESSAGE_CREATE", message(1))
+        self.receive("MESSAGE_DELETE", {"id": "1", "channel_id": "1"})
+        self.receive("MESSAGE_DELETE", {"id": "1", "channel_id": "1"})
+
+        self.assertEqual(self.events[0].message.content, "hello")
+        self.assertIsNone(self.events[1].message)
+        self.assertEqual(len(self.websocket.cache.messages), 0)
+
+    def test_delete_bulk(self):
+        self.receive("MESSAGE_CREATE", message(1))
+        self.receive("MESSAGE_CREATE", message(2, content="bye"))
+        self.receive("MESSAGE_DELETE_BULK", {"ids": ["1", "2", "3"], "channel_id": "1"})
+
+        self.assertEqual([item.content for item in self.events[0].messages], ["hello", "bye"])
@@ -1,5 +1,6 @@
 import unittest
-from bolt.discord.models.base import Model, Field, ListField
+from datetime import datetime, timedelta, timezone
+from bolt.discord.models.base import Model, Field, ListField, Timestamp, Snowflake, IndexedList, IndexedDict
 from bolt.discord.models.base import ModelMissingRequiredKeyError, ModelValidationError, ImmutableFieldError
 
 
@@ -129,6 +130,21 @@ class TestModel(unittest.TestCase):
         self.assertListEqual(actual.alist, input_data['alist'])
         self.assertIsInstance(actual.alist, list)
 
+    def test_list_field_default_not_shared(self):
+        class CoolModel(Model):
+            alist = ListField(int)
+            items = ListField(TestIndexedCollections.Item, indexes=["id"])
+
+        first = CoolModel.marshal({})
+        second = CoolModel.marshal({})
+        first.alist.append(1)
+        first.items.append(TestIndexedCollections.Item.marshal({"id": "1001"}))
+
+        self.assertListEqual(second.alist, [])
+        self.assertListEqual(second.items, [])
+        self.assertIsNone(second.items.find(id=1001))
+        self.assertIsNotNone(first.items.find(id=1001))
+
     def test_field_custom(self):
         class CustomType(str):
             pass
@@ -155,3 +171,225 @@ class TestModel(unittest.TestCase):
 
         self.assertEqual(actual.foreign.id, input_data['foreign']['id'])
         self.assertIsInstance(actual.foreign, AnotherModel)
+
+    def test_model_inherited_fields(self):
+        class BaseModel(Model):
+            id = Field(int, immutable=True)
+            name = Field(str)
+
+        class MiddleModel(BaseModel):
+            age = Field(int)
+
+        class CoolModel(MiddleModel):
+            @property
+            def name(self):
+                return "shadowed"
+
+        input_data = {"id": 123, "name": "Boltbot", "age": 5}
+
+        actual = CoolModel.marshal(input_data)
+
+        self.assertEqual(actual.id, 123)
+        self.assertEqual(actual.age, 5)
+        self.assertEqual(actual.name, "shadowed")
+        self.assertListEqual([entry[0] for entry in CoolModel.__marshal_plan__], ["id", "age"])
+        self.assertIn("id", CoolModel.__immutable_fields__)
+
+        with self.assertRaises(ImmutableFieldError):
+            actual.id = 1000
+
+    def test_model_remarshal(self):
+        class CoolModel(Model):
+            id = Field(int, immutable=True)
+            name = Field(str, json_key="username")
+
+        actual = CoolModel.marshal({"id": 123, "username": "Boltbot"})
+        actual.remarshal({"id": 123, "username": "Bolt"})
+
+        self.assertEqual(actual.name, "Bolt")
+        self.assertDictEqual(actual.serialize(), {"id": 123, "username": "Bolt"})
+
+        with self.assertRaises(ImmutableFieldError):
+            actual.remarshal({"id": 456})
+
+    def test_model_slotted(self):
+        class CoolModel(Model):
+            __slotted__ = True
+
+            id = Field(int, immutable=True)
+            name = Field(str, json_key="username")
+
+        class CoolerModel(CoolModel):
+            age = Field(int)
+
+        actual = CoolerModel.marshal({"id": 123, "username": "Boltbot", "age": 5})
+
+        self.assertFalse(hasattr(actual, "__dict__"))
+        self.assertEqual(actual.name, "Boltbot")
+        self.assertEqual(actual.age, 5)
+        self.assertDictEqual(actual.serialize(), {"id": 123, "username": "Boltbot", "age": 5})
+
+        actual.remarshal({"username": "Bolt"})
+        self.assertEqual(actual.name, "Bolt")
+
+        actual.merge(CoolerModel.marshal({"id": 123, "username": "Merged", "age": 6}), preserve=["id"])
+        self.assertEqual(actual.name, "Merged")
+        self.assertEqual(actual.age, 6)
+
+        actual.api = "api"
+        self.assertEqual(actual.api, "api")
+
+        with self.assertRaises(ImmutableFieldError):
+            actual.id = 1000
+
+        with self.assertRaises(AttributeError):
+            actual.not_a_field = True
+
+    def test_field_lazy(self):
+        class AnotherModel(Model):
+            id = Field(int)
+
+        class CoolModel(Model):
+            name = Field(str)
+            children = ListField(AnotherModel, lazy=True)
+
+        input_data = {"name": "Boltbot", "children": [{"id": 1}, {"id": 2}]}
+
+        actual = CoolModel.marshal(input_data)
+        self.assertNotIn("children", actual.__dict__)
+        self.assertIn("children", actual.__lazy__)
+
+        self.assertEqual(actual.children[1].id, 2)
+        self.assertIs(actual.children, actual.children)
+        self.assertNotIn("children", actual.__lazy__)
+
+        serialized = CoolModel.marshal(input_data).serialize()
+        self.assertListEqual(serialized["children"], input_data["children"])
+
+    def test_field_lazy_remarshal_merge(self):
+        class AnotherModel(Model):
+            id = Field(int)
+
+        class CoolModel(Model):
+            children = ListField(AnotherModel, lazy=True)
+
+        actual = CoolModel.marshal({"children": [{"id": 1}]})
+        self.assertEqual(actual.children[0].id, 1)
+
+        actual.remarshal({"children": [{"id": 2}]})
+        self.assertEqual(actual.children[0].id, 2)
+
+        actual.merge(CoolModel.marshal({"children": [{"id": 3}]}))
+        self.assertIn("children", actual.__lazy__)
+        self.assertEqual(actual.children[0].id, 3)
+
+    def test_field_lazy_slotted(self):
+        with self.assertRaises(TypeError):
+            class CoolModel(Model):
+                __slotted__ = True
+
+                children = ListField(int, lazy=True)
+
+
+class TestTimestamp(unittest.TestCase):
+    def test_timestamp_discord_format(self):
+        actual = Timestamp("2015-04-26T06:26:56.936000+00:00")
+
+        self.assertIsNone(actual._datetime)
+        self.assertEqual(actual.datetime, datetime(2015, 4, 26, 6, 26, 56, 936000, tzinfo=timezone.utc))
+        self.assertEqual(actual.timestamp, 1430029616)
+
+    def test_timestamp_offset(self):
+        actual = Timestamp("2015-04-26T06:26:56.9-05:30")
+
+        self.assertEqual(actual.datetime.microsecond, 900000)
+        self.assertEqual(actual.datetime.utcoffset(), -timedelta(hours=5, minutes=30))
+
+    def test_timestamp_fallback(self):
+        actual = Timestamp("April 26 2015")
+
+        self.assertEqual(actual.datetime.date(), datetime(2015, 4, 26).date())
+
+    def test_timestamp_from_unix(self):
+        actual = Timestamp.from_unix(1430029616)
+
+        self.assertEqual(actual.timestamp, 1430029616)
+        self.assertEqual(Timestamp(actual.iso_date).timestamp, 1430029616)
+
+
+class TestIndexedCollections(unittest.TestCase):
+    class Item(Model):
+        id = Field(Snowflake)
+        user_id = Field(Snowflake)
+        name = Field(str)
+
+        def __eq__(self, other):
+            return self.user_id == other.user_id
+
+        __hash__ = Model.__hash__
+
+    def make(self, index, name="item"):
+        return self.Item.marshal({"id": str(1000 + index), "user_id": str(2000 + index), "name": name})
+
+    def test_list_find(self):
+        items = IndexedList([self.make(index) for index in range(10)], indexes=["id", "user_id"])
+
+        self.assertIs(items.find(id=1003), items[3])
+        self.assertIs(items.find(user_id="2004"), items[4])
+        self.assertIs(items.find(id=Snowflake("1005"), name="item"), items[5])
+        self.assertIsNone(items.find(id=1005, name="other"))
+        self.assertIsNone(items.find(id=9999))
+        self.assertIs(items.find(name="item"), items[0])
+
+    def test_list_mutations(self):
+        items = IndexedList(indexes=["id"])
+        first, second, third = self.make(1), self.make(2), self.make(3)
+
+        items.append(first)
+        items.extend([second])
+        items.insert(0, third)
+        self.assertIs(items.find(id=1003), third)
+
+        items.remove(third)
+        self.assertIsNone(items.find(id=1003))
+
+        replacement = self.make(1, name="replaced")
+        items[0] = replacement
+        self.assertIs(items.find(id=1001), replacement)
+
+        del items[0]
+        self.assertIsNone(items.find(id=1001))
+
+        self.assertIs(items.pop(), second)
+        self.assertIsNone(items.find(id=1002))
+
+    def test_list_upsert(self):
+        items = IndexedList([self.make(index) for index in range(3)], indexes=["user_id"])
+
+        updated = self.make(1, name="updated")
+        items.upsert(updated)
+        self.assertEqual(len(items), 3)
+        self.assertIs(items[1], updated)
+        self.assertIs(items.find(user_id=2001), updated)
+
+        items.upsert(self.make(5))
+        self.assertEqual(len(items), 4)
+        self.assertEqual(items.find(user_id=2005).id, "1005")
+
+    def test_dict(self):
+        items = IndexedDict(indexes=["id"])
+        first = self.make(1)
+        items[first.id] = first
+
+        self.assertIs(items.find(id="1001"), first)
+
+        replacement = self.make(1, name="replaced")
+        items[first.id] = replacement
+        self.assertIs(items.find(id=1001), replacement)
+
+        del items[first.id]
+        self.assertIsNone(items.find(id=1001))
+
+        items.update({"a": self.make(2)})
+        self.assertEqual(items.pop("a").id, "1002")
+        self.assertIsNone(items.find(id=1002))
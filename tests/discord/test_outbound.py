@@ -0,0 +1,128 @@
+import unittest
+import logging
+
+import gevent
+from gevent.queue import Full
+
+from bolt.discord.api import API
+from bolt.discord.outbound import Outbound, OutboundMessage
+from bolt.discord.models.channel import Channel
+from bolt.discord.models.message import Message
+
+
+def message_payload(channel_id, content):
+    return {
+        "id": "4000000",
+        "channel_id": str(channel_id),
+        "author": {"id": "80351110224678912", "username": "Bolt", "discriminator": "0001"},
+        "content": content,
+        "timestamp": "2017-07-11T17:27:07.299000+00:00",
+        "tts": False,
+        "mention_everyone": False,
+        "pinned": False,
+        "type": 0
+    }
+
+
+class FakeAPI():
+    def __init__(self, delay=0):
+        self.delay = delay
+        self.sent = []
+
+    def create_message(self, channel_id, message_data):
+        gevent.sleep(self.delay)
+        if message_data["content"] == "boom":
+            raise ValueError("boom")
+
+        self.sent.append((channel_id, message_data["content"]))
+        return message_payload(channel_id, message_data["content"])
+
+
+class TestOutbound(unittest.TestCase):
+
+    def setUp(self):
+        self.api = FakeAPI(delay=0.001)
+        self.outbound = Outbound(self.api, senders=4, max_size=40)
+
+    def tearDown(self):
+        self.outbound.stop()
+
+    def test_channel_order(self):
+        for index in range(10):
+            for channel_id in (1, 2, 3):
+                self.outbound.send(channel_id, {"content": str(index)}, Message.marshal)
+
+        self.outbound.join()
+
+        for channel_id in (1, 2, 3):
+            sent = [content for sent_id, content in self.api.sent if sent_id == channel_id]
+            self.assertEqual(sent, [str(index) for index in range(10)])
+
+        self.assertEqual(self.outbound.sent, 30)
+        self.assertEqual(self.outbound.pending, 0)
+
+    def test_promise(self):
+        outbound = self.outbound.send(1, {"content": "hello"}, Message.marshal)
+
+        self.assertIsInstance(outbound, OutboundMessage)
+        self.assertFalse(outbound.ready())
+
+        message = outbound.get()
+        self.assertIsInstance(message, Message)
+        self.assertIs(outbound.get(), message)
+        self.assertEqual(outbound.content, "hello")
+
+    def test_failed_send(self):
+        outbound = self.outbound.send(1, {"content": "boom"}, Message.marshal)
+
+        with self.assertRaises(ValueError):
+            outbound.get()
+
+        self.assertFalse(outbound.successful())
+        self.assertEqual(self.outbound.failed, 1)
+
+    def test_backpressure(self):
+        outbound = Outbound(self.api, senders=1, max_size=2)
+        outbound.lanes[0].put(OutboundMessage(1, {"content": "queued"}, Message.marshal))
+        outbound.lanes[0].put(OutboundMessage(1, {"content": "queued"}, Message.marshal))
+
+        with self.assertRaises(Full):
+            outbound.send(1, {"content": "hello"}, Message.marshal, block=False)
+
+        outbound.stop()
+
+
+class TestChannelSay(unittest.TestCase):
+
+    def setUp(self):
+        self.api = API("token")
+        self.api.outbound = Outbound(FakeAPI(), senders=2)
+        self.channel = Channel.marshal({"id": "2000000", "type": 0})
+        self.channel.api = self.api
+
+    def tearDown(self):
+        self.api.close()
+
+    def test_say_returns_message(self):
+        message = self.channel.say("hello")
+
+        self.assertIsInstance(message, Message)
+        self.assertEqual(message.channel_id, self.channel.id)
+        self.assertIs(message.api, self.api)
+
+    def test_say_raises(self):
+        with self.assertLogs("bolt.discord.outbound") as logs:
+            with self.assertRaises(ValueError):
+                self.channel.say("boom")
+
+            # The caller gets the error, so the sender does not log it as well
+            logging.getLogger("bolt.discord.outbound").info("done")
+
+        self.assertEqual(logs.output, ["INFO:bolt.discord.outbound:done"])
+
+    def test_say_queued(self):
+        outbound = self.channel.say("hello", wait=False)
+
+        self.assertIsInstance(outbound, OutboundMessage)
+        self.assertEqual(outbound.get().content, "hello")
+        self.assertIs(outbound.get().api, self.api)
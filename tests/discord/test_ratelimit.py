@@ -0,0 +1,86 @@
+import unittest
+import time
+
+import gevent
+
+from bolt.discord.api import API
+from bolt.discord.ratelimit import RateLimiter
+from bolt.core.exceptions import RateLimitExceeded
+from tests.discord.fake_discord import FakeDiscord
+
+
+class TestRateLimiter(unittest.TestCase):
+
+    def setUp(self):
+        self.discord = None
+
+    def tearDown(self):
+        if self.discord is not None:
+            self.discord.stop()
+
+    def start(self, **kwargs):
+        self.discord = FakeDiscord(**kwargs).start()
+        return API("token", base_url=self.discord.base_url)
+
+    def send(self, api, channel_ids):
+        start = time.monotonic()
+        greenlets = [gevent.spawn(api.create_message, channel_id, {"content": "hi"}) for channel_id in channel_ids]
+        gevent.joinall(greenlets, raise_error=True)
+        return time.monotonic() - start
+
+    def test_bucket_queues_requests(self):
+        api = self.start(default_limit=2, default_window=0.2)
+
+        elapsed = self.send(api, [1] * 6)
+
+        self.assertEqual(self.discord.rate_limited, 0)
+        self.assertEqual(self.discord.requests, 6)
+        self.assertGreaterEqual(elapsed, 0.4)
+
+    def test_major_parameters_are_independent(self):
+        api = self.start(default_limit=1, default_window=0.5)
+
+        elapsed = self.send(api, [1, 2, 3, 4])
+
+        self.assertEqual(self.discord.rate_limited, 0)
+        self.assertLess(elapsed, 0.4)
+
+    def test_routes_share_bucket_hash(self):
+        api = self.start(routes={r"/messages": ("messages", 3, 0.3)})
+
+        api.create_message(1, {"content": "hi"})
+        api.edit_message(1, 2, {"content": "hi"})
+
+        limiter = api.rate_limiter
+        self.assertIs(limiter.get_bucket("create_message", 1), limiter.get_bucket("edit_message", 1))
+        self.assertIsNot(limiter.get_bucket("create_message", 1), limiter.get_bucket("create_message", 2))
+        self.assertEqual(limiter.get_bucket("create_message", 1).remaining, 1)
+
+    def test_global_rate_limit(self):
+        api = self.start(default_limit=100, global_limit=3)
+
+        elapsed = self.send(api, [1, 2, 3, 4, 5])
+
+        self.assertGreaterEqual(self.discord.rate_limited, 1)
+        self.assertEqual(self.discord.requests - self.discord.rate_limited, 5)
+        self.assertGreater(elapsed, 0.5)
+
+    def test_max_retries(self):
+        class Response():
+            status_code = 429
+            headers = {"Retry-After": "0.01"}
+
+            def json(self):
+                return {"retry_after": 0.01, "global": False}
+
+        limiter = RateLimiter(max_retries=2)
+        calls = []
+
+        def send():
+            calls.append(1)
+            return Response()
+
+        with self.assertRaises(RateLimitExceeded):
+            limiter.request("create_message", 1, send)
+
+        self.assertEqual(len(calls), 3)
@@ -0,0 +1,97 @@
+import unittest
+import time
+
+import gevent
+
+from bolt.discord.shards import ShardManager, IdentifyLimiter
+from bolt.discord.websocket import GatewayOpCodes
+from tests.discord.fake_bot import FakeBot, FakeGatewayAPI
+from tests.discord.fake_gateway import FakeGateway
+
+
+class ShardedGateway(FakeGateway):
+    def __init__(self):
+        super(ShardedGateway, self).__init__()
+        self.identified = {}
+
+    def on_payload(self, connection, payload):
+        if payload['op'] != GatewayOpCodes.IDENTIFY:
+            return
+
+        shard_id, _ = payload['d']['shard']
+        self.identified[shard_id] = time.monotonic()
+
+        connection.send({"op": 0, "s": 1, "t": "READY", "d": {
+            "v": 6,
+            "session_id": f"session{shard_id}",
+            "user": {"id": "80351110224678912", "username": "Bolt", "discriminator": "0001"},
+            "guilds": [],
+            "private_channels": []
+        }})
+
+
+class TestShardManager(unittest.TestCase):
+
+    def run_shards(self, manager, gateway, shards):
+        greenlet = gevent.spawn(manager.start)
+        try:
+            with gevent.Timeout(5):
+                while len(gateway.identified) < shards or any(s["state"] != "connected" for s in manager.status()):
+                    gevent.sleep(0.01)
+        finally:
+            manager.stop()
+            greenlet.join(timeout=5)
+            gateway.stop()
+
+    def test_auto_sharding(self):
+        gateway = ShardedGateway().start()
+        api = FakeGatewayAPI(gateway.url, shards=3, max_concurrency=1)
+        manager = ShardManager(FakeBot(api, shard_auto=True), "token")
+
+        manager.create_shards()
+        manager.identify_limiter.identify_interval = 0.05
+        self.run_shards(manager, gateway, 3)
+
+        self.assertEqual(api.gateway_calls, 1)
+        self.assertEqual(sorted(manager.shards), [0, 1, 2])
+        self.assertEqual(sorted(gateway.identified), [0, 1, 2])
+
+        identified = sorted(gateway.identified.values())
+        self.assertGreaterEqual(identified[2] - identified[0], 0.09)
+
+        for shard in manager.shards.values():
+            self.assertIs(shard.cache, manager.cache)
+            self.assertIs(shard.event_handler, manager.event_handler)
+
+        self.assertEqual(
+            [(status["shard_id"], status["sequence"], status["session_id"]) for status in manager.status()],
+            [(0, 1, "session0"), (1, 1, "session1"), (2, 1, "session2")]
+        )
+
+    def test_configured_shards(self):
+        manager = ShardManager(FakeBot(None, shard_total=4, shard_ids=[1, 3]), "token")
+        manager.create_shards()
+
+        self.assertEqual(sorted(manager.shards), [1, 3])
+        self.assertEqual(manager.shards[3].shard_total, 4)
+        self.assertIs(manager.primary, manager.shards[1])
+
+        # (guild_id >> 22) % 4 == 3
+        self.assertIs(manager.shard_for(3 << 22), manager.shards[3])
+        self.assertIsNone(manager.shard_for(2 << 22))
+
+    def test_identify_limiter_concurrency(self):
+        limiter = IdentifyLimiter(max_concurrency=2, identify_interval=0.1)
+        finished = {}
+
+        def identify(shard_id):
+            limiter.wait(shard_id)
+            finished[shard_id] = time.monotonic()
+
+        start = time.monotonic()
+        gevent.joinall([gevent.spawn(identify, shard_id) for shard_id in range(4)])
+
+        self.assertLess(finished[0] - start, 0.05)
+        self.assertLess(finished[1] - start, 0.05)
+        self.assertGreaterEqual(finished[2] - start, 0.09)
+        self.assertGreaterEqual(finished[3] - start, 0.09)
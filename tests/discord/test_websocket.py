@@ -0,0 +1,252 @@
+import unittest
+import zlib
+
+import gevent
+import ujson as json
+
+from bolt.core.command import Command
+from bolt.discord.events import Subscription
+from bolt.discord.websocket import Websocket, GatewayOpCodes, ShardState
+from tests.discord.fake_bot import FakeBot, FakePlugin, FakeGatewayAPI
+from tests.discord.fake_gateway import FakeGateway
+
+
+class TestWebsocketCompression(unittest.TestCase):
+
+    def setUp(self):
+        self.websocket = Websocket(FakeBot(gateway_compress=True), "token")
+        self.websocket.handle_websocket_open(None)
+        self.compressor = zlib.compressobj()
+
+    def compress(self, payload):
+        data = json.dumps(payload).encode()
+        return self.compressor.compress(data) + self.compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def test_decode_text(self):
+        websocket = Websocket(FakeBot(), "token")
+
+        self.assertEqual(websocket.decode('{"op": 11}'), '{"op": 11}')
+        self.assertEqual(websocket.bytes_received, websocket.bytes_decompressed)
+
+    def test_decode_stream(self):
+        first = {"op": 10, "d": {"heartbeat_interval": 41250}}
+        second = {"op": 11, "d": None}
+
+        self.assertEqual(json.loads(self.websocket.decode(self.compress(first))), first)
+
+        # Later messages only decompress with the context built up by earlier ones
+        self.assertEqual(json.loads(self.websocket.decode(self.compress(second))), second)
+
+    def test_decode_split_frames(self):
+        payload = {"op": 0, "t": "GUILD_CREATE", "d": {"members": [{"user": {"id": str(i)}} for i in range(500)]}}
+        data = self.compress(payload)
+
+        self.assertIsNone(self.websocket.decode(data[:100]))
+        self.assertIsNone(self.websocket.decode(data[100:-2]))
+        self.assertEqual(json.loads(self.websocket.decode(data[-2:])), payload)
+
+        self.assertEqual(self.websocket.bytes_received, len(data))
+        self.assertEqual(self.websocket.bytes_decompressed, len(json.dumps(payload)))
+        self.assertGreater(self.websocket.compression_ratio, 1)
+
+    def test_new_connection_resets_stream(self):
+        self.websocket.decode(self.compress({"op": 11}))
+
+        self.websocket.handle_websocket_open(None)
+        self.compressor = zlib.compressobj()
+
+        self.assertEqual(json.loads(self.websocket.decode(self.compress({"op": 11}))), {"op": 11})
+
+
+class ScriptedGateway(FakeGateway):
+    """
+        Connection 0 identifies and then drops; later connections follow invalidate
+    """
+    def __init__(self, invalidate=False):
+        super(ScriptedGateway, self).__init__()
+        self.invalidate = invalidate
+        self.sequence = 0
+
+    def dispatch(self, connection, name, data):
+        self.sequence += 1
+        connection.send({"op": 0, "s": self.sequence, "t": name, "d": data})
+
+    def on_payload(self, connection, payload):
+        if payload['op'] == 2:
+            self.dispatch(connection, "READY", {
+                "v": 6,
+                "session_id": f"session{connection.index}",
+                "user": {"id": "80351110224678912", "username": "Bolt", "discriminator": "0001"},
+                "guilds": [],
+                "private_channels": []
+            })
+
+            if connection.index == 0:
+                connection.drop()
+
+        elif payload['op'] == 6:
+            if self.invalidate:
+                connection.send({"op": 9, "d": False})
+            else:
+                self.dispatch(connection, "RESUMED", {})
+
+
+class ClosingGateway(FakeGateway):
+    """
+        Closes every connection with code once it identifies
+    """
+    def __init__(self, code):
+        super(ClosingGateway, self).__init__()
+        self.code = code
+
+    def on_payload(self, connection, payload):
+        if payload['op'] == 2:
+            connection.close(self.code)
+
+
+class TestWebsocketReconnect(unittest.TestCase):
+
+    def connect(self, gateway, until, **kwargs):
+        bot = FakeBot()
+        bot.api = FakeGatewayAPI(gateway.url)
+
+        websocket = Websocket(bot, "token", **kwargs)
+        websocket.backoff_base = 0.01
+        websocket.invalid_session_delay = (0, 0)
+
+        greenlet = gevent.spawn(websocket.start)
+        try:
+            with gevent.Timeout(5):
+                while not until():
+                    gevent.sleep(0.01)
+        finally:
+            websocket.stop()
+            greenlet.join(timeout=5)
+            gateway.stop()
+
+        return websocket, bot.api
+
+    def test_resume_after_drop(self):
+        gateway = ScriptedGateway().start()
+
+        websocket, api = self.connect(gateway, lambda: gateway.sequence >= 2)
+
+        self.assertEqual(gateway.ops(0), [GatewayOpCodes.IDENTIFY])
+        self.assertEqual(gateway.ops(1), [GatewayOpCodes.RESUME])
+
+        resume = next(payload for _, payload in gateway.received if payload['op'] == GatewayOpCodes.RESUME)
+        self.assertEqual(resume['d']['seq'], 1)
+        self.assertEqual(resume['d']['session_id'], "session0")
+        self.assertEqual(api.gateway_calls, 1)
+        self.assertEqual(websocket.reconnect_attempts, 0)
+
+        identify = next(payload for _, payload in gateway.received if payload['op'] == GatewayOpCodes.IDENTIFY)
+        self.assertEqual(identify['d']['intents'], websocket.intents())
+        self.assertEqual(identify['d']['large_threshold'], 50)
+        self.assertEqual(websocket.event_counts, {"READY": 1, "RESUMED": 1})
+
+    def test_identify_after_invalid_session(self):
+        gateway = ScriptedGateway(invalidate=True).start()
+
+        websocket, api = self.connect(gateway, lambda: gateway.sequence >= 2)
+
+        self.assertEqual(gateway.ops(1), [GatewayOpCodes.RESUME, GatewayOpCodes.IDENTIFY])
+        self.assertEqual(websocket.session_id, "session1")
+        self.assertEqual(websocket.sequence, 2)
+
+    def test_heartbeat_while_waiting_to_identify(self):
+        class SlowLimiter():
+            def wait(self, shard_id):
+                gevent.sleep(0.3)
+
+        gateway = ScriptedGateway()
+        gateway.heartbeat_interval = 50
+        gateway.start()
+
+        websocket, _ = self.connect(gateway, lambda: gateway.sequence >= 1, identify_limiter=SlowLimiter())
+
+        ops = [payload['op'] for index, payload in gateway.received if index == 0]
+        self.assertGreaterEqual(ops.index(GatewayOpCodes.IDENTIFY), 2)
+        self.assertTrue(all(op == GatewayOpCodes.HEARTBEAT for op in ops[:ops.index(GatewayOpCodes.IDENTIFY)]))
+
+    def test_fatal_close_stops(self):
+        gateway = ClosingGateway(4014).start()
+        bot = FakeBot()
+        bot.api = FakeGatewayAPI(gateway.url)
+        websocket = Websocket(bot, "token")
+        websocket.backoff_base = 0.01
+
+        with self.assertLogs("bolt.discord.websocket", level="ERROR") as logs:
+            greenlet = gevent.spawn(websocket.start)
+            greenlet.join(timeout=5)
+        gateway.stop()
+
+        self.assertTrue(greenlet.dead)
+        self.assertFalse(websocket.running)
+        self.assertEqual(websocket.state, ShardState.STOPPED)
+        self.assertEqual(len(gateway.connections), 1)
+        self.assertIn("4014", logs.output[0])
+
+    def test_other_close_reconnects(self):
+        gateway = ClosingGateway(4000).start()
+
+        websocket, _ = self.connect(gateway, lambda: GatewayOpCodes.IDENTIFY in gateway.ops(1))
+
+        self.assertEqual(websocket.reconnect_attempts, 2)
+
+    def test_reconnect_delay(self):
+        websocket = Websocket(FakeBot(), "token")
+
+        for attempt in range(10):
+            delay = websocket.reconnect_delay(attempt)
+            self.assertGreaterEqual(delay, 0)
+            self.assertLessEqual(delay, min(websocket.backoff_cap, websocket.backoff_base * 2 ** attempt))
+
+
+class TestWebsocketDispatch(unittest.TestCase):
+
+    def setUp(self):
+        self.bot = FakeBot()
+        self.websocket = Websocket(self.bot, "token")
+        self.calls = []
+
+    def receive(self, name, data, sequence):
+        self.websocket.handle_websocket_message(None, json.dumps({"op": 0, "s": sequence, "t": name, "d": data}))
+
+    def test_unsubscribed_event_skipped(self):
+        self.receive("TYPING_START", {"channel_id": "1", "user_id": "2", "timestamp": 1}, 7)
+
+        self.assertEqual(self.websocket.sequence, 7)
+        self.assertEqual(self.websocket.events_skipped, 1)
+        self.assertEqual(self.websocket.event_counts["TYPING_START"], 1)
+
+    def test_raw_only_event_not_marshalled(self):
+        self.websocket.event_handler.subscribe_raw([Subscription("TypingStart", self.calls.append)])
+
+        self.receive("TYPING_START", {"channel_id": "1", "user_id": "2", "timestamp": 1}, 8)
+
+        self.assertEqual(self.calls, [{"channel_id": "1", "user_id": "2", "timestamp": 1}])
+        self.assertEqual(self.websocket.events_skipped, 1)
+
+    def test_subscribed_event_marshalled(self):
+        self.websocket.event_handler.subscribe([Subscription("TypingStart", self.calls.append)])
+
+        self.receive("TYPING_START", {"channel_id": "1", "user_id": "2", "timestamp": 1}, 9)
+
+        self.assertEqual(self.calls[0].user_id, "2")
+        self.assertIs(self.calls[0].cache, self.websocket.cache)
+        self.assertEqual(self.websocket.events_skipped, 0)
+
+    def test_commands_routed_from_raw_data(self):
+        self.bot.router.rebuild([FakePlugin(commands=[Command("ping", self.calls.append, trigger=".")])])
+        message = {"id": "3", "channel_id": "1", "author": {"id": "2", "username": "Nelly"}}
+
+        self.receive("MESSAGE_CREATE", dict(message, content="hello"), 10)
+        self.assertEqual(self.bot.queue.qsize(), 0)
+        self.assertEqual(self.websocket.events_skipped, 1)
+
+        self.receive("MESSAGE_CREATE", dict(message, content=".ping"), 11)
+        callback, args, kwargs = self.bot.queue.get_nowait()
+        self.assertEqual(args[0].message.content, ".ping")
+        self.assertIs(args[0].message.cache, self.websocket.cache)
+        self.assertEqual(kwargs['match'].command.pattern, "ping")